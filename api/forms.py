@@ -0,0 +1,46 @@
+from django import forms
+from django.core.exceptions import ValidationError
+from django.http import Http404
+
+from utils.exports import FORMAT_LABELS, JSON_LINES
+from utils.pagination import NEXT, decode_cursor
+
+DEFAULT_LIMIT = 100
+MAX_LIMIT = 1000
+JSON = "json"
+
+
+class ApiQueryForm(forms.Form):
+    limit = forms.IntegerField(
+        min_value=1, max_value=MAX_LIMIT, required=False
+    )
+    cursor = forms.CharField(required=False)
+    format = forms.ChoiceField(  # noqa: VNE003
+        choices=((JSON, "JSON"), (JSON_LINES, FORMAT_LABELS[JSON_LINES])),
+        required=False,
+    )
+    updated_since = forms.DateTimeField(required=False)
+
+    def clean_limit(self):
+        return self.cleaned_data["limit"] or DEFAULT_LIMIT
+
+    def clean_cursor(self):
+        cursor = self.cleaned_data["cursor"]
+        return validate_cursor(cursor) if cursor else None
+
+    def clean_format(self):
+        return self.cleaned_data["format"] or JSON
+
+
+def validate_cursor(cursor):
+    """
+    The id of the last row of the previous page.
+    """
+    try:
+        direction, values = decode_cursor(cursor)
+    except Http404:
+        raise ValidationError("Invalid cursor.")
+    if direction != NEXT or len(values) != 1 or type(values[0]) is not int:
+        raise ValidationError("Invalid cursor.")
+
+    return values[0]
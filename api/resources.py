@@ -0,0 +1,124 @@
+"""
+Resources of the JSON API: the rows of a model a client may read
+and the fields it may select.
+
+The rows are read with values_list(): one query per page, joining the
+related tables the selected fields need, and no model instance is built.
+"""
+
+from django.core.exceptions import ValidationError
+
+from reception.forms import VisitFilterForm
+from reception.models import SCHEDULED, Visit
+from users.models import Doctor, Patient, Specialization
+
+
+class Resource:
+    """
+    `fields` maps the names of the API fields to the lookups
+    of the queryset. `filter_form` validates the filters of the list,
+    its cleaned data are the lookups of the rows.
+    """
+
+    def __init__(self, name, get_queryset, fields, filter_form=None):
+        self.name = name
+        self.get_queryset = get_queryset
+        self.fields = fields
+        self.filter_form = filter_form
+
+    def __repr__(self):
+        return f"<Resource {self.name}>"
+
+    def select(self, names=""):
+        """
+        The API fields named in the comma-separated list,
+        all of them by default.
+        """
+        if not names:
+            return list(self.fields)
+
+        selected = list(
+            dict.fromkeys(name.strip() for name in names.split(","))
+        )
+        unknown = [name for name in selected if name not in self.fields]
+        if unknown:
+            raise ValidationError(
+                f"Unknown fields: {', '.join(unknown)}. "
+                f"Choose from: {', '.join(self.fields)}."
+            )
+
+        return selected
+
+    def rows(self, queryset, names, limit=None, chunk_size=None):
+        """
+        The (id, {field: value}) pairs of the queryset: the first
+        `limit` ones, or all of them read `chunk_size` rows at a time.
+        """
+        lookups = [self.fields[name] for name in names]
+        rows = queryset.values_list("id", *lookups)
+        if limit is not None:
+            rows = rows[:limit]
+        if chunk_size is not None:
+            rows = rows.iterator(chunk_size=chunk_size)
+        for pk, *values in rows:
+            yield pk, dict(zip(names, values))
+
+
+VISITS = Resource(
+    "visits",
+    lambda: Visit.objects.filter(SCHEDULED),
+    {
+        "id": "id",
+        "date_time": "date_time",
+        "end_date_time": "end_date_time",
+        "duration": "duration",
+        "type_of_visit": "type_of_visit",
+        "doctor": "doctor_id",
+        "doctor_first_name": "doctor__first_name",
+        "doctor_last_name": "doctor__last_name",
+        "patient": "patient_id",
+        "patient_first_name": "patient__first_name",
+        "patient_last_name": "patient__last_name",
+        "patient_phone_number": "patient__phone_number",
+        "treatment_direction": "treatment_direction_id",
+        "treatment_direction_name": "treatment_direction__name",
+        "updated_at": "updated_at",
+    },
+    VisitFilterForm,
+)
+PATIENTS = Resource(
+    "patients",
+    Patient.objects.all,
+    {
+        "id": "id",
+        "first_name": "first_name",
+        "last_name": "last_name",
+        "phone_number": "phone_number",
+        "date_of_birth": "date_of_birth",
+        "updated_at": "updated_at",
+    },
+)
+DOCTORS = Resource(
+    "doctors",
+    lambda: Doctor.objects.filter(is_staff=False),
+    {
+        "id": "id",
+        "username": "username",
+        "first_name": "first_name",
+        "last_name": "last_name",
+        "email": "email",
+        "recertification_with": "recertification_with",
+        "specializations": "specialization_labels",
+        "updated_at": "updated_at",
+    },
+)
+SPECIALIZATIONS = Resource(
+    "specializations",
+    Specialization.objects.all,
+    {
+        "id": "id",
+        "name": "name",
+        "visit_duration": "visit_duration",
+        "updated_at": "updated_at",
+    },
+)
@@ -0,0 +1,245 @@
+import base64
+import json
+from datetime import datetime
+from unittest import mock
+
+from django.contrib.auth import authenticate, get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+
+from reception.models import Visit
+from users.models import Patient, Specialization
+
+VISIT_LIST_URL = reverse("api:v1:visit-list")
+PATIENT_LIST_URL = reverse("api:v1:patient-list")
+
+
+class PublicApiTest(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_login_required(self):
+        response = self.client.get(VISIT_LIST_URL)
+
+        self.assertEqual(response.status_code, 401)
+        self.assertEqual(response["WWW-Authenticate"], 'Basic realm="api"')
+
+    def test_basic_auth(self):
+        get_user_model().objects.create_user(
+            username="integration", password="Secret12345"
+        )
+        credentials = base64.b64encode(b"integration:Secret12345").decode()
+
+        response = self.client.get(
+            VISIT_LIST_URL, HTTP_AUTHORIZATION=f"Basic {credentials}"
+        )
+        self.assertEqual(response.status_code, 200)
+
+    def test_basic_auth_is_checked_once(self):
+        user = get_user_model().objects.create_user(
+            username="integration", password="Secret12345"
+        )
+        credentials = base64.b64encode(b"integration:Secret12345").decode()
+
+        with mock.patch(
+            "api.views.authenticate", wraps=authenticate
+        ) as checked:
+            for _ in range(3):
+                response = self.client.get(
+                    VISIT_LIST_URL, HTTP_AUTHORIZATION=f"Basic {credentials}"
+                )
+                self.assertEqual(response.status_code, 200)
+            self.assertEqual(checked.call_count, 1)
+
+        user.set_password("Changed12345")
+        user.save()
+        response = self.client.get(
+            VISIT_LIST_URL, HTTP_AUTHORIZATION=f"Basic {credentials}"
+        )
+        self.assertEqual(response.status_code, 401)
+
+    def test_wrong_basic_auth(self):
+        response = self.client.get(
+            VISIT_LIST_URL, HTTP_AUTHORIZATION="Basic not-base64!"
+        )
+        self.assertEqual(response.status_code, 401)
+
+    def test_read_only(self):
+        response = self.client.post(VISIT_LIST_URL)
+        self.assertEqual(response.status_code, 401)
+
+
+class PrivateApiTest(TestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            username="DocUsername", password="DocPassword123"
+        )
+        self.client.force_login(self.user)
+        self.doctor = get_user_model().objects.create_user(
+            username="Doctor", first_name="Taras", last_name="Bondar"
+        )
+        self.specialization = Specialization.objects.create(name="Surgeon")
+        self.patients = [
+            Patient.objects.create(
+                first_name=f"Ivan{number}",
+                last_name=f"Petrenko{number}",
+                phone_number=f"067123456{number}",
+            )
+            for number in range(5)
+        ]
+        self.visits = [
+            Visit.objects.create(
+                date_time=datetime(2030, 1, day, 10),
+                doctor=self.doctor,
+                patient=patient,
+                treatment_direction=self.specialization,
+            )
+            for day, patient in enumerate(self.patients, start=1)
+        ]
+
+    def test_list(self):
+        response = self.client.get(PATIENT_LIST_URL)
+
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual(len(data["results"]), 5)
+        self.assertIsNone(data["next"])
+        self.assertEqual(
+            set(data["results"][0]),
+            {
+                "id",
+                "first_name",
+                "last_name",
+                "phone_number",
+                "date_of_birth",
+                "updated_at",
+            },
+        )
+
+    def test_sparse_fieldset(self):
+        response = self.client.get(
+            VISIT_LIST_URL,
+            {"fields": "date_time,patient_last_name,treatment_direction_name"},
+        )
+
+        self.assertEqual(
+            response.json()["results"][0],
+            {
+                "date_time": "2030-01-01T10:00:00",
+                "patient_last_name": "Petrenko0",
+                "treatment_direction_name": "Surgeon",
+            },
+        )
+
+    def test_visits_are_read_in_one_query(self):
+        with self.assertNumQueries(3):
+            self.client.get(VISIT_LIST_URL)
+
+    def test_unknown_field(self):
+        response = self.client.get(PATIENT_LIST_URL, {"fields": "id,password"})
+
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("fields", response.json()["errors"])
+
+    def test_cursor_pages(self):
+        response = self.client.get(PATIENT_LIST_URL, {"limit": 2})
+        ids = []
+        while True:
+            data = response.json()
+            ids += [row["id"] for row in data["results"]]
+            if data["next"] is None:
+                break
+            response = self.client.get(data["next"])
+
+        self.assertEqual(ids, [patient.id for patient in self.patients])
+
+    def test_invalid_cursor(self):
+        for cursor in ("garbage", "WyJuIiwgIngiXQ=="):
+            response = self.client.get(PATIENT_LIST_URL, {"cursor": cursor})
+            self.assertEqual(response.status_code, 400)
+
+    def test_deleted_rows_are_hidden(self):
+        self.patients[0].delete()
+
+        response = self.client.get(VISIT_LIST_URL)
+        self.assertEqual(len(response.json()["results"]), 4)
+        response = self.client.get(PATIENT_LIST_URL)
+        self.assertEqual(len(response.json()["results"]), 4)
+
+    def test_visit_filters(self):
+        response = self.client.get(
+            VISIT_LIST_URL,
+            {
+                "date_from": "2030-01-02",
+                "date_to": "2030-01-03",
+                "doctor": self.doctor.id,
+                "fields": "id",
+            },
+        )
+
+        self.assertEqual(
+            response.json()["results"],
+            [{"id": self.visits[1].id}, {"id": self.visits[2].id}],
+        )
+
+    def test_invalid_visit_filters(self):
+        response = self.client.get(
+            VISIT_LIST_URL,
+            {"date_from": "2030-01-03", "date_to": "2030-01-02"},
+        )
+        self.assertEqual(response.status_code, 400)
+
+    def test_updated_since(self):
+        self.patients[3].save()
+        response = self.client.get(
+            PATIENT_LIST_URL,
+            {
+                "updated_since": self.patients[3].updated_at.isoformat(),
+                "fields": "id",
+            },
+        )
+
+        self.assertEqual(
+            response.json()["results"], [{"id": self.patients[3].id}]
+        )
+
+    def test_stream(self):
+        response = self.client.get(
+            VISIT_LIST_URL, {"format": "jsonl", "fields": "id,doctor"}
+        )
+
+        self.assertTrue(response.streaming)
+        self.assertEqual(response["Content-Type"], "application/x-ndjson")
+        lines = b"".join(response.streaming_content).decode().splitlines()
+        self.assertEqual(
+            [json.loads(line) for line in lines],
+            [
+                {"id": visit.id, "doctor": self.doctor.id}
+                for visit in self.visits
+            ],
+        )
+
+    def test_detail(self):
+        url = reverse("api:v1:doctor-detail", kwargs={"pk": self.doctor.pk})
+        self.doctor.specializations.add(self.specialization)
+
+        response = self.client.get(
+            url, {"fields": "last_name,specializations"}
+        )
+        self.assertEqual(
+            response.json(),
+            {"last_name": "Bondar", "specializations": "Surgeon"},
+        )
+
+    def test_detail_not_found(self):
+        url = reverse("api:v1:patient-detail", kwargs={"pk": 0})
+        self.assertEqual(self.client.get(url).status_code, 404)
+
+    def test_specializations(self):
+        response = self.client.get(reverse("api:v1:specialization-list"))
+
+        self.assertEqual(
+            response.json()["results"][0]["visit_duration"],
+            self.specialization.visit_duration,
+        )
@@ -0,0 +1,30 @@
+from django.urls import include, path
+
+from api.resources import DOCTORS, PATIENTS, SPECIALIZATIONS, VISITS
+from api.views import ResourceDetailView, ResourceListView
+
+app_name = "api"
+
+v1_patterns = []
+for resource, name in (
+    (VISITS, "visit"),
+    (PATIENTS, "patient"),
+    (DOCTORS, "doctor"),
+    (SPECIALIZATIONS, "specialization"),
+):
+    v1_patterns += [
+        path(
+            f"{resource.name}/",
+            ResourceListView.as_view(resource=resource),
+            name=f"{name}-list",
+        ),
+        path(
+            f"{resource.name}/<int:pk>/",
+            ResourceDetailView.as_view(resource=resource),
+            name=f"{name}-detail",
+        ),
+    ]
+
+urlpatterns = [
+    path("v1/", include((v1_patterns, "v1"))),
+]
@@ -0,0 +1,173 @@
+"""
+Read-only JSON API, version 1.
+
+    GET /api/v1/<resource>/?fields=id,date_time&limit=100&cursor=...
+    GET /api/v1/<resource>/?format=jsonl
+    GET /api/v1/<resource>/<id>/?fields=...
+
+Only live rows are served, in the order of their ids. A page links
+to the next one with a keyset cursor, so deep pages cost as much
+as the first one. With `format=jsonl` the whole list is streamed
+as JSON Lines, read from the database in chunks.
+
+Clients log in with the session of the site or HTTP Basic auth.
+A Basic auth check is cached for a few minutes, so the password is
+hashed once per client and not on every request.
+"""
+
+import base64
+import binascii
+import json
+
+from django.contrib.auth import authenticate, get_user_model
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import JsonResponse, StreamingHttpResponse
+from django.utils.crypto import salted_hmac
+from django.views import View
+
+from api.forms import ApiQueryForm
+from utils.exports import JSON_LINES
+from utils.pagination import NEXT, encode_cursor
+
+STREAM_CHUNK_SIZE = 2000
+BASIC_AUTH_CACHE_PREFIX = "api:basic:"
+# Seconds
+BASIC_AUTH_TIMEOUT = 5 * 60
+
+
+def authenticate_basic(request):
+    """
+    The user of the HTTP Basic credentials of the request, if valid.
+    """
+    scheme, _, credentials = request.headers.get(
+        "Authorization", ""
+    ).partition(" ")
+    if scheme.lower() != "basic":
+        return None
+    try:
+        decoded = base64.b64decode(credentials).decode()
+    except (binascii.Error, UnicodeDecodeError):
+        return None
+
+    # The credentials themselves never reach the cache
+    key = (
+        BASIC_AUTH_CACHE_PREFIX
+        + salted_hmac(
+            BASIC_AUTH_CACHE_PREFIX, decoded, algorithm="sha256"
+        ).hexdigest()
+    )
+    checked = cache.get(key)
+    if checked is not None:
+        pk, auth_hash = checked
+        user = (
+            get_user_model()
+            ._default_manager.filter(pk=pk, is_active=True)
+            .first()
+        )
+        # A new password changes the hash and drops the check
+        if user is not None and user.get_session_auth_hash() == auth_hash:
+            return user
+
+    username, _, password = decoded.partition(":")
+    user = authenticate(request, username=username, password=password)
+    if user is not None:
+        cache.set(
+            key, (user.pk, user.get_session_auth_hash()), BASIC_AUTH_TIMEOUT
+        )
+
+    return user
+
+
+class ApiView(View):
+    resource = None
+    http_method_names = ["get", "head", "options"]
+
+    def dispatch(self, request, *args, **kwargs):
+        if not request.user.is_authenticated:
+            user = authenticate_basic(request)
+            if user is None:
+                response = JsonResponse(
+                    {"detail": "Authentication required."}, status=401
+                )
+                response.headers["WWW-Authenticate"] = 'Basic realm="api"'
+                return response
+            request.user = user
+
+        return super().dispatch(request, *args, **kwargs)
+
+    def select(self):
+        return self.resource.select(self.request.GET.get("fields", ""))
+
+
+class ResourceListView(ApiView):
+    def get(self, request):
+        form = ApiQueryForm(request.GET)
+        filter_form = None
+        if self.resource.filter_form is not None:
+            filter_form = self.resource.filter_form(request.GET)
+        errors = {}
+        for checked in (form, filter_form):
+            if checked is not None and not checked.is_valid():
+                errors.update(checked.errors)
+        try:
+            names = self.select()
+        except ValidationError as error:
+            errors["fields"] = error.messages
+        if errors:
+            return JsonResponse({"errors": errors}, status=400)
+
+        queryset = self.resource.get_queryset().order_by("id")
+        if filter_form is not None:
+            queryset = queryset.filter(**filter_form.cleaned_data)
+        if form.cleaned_data["updated_since"]:
+            queryset = queryset.filter(
+                updated_at__gte=form.cleaned_data["updated_since"]
+            )
+        if form.cleaned_data["cursor"] is not None:
+            queryset = queryset.filter(id__gt=form.cleaned_data["cursor"])
+
+        if form.cleaned_data["format"] == JSON_LINES:
+            return StreamingHttpResponse(
+                self.stream(queryset, names),
+                content_type="application/x-ndjson",
+            )
+
+        limit = form.cleaned_data["limit"]
+        rows = list(self.resource.rows(queryset, names, limit=limit + 1))
+        next_url = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            query = request.GET.copy()
+            query["cursor"] = encode_cursor([rows[-1][0]], NEXT)
+            next_url = request.build_absolute_uri(
+                f"{request.path}?{query.urlencode()}"
+            )
+
+        return JsonResponse(
+            {"results": [row for _, row in rows], "next": next_url}
+        )
+
+    def stream(self, queryset, names):
+        rows = self.resource.rows(
+            queryset, names, chunk_size=STREAM_CHUNK_SIZE
+        )
+        for _, row in rows:
+            yield json.dumps(row, cls=DjangoJSONEncoder) + "\n"
+
+
+class ResourceDetailView(ApiView):
+    def get(self, request, pk):
+        try:
+            names = self.select()
+        except ValidationError as error:
+            return JsonResponse(
+                {"errors": {"fields": error.messages}}, status=400
+            )
+
+        queryset = self.resource.get_queryset().filter(pk=pk)
+        for _, row in self.resource.rows(queryset, names):
+            return JsonResponse(row)
+
+        return JsonResponse({"detail": "Not found."}, status=404)
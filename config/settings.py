@@ -49,6 +49,7 @@ INSTALLED_APPS = [
     "reception",
     "users",
     "utils",
+    "api",
 ]
 
 MIDDLEWARE = [
@@ -88,13 +89,68 @@ WSGI_APPLICATION = "config.wsgi.application"
 # Database
 # https://docs.djangoproject.com/en/4.2/ref/settings/#databases
 
+# DATABASE_PROFILE=production reuses the connections and tunes SQLite
+# for parallel readers and writers (see SQLITE_PRODUCTION_PRAGMAS).
+# The default profile keeps the stock SQLite behaviour, a connection
+# per request and no WAL files next to the database.
+DATABASE_PROFILE = os.environ.get("DATABASE_PROFILE", "default")
+
 DATABASES = {
     "default": {
         "ENGINE": "django.db.backends.sqlite3",
         "NAME": BASE_DIR / "db.sqlite3",
+        # Seconds a connection is reused across requests, 0 opens
+        # a connection per request
+        "CONN_MAX_AGE": int(
+            os.environ.get(
+                "CONN_MAX_AGE", 600 if DATABASE_PROFILE == "production" else 0
+            )
+        ),
+        "CONN_HEALTH_CHECKS": True,
     }
 }
 
+# PRAGMAs of the production profile. In WAL mode the readers do not
+# block the writer nor the writer the readers, and NORMAL synchronous
+# is safe with WAL
+SQLITE_PRODUCTION_PRAGMAS = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    # Milliseconds a writer waits for the lock before "database is locked"
+    "busy_timeout": 5000,
+    # Negative: KiB of page cache per connection
+    "cache_size": -64000,
+    "mmap_size": 256 * 1024 * 1024,
+    "temp_store": "MEMORY",
+}
+
+# PRAGMAs run on every new SQLite connection (see utils.signals)
+SQLITE_PRAGMAS = (
+    SQLITE_PRODUCTION_PRAGMAS if DATABASE_PROFILE == "production" else {}
+)
+
+# Cache
+# https://docs.djangoproject.com/en/4.2/topics/cache/
+
+CACHES = {
+    "default": {
+        "BACKEND": os.environ.get(
+            "CACHE_BACKEND", "django.core.cache.backends.locmem.LocMemCache"
+        ),
+        "LOCATION": os.environ.get("CACHE_LOCATION", ""),
+    }
+}
+
+# Sessions
+# https://docs.djangoproject.com/en/4.2/topics/http/sessions/
+# "django.contrib.sessions.backends.signed_cookies" or
+# "django.contrib.sessions.backends.cached_db" keep session reads
+# off the database
+
+SESSION_ENGINE = os.environ.get(
+    "SESSION_ENGINE", "django.contrib.sessions.backends.db"
+)
+
 # Password validation
 # https://docs.djangoproject.com/en/4.2/ref/settings/#auth-password-validators
 
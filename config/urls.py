@@ -23,4 +23,5 @@ urlpatterns = [
     path("", include("reception.urls", namespace="reception")),
     path("accounts/", include("django.contrib.auth.urls")),
     path("users/", include("users.urls", namespace="user")),
+    path("api/", include("api.urls", namespace="api")),
 ]
@@ -1,12 +1,14 @@
 from django.contrib import admin
 
-from reception.models import Visit
+from reception.models import PageViewCounter, Visit, VisitArchive
+from utils.admin import SoftDeleteAdmin
 
 
 @admin.register(Visit)
-class VisitAdmin(admin.ModelAdmin):
+class VisitAdmin(SoftDeleteAdmin):
     list_display = (
         "date_time",
+        "duration",
         "patient",
         "type_of_visit",
         "doctor",
@@ -19,3 +21,21 @@ class VisitAdmin(admin.ModelAdmin):
         "deleted_at",
     )
     search_fields = ("doctor",)
+
+
+@admin.register(VisitArchive)
+class VisitArchiveAdmin(admin.ModelAdmin):
+    list_display = (
+        "date_time",
+        "patient",
+        "doctor",
+        "deleted_at",
+        "archived_at",
+    )
+    list_filter = ("deleted_at", "archived_at")
+
+
+@admin.register(PageViewCounter)
+class PageViewCounterAdmin(admin.ModelAdmin):
+    list_display = ("key", "count")
+    search_fields = ("key",)
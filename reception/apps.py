@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class ReceptionConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "reception"
+
+    def ready(self):
+        from reception import signals  # noqa: F401
@@ -0,0 +1,110 @@
+"""
+Archival of visits.
+
+The visits of the distant past and the visits deleted long ago are
+moved from the visit table to the archive table a batch at a time, one
+transaction per batch, so that the table the schedule is read from
+stays small. Run the `archive_visits` command periodically, e.g. nightly.
+
+The history of a patient is read from both tables in one query.
+"""
+
+from datetime import datetime, timedelta
+
+from django.db import transaction
+from django.db.models import Q
+
+from reception import dashboard
+from reception.models import Visit, VisitArchive
+from utils import fragments
+
+HORIZON = timedelta(days=365)
+RETENTION = timedelta(days=30)
+BATCH_SIZE = 1000
+HISTORY_SIZE = 10
+
+# The columns copied to the archive, the id first
+ARCHIVED_FIELDS = tuple(
+    field.attname
+    for field in VisitArchive._meta.concrete_fields
+    if field.name != "archived_at"
+)
+HISTORY_FIELDS = (
+    "id",
+    "date_time",
+    "duration",
+    "type_of_visit",
+    "doctor_id",
+    "doctor__first_name",
+    "doctor__last_name",
+    "treatment_direction__name",
+    # The duration of the visits without their own
+    "treatment_direction__visit_duration",
+)
+
+
+def archivable(horizon=HORIZON, retention=RETENTION, now=None):
+    """
+    Visits that started before the horizon
+    or were deleted before the retention period.
+    """
+    now = now or datetime.now()
+    return Visit.all_objects.filter(
+        Q(date_time__lt=now - horizon) | Q(deleted_at__lt=now - retention)
+    )
+
+
+def archive_visits(
+    horizon=HORIZON, retention=RETENTION, batch_size=BATCH_SIZE, now=None
+):
+    """
+    Move the archivable visits to the archive.
+    Returns the number of moved visits.
+    """
+    queryset = archivable(horizon, retention, now).order_by("pk")
+    moved, last_pk = 0, 0
+    while True:
+        with transaction.atomic():
+            batch = queryset.filter(pk__gt=last_pk)
+            rows = list(batch.values_list(*ARCHIVED_FIELDS)[:batch_size])
+            if not rows:
+                break
+
+            VisitArchive.objects.bulk_create(
+                VisitArchive(**dict(zip(ARCHIVED_FIELDS, row))) for row in rows
+            )
+            pks = [row[0] for row in rows]
+            # Nothing refers to visits and the rows live on in the
+            # archive: no collector, no delete signals
+            deleted = Visit._base_manager.filter(pk__in=pks)
+            deleted._raw_delete(deleted.db)
+
+        moved += len(rows)
+        last_pk = pks[-1]
+
+    if moved:
+        dashboard.invalidate("num_visits")
+        fragments.bump(Visit)
+        fragments.bump(VisitArchive)
+
+    return moved
+
+
+def patient_history(patient, limit=HISTORY_SIZE, now=None):
+    """
+    The past visits of the patient that are not deleted, the latest
+    first, from the visit table and the archive in one query.
+    The visits are dicts of HISTORY_FIELDS.
+    """
+    recent = Visit.objects.filter(
+        patient=patient, date_time__lt=now or datetime.now()
+    )
+    archived = VisitArchive.objects.filter(
+        patient=patient, deleted_at__isnull=True
+    )
+    return (
+        recent.order_by()
+        .values(*HISTORY_FIELDS)
+        .union(archived.order_by().values(*HISTORY_FIELDS), all=True)
+        .order_by("-date_time", "-id")[:limit]
+    )
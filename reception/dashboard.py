@@ -0,0 +1,74 @@
+"""
+Counters of the home page, served from the cache.
+
+A counter is dropped from the cache whenever the rows it counts change
+(see reception.signals) and recomputed by the next request. The number
+of future visits also expires when the nearest visit starts.
+"""
+
+from datetime import datetime
+
+from django.core.cache import cache
+
+from reception.models import Visit
+from users.models import Doctor, Patient
+
+CACHE_PREFIX = "dashboard:"
+
+# Safety net for changes that bypass the model signals
+# (QuerySet.update(), raw SQL), seconds
+MAX_TIMEOUT = 60 * 60
+
+
+def count_visits():
+    """
+    The number of future visits and how long this number holds.
+    """
+    now = datetime.now()
+    queryset = Visit.objects.filter(date_time__gte=now)
+    nearest = queryset.values_list("date_time", flat=True).first()
+    if nearest is None:
+        return 0, MAX_TIMEOUT
+
+    timeout = min((nearest - now).total_seconds() + 1, MAX_TIMEOUT)
+    return queryset.count(), int(timeout)
+
+
+def count_patients():
+    return Patient.objects.count(), MAX_TIMEOUT
+
+
+def count_doctors():
+    return (
+        Doctor.objects.filter(is_staff=False).count(),
+        MAX_TIMEOUT,
+    )
+
+
+COUNTERS = {
+    "num_visits": count_visits,
+    "num_patients": count_patients,
+    "num_doctors": count_doctors,
+}
+
+
+def get_counters():
+    """
+    All the counters of the home page.
+    No queries while the cache holds them.
+    """
+    cached = cache.get_many(CACHE_PREFIX + name for name in COUNTERS)
+    counters = {}
+    for name, count in COUNTERS.items():
+        key = CACHE_PREFIX + name
+        if key in cached:
+            counters[name] = cached[key]
+        else:
+            counters[name], timeout = count()
+            cache.set(key, counters[name], timeout)
+
+    return counters
+
+
+def invalidate(*names):
+    cache.delete_many(CACHE_PREFIX + name for name in names)
@@ -0,0 +1,27 @@
+"""
+Export of the visit schedule. The columns are the ones
+`reception.imports` reads, so the upcoming visits of an export can be
+imported into another database. The import rejects the past visits.
+"""
+
+from reception.models import SCHEDULED, Visit
+
+VISIT_COLUMNS = {
+    "id": "id",
+    "date_time": "date_time",
+    "doctor": "doctor__username",
+    "patient": "patient__phone_number",
+    "treatment_direction": "treatment_direction__name",
+    "duration": "duration",
+    "type_of_visit": "type_of_visit",
+}
+
+
+def visits_to_export(lookups=None):
+    """
+    Live visits of live doctors and patients in the order of the
+    schedule, filtered by the lookups of VisitFilterForm.
+    """
+    return Visit.objects.filter(SCHEDULED, **(lookups or {})).order_by(
+        "date_time", "id"
+    )
@@ -1,9 +1,28 @@
-from datetime import datetime
+from datetime import datetime, time, timedelta
 
 from django import forms
 from django.core.exceptions import ValidationError
 
-from reception.models import Visit
+from reception.models import Visit, get_visit_duration
+from users.models import Specialization
+from utils.exports import FORMAT_CHOICES
+from utils.widgets import AutocompleteSelect
+
+MAX_FREE_SLOTS_DAYS = 31
+
+RESOLUTION = timedelta.resolution
+DATE_TIME_SEARCH_FORMATS = (
+    ("%Y-%m-%d %H:%M", timedelta(minutes=1)),
+    ("%Y-%m-%d %H", timedelta(hours=1)),
+    ("%Y-%m-%d", timedelta(days=1)),
+    # Up to the start of the next month or year
+    ("%Y-%m", "month"),
+    ("%Y", "year"),
+)
+TIME_SEARCH_FORMATS = (
+    ("%H:%M", timedelta(minutes=1)),
+    ("%H", timedelta(hours=1)),
+)
 
 
 class VisitForm(forms.ModelForm):
@@ -12,35 +31,49 @@ class VisitForm(forms.ModelForm):
         fields = (
             "patient",
             "date_time",
+            "duration",
             "treatment_direction",
             "doctor",
             "type_of_visit",
         )
+        widgets = {
+            "patient": AutocompleteSelect("user:patient-autocomplete"),
+            "doctor": AutocompleteSelect(
+                "user:doctor-autocomplete",
+                depends_on={"specialization": "treatment_direction"},
+            ),
+        }
 
     def clean_date_time(self):
         return validate_date_time(self.cleaned_data["date_time"])
 
+    def clean(self):
+        cleaned_data = super().clean()
+        doctor = cleaned_data.get("doctor")
+        date_time = cleaned_data.get("date_time")
+        if doctor and date_time:
+            duration = get_visit_duration(
+                cleaned_data.get("duration"),
+                cleaned_data.get("treatment_direction"),
+            )
+            try:
+                validate_doctor_is_free(
+                    doctor,
+                    date_time,
+                    date_time + timedelta(minutes=duration),
+                    self.instance.pk,
+                )
+            except ValidationError as error:
+                self.add_error("date_time", error)
+
+        return cleaned_data
+
 
 def validate_date_time(date_time):
     """
     Check the visit date field.
     The visit date must be greater than the current date. Timezone-aware!
     """
-    queryset = (
-        Visit.objects.select_related(
-            "treatment_direction", "doctor", "patient"
-        )
-        .filter(patient__deleted_at__isnull=True)
-        .filter(doctor__deleted_at__isnull=True)
-        .filter(date_time__gte=datetime.now(date_time.tzinfo))
-    )
-    for visit in queryset:
-        if date_time == visit.date_time:
-            raise ValidationError(
-                f"{visit.doctor} already has an entry for this date and time. "
-                "Please select another date/time or doctor."
-            )
-
     if date_time <= datetime.now(date_time.tzinfo):
         raise ValidationError(
             "The visit date is overdue. Enter a visit date "
@@ -50,12 +83,144 @@ def validate_date_time(date_time):
     return date_time
 
 
+def validate_doctor_is_free(doctor, date_time, end_date_time, visit_pk=None):
+    """
+    Check that the visit does not overlap other visits of the doctor.
+    The visit being edited (visit_pk) does not conflict with itself.
+    """
+    overlapping = Visit.objects.busy(
+        doctor, date_time, end_date_time, exclude=visit_pk
+    )
+    if overlapping.exists():
+        raise ValidationError(
+            f"{doctor} already has an entry for this date and time. "
+            "Please select another date/time or doctor."
+        )
+
+    return date_time
+
+
 class VisitSearchForm(forms.Form):
     date_time = forms.CharField(
-        max_length=10,
+        max_length=16,
         required=False,
         label="",
         widget=forms.TextInput(
             attrs={"placeholder": "Search by date or time"}
         ),
     )
+
+    def clean_date_time(self):
+        return parse_date_time_search(self.cleaned_data["date_time"])
+
+
+def parse_date_time_search(value):
+    """
+    Turn the search line into range lookups the indexes can serve.
+    A date (YYYY-MM-DD), a month (YYYY-MM), a year (YYYY) or a date
+    with an hour (YYYY-MM-DD HH[:MM]) searches `date_time`; a time
+    of day (HH[:MM]) searches `time_of_day`.
+    """
+    value = value.strip()
+    if not value:
+        return {}
+
+    for date_format, span in DATE_TIME_SEARCH_FORMATS:
+        try:
+            start = datetime.strptime(value, date_format)
+            if span == "month":
+                span = (start + timedelta(days=31)).replace(day=1) - start
+            elif span == "year":
+                span = start.replace(year=start.year + 1) - start
+        except ValueError:
+            continue
+        return {"date_time__range": (start, start + span - RESOLUTION)}
+
+    for time_format, span in TIME_SEARCH_FORMATS:
+        try:
+            start = datetime.strptime(value, time_format)
+        except ValueError:
+            continue
+        end = start + span - RESOLUTION
+        return {"time_of_day__range": (start.time(), end.time())}
+
+    raise ValidationError(
+        "Enter a year (YYYY), a month (YYYY-MM), a date (YYYY-MM-DD), "
+        "a date and time (YYYY-MM-DD HH:MM) or a time (HH:MM)."
+    )
+
+
+class FreeSlotForm(forms.Form):
+    specialization = forms.ModelChoiceField(
+        queryset=Specialization.objects.all()
+    )
+    date_from = forms.DateField()
+    date_to = forms.DateField()
+
+    def clean(self):
+        cleaned_data = super().clean()
+        date_from = cleaned_data.get("date_from")
+        date_to = cleaned_data.get("date_to")
+        if date_from and date_to:
+            validate_date_range(date_from, date_to)
+
+        return cleaned_data
+
+
+def validate_date_range(date_from, date_to):
+    """
+    Check the period of the free slots search.
+    The period is at most MAX_FREE_SLOTS_DAYS days long.
+    """
+    if date_to < date_from:
+        raise ValidationError("The end date is before the start date.")
+    if (date_to - date_from).days >= MAX_FREE_SLOTS_DAYS:
+        raise ValidationError(
+            f"The period is longer than {MAX_FREE_SLOTS_DAYS} days."
+        )
+
+
+class VisitImportForm(forms.Form):
+    visits_file = forms.FileField(
+        help_text="CSV or JSON Lines with the columns date_time, doctor "
+        "(username), patient (phone number), treatment_direction (name), "
+        "duration and type_of_visit"
+    )
+    format = forms.ChoiceField(  # noqa: VNE003
+        choices=(("", "By the file extension"), *FORMAT_CHOICES),
+        required=False,
+    )
+
+
+class VisitFilterForm(forms.Form):
+    doctor = forms.IntegerField(min_value=1, required=False)
+    patient = forms.IntegerField(min_value=1, required=False)
+    treatment_direction = forms.IntegerField(min_value=1, required=False)
+    date_from = forms.DateField(required=False)
+    date_to = forms.DateField(required=False)
+
+    def clean(self):
+        """
+        Turn the filters into the lookups of the visits.
+        """
+        cleaned_data = super().clean()
+        if self.errors:
+            return cleaned_data
+
+        lookups = {
+            f"{name}_id": cleaned_data[name]
+            for name in ("doctor", "patient", "treatment_direction")
+            if cleaned_data[name] is not None
+        }
+        date_from = cleaned_data["date_from"]
+        date_to = cleaned_data["date_to"]
+        if date_from and date_to and date_to < date_from:
+            raise ValidationError("The end date is before the start date.")
+        if date_from:
+            lookups["date_time__gte"] = datetime.combine(date_from, time())
+        if date_to:
+            lookups["date_time__lt"] = datetime.combine(
+                date_to + timedelta(days=1), time()
+            )
+
+        return lookups
@@ -0,0 +1,199 @@
+"""
+Bulk import of visits from CSV or JSON Lines.
+
+A record names its doctor by username, its patient by phone number and
+its treatment direction by name:
+
+    date_time,doctor,patient,treatment_direction,duration,type_of_visit
+    2031-01-10 09:30,ivanenko,0671234567,Surgeon,30,INIT
+
+The records are streamed and handled a chunk at a time. The references
+of a chunk are resolved with one query per model into lookup maps kept
+for the next chunks, the slots are checked against the doctors'
+schedules in memory (`book_visits`), and the accepted visits are
+inserted with `bulk_create` in one transaction per chunk.
+"""
+
+import csv
+import json
+from itertools import islice
+
+from django.core.exceptions import ValidationError
+from django.db import transaction
+
+from reception.forms import validate_date_time
+from reception.models import VISIT_CHOICES, Visit
+from reception.scheduling import book_visits
+from users.models import (
+    VISIT_DURATION_VALIDATORS,
+    Doctor,
+    Patient,
+    Specialization,
+)
+from utils.exports import CSV, JSON_LINES
+
+CHUNK_SIZE = 1000
+VISIT_TYPES = dict(VISIT_CHOICES)
+DEFAULT_VISIT_TYPE = Visit._meta.get_field("type_of_visit").default
+
+
+class ReferenceMap:
+    """
+    Live rows of a model by a unique field. The rows a chunk refers to
+    are fetched in one query and remembered, misses included.
+    """
+
+    def __init__(self, queryset, field):
+        self.queryset = queryset
+        self.field = field
+        self.rows = {}
+
+    def load(self, keys):
+        missing = {key for key in keys if key and key not in self.rows}
+        if not missing:
+            return
+        for obj in self.queryset.filter(**{f"{self.field}__in": missing}):
+            self.rows[getattr(obj, self.field)] = obj
+        for key in missing:
+            self.rows.setdefault(key, None)
+
+    def get(self, key):
+        return self.rows.get(key)
+
+
+def guess_format(name):
+    return JSON_LINES if name.endswith((".jsonl", ".ndjson")) else CSV
+
+
+def read_records(stream, file_format):
+    """
+    The (line number, record) pairs of a text stream. A record that
+    cannot be parsed is None.
+    """
+    if file_format == CSV:
+        reader = csv.DictReader(stream)
+        for record in reader:
+            yield reader.line_num, record
+        return
+
+    for line_number, line in enumerate(stream, start=1):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError:
+            record = None
+        yield line_number, record if isinstance(record, dict) else None
+
+
+def text(record, key):
+    value = record.get(key)
+    return "" if value is None else str(value).strip()
+
+
+def build_visit(record, doctors, patients, specializations):
+    """
+    The visit of the record, its references resolved by the maps.
+    Raises ValidationError listing every problem of the record.
+    """
+    if record is None:
+        raise ValidationError("The record cannot be parsed.")
+
+    errors = []
+    visit = Visit()
+    date_time = text(record, "date_time")
+    if not date_time:
+        errors.append("The date and time of the visit are required.")
+    else:
+        try:
+            visit.date_time = validate_date_time(
+                Visit._meta.get_field("date_time").to_python(date_time)
+            )
+        except ValidationError as error:
+            errors += error.messages
+
+    for field, references, key in (
+        ("doctor", doctors, "username"),
+        ("patient", patients, "phone number"),
+        ("treatment_direction", specializations, "name"),
+    ):
+        value = text(record, field)
+        obj = references.get(value)
+        if obj is None:
+            label = field.replace("_", " ")
+            errors.append(
+                f"No {label} with the {key} '{value}'."
+                if value
+                else f"The {label} is required."
+            )
+        setattr(visit, field, obj)
+
+    duration = text(record, "duration")
+    if duration:
+        try:
+            visit.duration = int(duration)
+            for validator in VISIT_DURATION_VALIDATORS:
+                validator(visit.duration)
+        except ValueError:
+            errors.append(f"The duration '{duration}' is not a number.")
+        except ValidationError as error:
+            errors += error.messages
+
+    visit.type_of_visit = text(record, "type_of_visit") or DEFAULT_VISIT_TYPE
+    if visit.type_of_visit not in VISIT_TYPES:
+        errors.append(f"The type of visit is one of {', '.join(VISIT_TYPES)}.")
+
+    if errors:
+        raise ValidationError(errors)
+
+    return visit
+
+
+def import_visits(records, chunk_size=CHUNK_SIZE):
+    """
+    Create the visits of the (line number, record) pairs.
+    Returns the number of created visits and the (line number, message)
+    pairs of the rejected records.
+    """
+    doctors = ReferenceMap(
+        Doctor.objects.filter(is_staff=False).only("username", "deleted_at"),
+        "username",
+    )
+    patients = ReferenceMap(
+        Patient.objects.only("phone_number", "deleted_at"), "phone_number"
+    )
+    specializations = ReferenceMap(Specialization.objects.all(), "name")
+
+    created, errors = 0, []
+    records = iter(records)
+    while chunk := list(islice(records, chunk_size)):
+        parsed = [record for _, record in chunk if record is not None]
+        doctors.load(text(record, "doctor") for record in parsed)
+        patients.load(text(record, "patient") for record in parsed)
+        specializations.load(
+            text(record, "treatment_direction") for record in parsed
+        )
+
+        visits, lines = [], {}
+        for line_number, record in chunk:
+            try:
+                visit = build_visit(record, doctors, patients, specializations)
+            except ValidationError as error:
+                errors.append((line_number, " ".join(error.messages)))
+                continue
+            visits.append(visit)
+            lines[id(visit)] = line_number
+
+        with transaction.atomic():
+            accepted, rejected = book_visits(visits, batch_size=chunk_size)
+        created += len(accepted)
+        errors += [
+            (
+                lines[id(visit)],
+                f"{visit.doctor} already has a visit at this time.",
+            )
+            for visit in rejected
+        ]
+
+    errors.sort()
+    return created, errors
@@ -0,0 +1,38 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+
+from reception.archive import BATCH_SIZE, HORIZON, RETENTION, archive_visits
+from utils.checks import LOCAL_CACHE_WARNING, cache_is_local
+
+
+class Command(BaseCommand):
+    help = (  # noqa: VNE003
+        "Move the visits of the distant past and the visits deleted "
+        "long ago to the archive table."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--horizon-days",
+            type=int,
+            default=HORIZON.days,
+            help="Archive the visits older than this",
+        )
+        parser.add_argument(
+            "--retention-days",
+            type=int,
+            default=RETENTION.days,
+            help="Archive the visits deleted longer ago than this",
+        )
+        parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+
+    def handle(self, *args, **options):
+        moved = archive_visits(
+            horizon=timedelta(days=options["horizon_days"]),
+            retention=timedelta(days=options["retention_days"]),
+            batch_size=options["batch_size"],
+        )
+        self.stdout.write(f"Archived {moved} visit(s)")
+        if moved and cache_is_local():
+            self.stderr.write(self.style.WARNING(LOCAL_CACHE_WARNING))
@@ -0,0 +1,202 @@
+"""
+Parallel readers of the visit list and writers of the visit form.
+
+Threads only see committed rows, so this benchmark cannot roll its
+data back like the others: every round runs against a throwaway SQLite
+file in a temporary directory. The threads share the GIL, so the
+numbers compare the lock contention of the rounds rather than give
+the throughput of a multi-process server.
+"""
+
+import logging
+import os
+import shutil
+import statistics
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from itertools import count
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, connections
+from django.test import Client, override_settings
+from django.urls import reverse
+
+from users.models import Doctor
+from utils.benchmark import (
+    seed_doctors,
+    seed_patients,
+    seed_specialization,
+    seed_visits,
+)
+
+VISIT_LIST_URL = reverse("reception:visit-list")
+VISIT_CREATE_URL = reverse("reception:visit-create")
+
+
+@contextmanager
+def throwaway_database(conn_max_age):
+    """
+    Point the default connection of every thread at a new migrated
+    SQLite file for the block.
+    """
+    directory = tempfile.mkdtemp()
+    settings_dict = connection.settings_dict
+    saved = settings_dict["TEST"], settings_dict["CONN_MAX_AGE"]
+    settings_dict["TEST"] = {
+        **settings_dict["TEST"],
+        "NAME": os.path.join(directory, "benchmark.sqlite3"),
+    }
+    old_name = connection.creation.create_test_db(
+        verbosity=0, autoclobber=True, serialize=False
+    )
+    settings_dict["CONN_MAX_AGE"] = conn_max_age
+    try:
+        yield
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+        settings_dict["TEST"], settings_dict["CONN_MAX_AGE"] = saved
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+def percentile(timings, fraction):
+    if not timings:
+        return 0.0
+    return sorted(timings)[int(fraction * (len(timings) - 1))]
+
+
+class Command(BaseCommand):
+    help = (  # noqa: VNE003
+        "Drive parallel readers of the visit list and writers of the "
+        "visit form against a throwaway SQLite database, without and "
+        "with the production SQLite profile and connection reuse."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--readers", type=int, default=8)
+        parser.add_argument("--writers", type=int, default=4)
+        parser.add_argument(
+            "--seconds", type=float, default=10, help="Per round"
+        )
+        parser.add_argument("--visits", type=int, default=50_000)
+
+    def handle(self, *args, **options):
+        if connection.vendor != "sqlite":
+            raise CommandError("The benchmark is for SQLite.")
+
+        rounds = (
+            ("rollback journal, a connection per request", {}, 0),
+            (
+                "WAL profile, reused connections",
+                settings.SQLITE_PRODUCTION_PRAGMAS,
+                settings.DATABASES["default"]["CONN_MAX_AGE"] or 600,
+            ),
+        )
+        # Locked database errors are counted, not logged
+        request_logger = logging.getLogger("django.request")
+        level = request_logger.level
+        request_logger.setLevel(logging.CRITICAL)
+        try:
+            for label, pragmas, conn_max_age in rounds:
+                with override_settings(
+                    SQLITE_PRAGMAS=pragmas,
+                    ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, "testserver"],
+                ), throwaway_database(conn_max_age):
+                    results = self.run_round(options)
+                self.report(label, results, options["seconds"])
+        finally:
+            request_logger.setLevel(level)
+
+    def run_round(self, options):
+        cache.clear()
+        writers = options["writers"]
+        specialization = seed_specialization()
+        doctors = seed_doctors(writers + 10, specialization=specialization)
+        patients = seed_patients(1_000)
+        day = datetime.now().replace(
+            hour=0, minute=0, second=0, microsecond=0
+        ) + timedelta(days=1)
+        seed_visits(options["visits"], doctors[writers:], patients, start=day)
+        admin = Doctor.objects.create_superuser(
+            username="bench-admin", password="!"
+        )
+        search = {"date_time": day.strftime("%Y-%m-%d")}
+
+        def read(client, num):
+            return client.get(VISIT_LIST_URL, search).status_code == 200
+
+        def write(client, num, doctor):
+            # Back to back slots of the writer's own doctor, never taken
+            response = client.post(
+                VISIT_CREATE_URL,
+                {
+                    "patient": patients[num % len(patients)].pk,
+                    "date_time": day + timedelta(days=30, minutes=30 * num),
+                    "duration": 30,
+                    "treatment_direction": specialization.pk,
+                    "doctor": doctor.pk,
+                    "type_of_visit": "INIT",
+                },
+            )
+            return response.status_code == 302
+
+        workers = [(read, ())] * options["readers"] + [
+            (write, (doctor,)) for doctor in doctors[:writers]
+        ]
+        clients = []
+        for _ in workers:
+            client = Client(raise_request_exception=False)
+            client.force_login(admin)
+            clients.append(client)
+        connection.close()
+
+        timings = {read: [], write: []}
+        failures = {read: 0, write: 0}
+        lock = threading.Lock()
+        deadline = time.perf_counter() + options["seconds"]
+
+        def work(func, client, extra):
+            done, failed = [], 0
+            try:
+                for num in count():
+                    started = time.perf_counter()
+                    if started > deadline:
+                        break
+                    if func(client, num, *extra):
+                        done.append((time.perf_counter() - started) * 1000)
+                    else:
+                        failed += 1
+            finally:
+                connections.close_all()
+            with lock:
+                timings[func] += done
+                failures[func] += failed
+
+        threads = [
+            threading.Thread(target=work, args=(func, client, extra))
+            for (func, extra), client in zip(workers, clients)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        return {
+            "reads": (timings[read], failures[read]),
+            "writes": (timings[write], failures[write]),
+        }
+
+    def report(self, label, results, seconds):
+        self.stdout.write(label)
+        for name, (timings, failed) in results.items():
+            median = statistics.median(timings) if timings else 0.0
+            self.stdout.write(
+                f"  {name:<6} {len(timings) / seconds:8.1f}/s  "
+                f"p50 {median:8.2f} ms  "
+                f"p95 {percentile(timings, 0.95):8.2f} ms  "
+                f"failed {failed}"
+            )
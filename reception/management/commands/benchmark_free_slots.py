@@ -0,0 +1,55 @@
+from datetime import date, timedelta
+
+from django.core.management.base import BaseCommand
+from django.test import RequestFactory
+from django.urls import reverse
+
+from reception.views import free_slots
+from utils.benchmark import (
+    measure,
+    rollback,
+    seed_doctors,
+    seed_patients,
+    seed_specialization,
+    seed_visits,
+)
+
+
+class Command(BaseCommand):
+    help = (  # noqa: VNE003
+        "Measure the free slots endpoint for a month "
+        "across the doctors of one specialization."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--doctors", type=int, default=500)
+        parser.add_argument("--visits", type=int, default=100_000)
+        parser.add_argument("--days", type=int, default=31)
+        parser.add_argument("--repeat", type=int, default=10)
+
+    def handle(self, *args, **options):
+        date_from = date.today() + timedelta(days=1)
+        date_to = date_from + timedelta(days=options["days"] - 1)
+        with rollback():
+            specialization = seed_specialization()
+            doctors = seed_doctors(options["doctors"], specialization)
+            patients = seed_patients(1_000)
+            seed_visits(options["visits"], doctors, patients, specialization)
+
+            request = RequestFactory().get(
+                reverse("reception:free-slots"),
+                {
+                    "specialization": specialization.id,
+                    "date_from": date_from,
+                    "date_to": date_to,
+                },
+            )
+            request.user = doctors[0]
+            response = free_slots(request)
+            elapsed = measure(lambda: free_slots(request), options["repeat"])
+
+        self.stdout.write(
+            f"{options['doctors']} doctors, {options['visits']} visits, "
+            f"{options['days']} days: {elapsed:.1f} ms, "
+            f"{len(response.content) // 1024} KiB of JSON"
+        )
@@ -0,0 +1,76 @@
+from datetime import datetime
+
+from django.core.management.base import BaseCommand
+
+from reception.models import Visit
+from utils.benchmark import (
+    measure,
+    rollback,
+    seed_doctors,
+    seed_patients,
+    seed_visits,
+)
+
+
+def legacy_scan(date_time):
+    """
+    The slot check as it was done before the (doctor, date_time) index:
+    every future visit is loaded and compared in Python.
+    """
+    queryset = (
+        Visit.objects.select_related(
+            "treatment_direction", "doctor", "patient"
+        )
+        .filter(patient__deleted_at__isnull=True)
+        .filter(doctor__deleted_at__isnull=True)
+        .filter(date_time__gte=datetime.now())
+    )
+    return any(visit.date_time == date_time for visit in queryset)
+
+
+class Command(BaseCommand):
+    help = (  # noqa: VNE003
+        "Measure the doctor slot-conflict check "
+        "while the table of future visits grows."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--sizes",
+            nargs="+",
+            type=int,
+            default=[1_000, 10_000, 100_000, 1_000_000],
+        )
+        parser.add_argument("--doctors", type=int, default=100)
+        parser.add_argument("--repeat", type=int, default=50)
+        parser.add_argument(
+            "--legacy",
+            action="store_true",
+            help="Also time the old full scan (slow on large tables).",
+        )
+
+    def handle(self, *args, **options):
+        with rollback():
+            doctors = seed_doctors(options["doctors"])
+            patients = seed_patients(1_000)
+            seeded, next_slot = 0, None
+            for size in sorted(options["sizes"]):
+                next_slot = seed_visits(
+                    size - seeded, doctors, patients, start=next_slot
+                )
+                seeded = size
+                probe = Visit.objects.order_by("?").first()
+
+                indexed = measure(
+                    lambda: Visit.objects.busy(
+                        probe.doctor_id, probe.date_time
+                    ).exists(),
+                    options["repeat"],
+                )
+                line = f"{size:>10} visits: indexed {indexed:8.3f} ms"
+                if options["legacy"]:
+                    legacy = measure(
+                        lambda: legacy_scan(probe.date_time), repeat=1
+                    )
+                    line += f" | full scan {legacy:10.3f} ms"
+                self.stdout.write(line)
@@ -0,0 +1,63 @@
+import os
+import resource
+
+from django.core.management.base import BaseCommand
+
+from reception.exports import VISIT_COLUMNS, visits_to_export
+from utils.benchmark import (
+    measure,
+    rollback,
+    seed_doctors,
+    seed_patients,
+    seed_specialization,
+    seed_visits,
+)
+from utils.exports import CSV, FORMATS, export_lines
+
+
+def max_rss():
+    """
+    The peak resident memory of the process, MB (Linux reports KB).
+    """
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+class Command(BaseCommand):
+    help = (  # noqa: VNE003
+        "Measure the time and the peak memory of a streamed "
+        "export of millions of visits."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--visits", type=int, default=5_000_000)
+        parser.add_argument("--doctors", type=int, default=500)
+        parser.add_argument("--format", choices=FORMATS, default=CSV)
+
+    def handle(self, *args, **options):
+        with rollback():
+            specialization = seed_specialization()
+            doctors = seed_doctors(options["doctors"])
+            patients = seed_patients(10_000)
+            seed_visits(options["visits"], doctors, patients, specialization)
+            before = max_rss()
+            result = {}
+
+            def export():
+                with open(os.devnull, "w", encoding="utf-8") as stream:
+                    result["size"] = sum(
+                        stream.write(line)
+                        for line in export_lines(
+                            visits_to_export(),
+                            VISIT_COLUMNS,
+                            options["format"],
+                        )
+                    )
+
+            elapsed = measure(export, repeat=1)
+            self.stdout.write(
+                f"export of {options['visits']} visits: "
+                f"{elapsed / 1000:8.3f} s, "
+                f"{result['size'] / 2**20:.0f} MB written\n"
+                f"peak memory: {before:.0f} MB before the export, "
+                f"{max_rss():.0f} MB after"
+            )
@@ -0,0 +1,69 @@
+import io
+import random
+from datetime import datetime, timedelta
+
+from django.core.management.base import BaseCommand
+
+from reception.imports import import_visits, read_records
+from utils.benchmark import (
+    measure,
+    rollback,
+    seed_doctors,
+    seed_patients,
+    seed_specialization,
+)
+from utils.exports import CSV
+
+HEADER = "date_time,doctor,patient,treatment_direction,duration,type_of_visit"
+
+
+class Command(BaseCommand):
+    help = (  # noqa: VNE003
+        "Measure the import of a CSV file of visits, "
+        "a few of them overlapping."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--visits", type=int, default=100_000)
+        parser.add_argument("--doctors", type=int, default=200)
+        parser.add_argument("--patients", type=int, default=50_000)
+        parser.add_argument("--chunk-size", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        start = datetime.now().replace(
+            hour=9, minute=0, second=0, microsecond=0
+        ) + timedelta(days=1)
+        with rollback():
+            specialization = seed_specialization()
+            doctors = seed_doctors(options["doctors"], specialization)
+            patients = seed_patients(options["patients"])
+            lines = [HEADER]
+            for num in range(options["visits"]):
+                doctor = doctors[num % len(doctors)]
+                # Back to back 30 minute slots, about every 100th one
+                # overlapping the previous visit of the doctor
+                slot = num // len(doctors)
+                date_time = start + timedelta(minutes=30 * slot)
+                if num % 97 == 96:
+                    date_time -= timedelta(minutes=15)
+                lines.append(
+                    f"{date_time:%Y-%m-%d %H:%M},{doctor.username},"
+                    f"{random.choice(patients).phone_number},"
+                    f"{specialization.name},30,INIT"
+                )
+            data = "\n".join(lines)
+            result = {}
+
+            def run():
+                result["created"], result["errors"] = import_visits(
+                    read_records(io.StringIO(data), CSV),
+                    options["chunk_size"],
+                )
+
+            elapsed = measure(run, repeat=1)
+            self.stdout.write(
+                f"import_visits({options['visits']}): "
+                f"{elapsed / 1000:8.3f} s, "
+                f"{result['created']} created, "
+                f"{len(result['errors'])} rejected"
+            )
@@ -0,0 +1,102 @@
+import random
+from datetime import datetime, timedelta
+from itertools import cycle
+
+from django.core.management.base import BaseCommand
+
+from reception.models import Visit
+from reception.scheduling import book_visits, load_schedules
+from utils.benchmark import (
+    measure,
+    rollback,
+    seed_doctors,
+    seed_patients,
+    seed_visits,
+)
+
+PROBE_DURATION = timedelta(minutes=15)
+
+
+class Command(BaseCommand):
+    help = (  # noqa: VNE003
+        "Measure visit overlap detection on a day packed "
+        "with one-minute visits."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--doctors", type=int, default=10)
+        parser.add_argument("--per-doctor", type=int, default=1440)
+        parser.add_argument("--repeat", type=int, default=200)
+        parser.add_argument("--batch", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        per_doctor = options["per_doctor"]
+        day = datetime.now().replace(
+            hour=0, minute=0, second=0, microsecond=0
+        ) + timedelta(days=1)
+        with rollback():
+            doctors = seed_doctors(options["doctors"])
+            patients = seed_patients(100)
+            seed_visits(
+                options["doctors"] * per_doctor,
+                doctors,
+                patients,
+                start=day,
+                duration=1,
+            )
+            doctor = doctors[0]
+            schedule = load_schedules(
+                [doctor.id], day, day + timedelta(minutes=per_doctor)
+            )[doctor.id]
+            intervals = list(schedule)
+            probes = [
+                day + timedelta(minutes=random.randrange(per_doctor))
+                for _ in range(options["repeat"])
+            ]
+
+            def run(check):
+                starts = cycle(probes)
+                return measure(lambda: check(next(starts)), options["repeat"])
+
+            query = run(
+                lambda start: Visit.objects.busy(
+                    doctor, start, start + PROBE_DURATION
+                ).exists()
+            )
+            bisect = run(
+                lambda start: schedule.overlaps(start, start + PROBE_DURATION)
+            )
+            linear = run(
+                lambda start: any(
+                    visit_start < start + PROBE_DURATION and visit_end > start
+                    for visit_start, visit_end in intervals
+                )
+            )
+            self.stdout.write(
+                f"{len(schedule)} visits of the doctor on the day\n"
+                f"busy() query:           {query:8.3f} ms\n"
+                f"DoctorSchedule bisect:  {bisect:8.3f} ms\n"
+                f"linear scan:            {linear:8.3f} ms"
+            )
+
+            visits = [
+                Visit(
+                    doctor=random.choice(doctors),
+                    patient=random.choice(patients),
+                    date_time=random.choice(probes)
+                    + timedelta(days=random.randrange(2)),
+                    duration=15,
+                )
+                for _ in range(options["batch"])
+            ]
+            result = {}
+
+            def bulk_booking():
+                result["created"], result["rejected"] = book_visits(visits)
+
+            elapsed = measure(bulk_booking, repeat=1)
+            self.stdout.write(
+                f"book_visits({len(visits)}): {elapsed:8.3f} ms, "
+                f"{len(result['created'])} created, "
+                f"{len(result['rejected'])} rejected"
+            )
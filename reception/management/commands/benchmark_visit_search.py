@@ -0,0 +1,51 @@
+from django.core.management.base import BaseCommand
+
+from reception.forms import parse_date_time_search
+from reception.models import Visit
+from utils.benchmark import (
+    measure,
+    rollback,
+    seed_doctors,
+    seed_patients,
+    seed_visits,
+)
+
+
+class Command(BaseCommand):
+    help = (  # noqa: VNE003
+        "Compare the text search over visit dates "
+        "with the indexed range search."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--visits", type=int, default=1_000_000)
+        parser.add_argument("--doctors", type=int, default=100)
+        parser.add_argument("--repeat", type=int, default=5)
+
+    def handle(self, *args, **options):
+        with rollback():
+            doctors = seed_doctors(options["doctors"])
+            patients = seed_patients(1_000)
+            seed_visits(options["visits"], doctors, patients)
+            probe = Visit.objects.order_by("-date_time").first().date_time
+            searches = (
+                f"{probe:%Y-%m-%d}",
+                f"{probe:%Y-%m-%d %H}",
+                f"{probe:%H:%M}",
+            )
+            for search in searches:
+                lookups = parse_date_time_search(search)
+                text = measure(
+                    lambda: Visit.objects.filter(
+                        date_time__icontains=search
+                    ).count(),
+                    options["repeat"],
+                )
+                indexed = measure(
+                    lambda: Visit.objects.filter(**lookups).count(),
+                    options["repeat"],
+                )
+                self.stdout.write(
+                    f"{search!r:>18}: icontains {text:9.3f} ms | "
+                    f"{next(iter(lookups))} {indexed:9.3f} ms"
+                )
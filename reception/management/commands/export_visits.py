@@ -0,0 +1,47 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from reception.exports import VISIT_COLUMNS, visits_to_export
+from reception.forms import VisitFilterForm
+from utils.exports import CSV, FORMATS, export_lines
+
+
+class Command(BaseCommand):
+    help = (  # noqa: VNE003
+        "Export the live visits as CSV or JSON Lines, "
+        "streamed with constant memory."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--format", choices=FORMATS, default=CSV)
+        parser.add_argument(
+            "--output", help="The file to write, standard output by default"
+        )
+        parser.add_argument("--date-from", help="YYYY-MM-DD")
+        parser.add_argument("--date-to", help="YYYY-MM-DD")
+        parser.add_argument("--doctor", type=int, help="The id of the doctor")
+
+    def handle(self, *args, **options):
+        form = VisitFilterForm(
+            {
+                name: options[name]
+                for name in ("date_from", "date_to", "doctor")
+                if options[name] is not None
+            }
+        )
+        if not form.is_valid():
+            raise CommandError(form.errors.as_text())
+
+        lines = export_lines(
+            visits_to_export(form.cleaned_data),
+            VISIT_COLUMNS,
+            options["format"],
+        )
+        if options["output"] is None:
+            for line in lines:
+                self.stdout.write(line, ending="")
+            return
+
+        with open(
+            options["output"], "w", encoding="utf-8", newline=""
+        ) as stream:
+            stream.writelines(lines)
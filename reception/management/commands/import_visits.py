@@ -0,0 +1,39 @@
+from django.core.management.base import BaseCommand
+
+from reception.imports import (
+    CHUNK_SIZE,
+    guess_format,
+    import_visits,
+    read_records,
+)
+from utils.exports import FORMATS
+
+
+class Command(BaseCommand):
+    help = (  # noqa: VNE003
+        "Import visits from a CSV or JSON Lines file, "
+        "reporting the rejected records."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("path")
+        parser.add_argument(
+            "--format",
+            choices=FORMATS,
+            help="By default the extension of the file decides",
+        )
+        parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE)
+
+    def handle(self, *args, **options):
+        path = options["path"]
+        file_format = options["format"] or guess_format(path)
+        with open(path, encoding="utf-8", newline="") as stream:
+            created, errors = import_visits(
+                read_records(stream, file_format), options["chunk_size"]
+            )
+
+        for line_number, message in errors:
+            self.stderr.write(f"Line {line_number}: {message}")
+        self.stdout.write(
+            f"Created {created} visit(s), rejected {len(errors)} record(s)"
+        )
@@ -0,0 +1,21 @@
+# Generated by Django 4.2.7 on 2026-10-17 19:45
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("reception", "0002_initial"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="visit",
+            index=models.Index(
+                condition=models.Q(("deleted_at__isnull", True)),
+                fields=["doctor", "date_time"],
+                name="visit_doctor_date_time_live",
+            ),
+        ),
+    ]
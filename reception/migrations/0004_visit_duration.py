@@ -0,0 +1,50 @@
+# Generated by Django 4.2.7 on 2026-10-17 19:47
+
+import django.core.validators
+from datetime import timedelta
+
+from django.db import migrations, models
+
+
+def set_end_date_time(apps, schema_editor):
+    Visit = apps.get_model("reception", "Visit")
+    visits = []
+    for visit in Visit.objects.select_related("treatment_direction").iterator():
+        # The default duration is not stored, see Visit.set_derived_fields
+        if visit.treatment_direction is not None:
+            duration = visit.treatment_direction.visit_duration
+        else:
+            duration = 30
+        visit.end_date_time = visit.date_time + timedelta(minutes=duration)
+        visits.append(visit)
+    Visit.objects.bulk_update(visits, ["end_date_time"], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("reception", "0003_visit_doctor_date_time_live_index"),
+        ("users", "0002_specialization_visit_duration"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="visit",
+            name="duration",
+            field=models.PositiveSmallIntegerField(
+                blank=True,
+                help_text="Minutes. Defaults to the duration of the treatment direction",
+                null=True,
+                validators=[
+                    django.core.validators.MinValueValidator(1),
+                    django.core.validators.MaxValueValidator(240),
+                ],
+            ),
+        ),
+        migrations.AddField(
+            model_name="visit",
+            name="end_date_time",
+            field=models.DateTimeField(editable=False, null=True),
+        ),
+        migrations.RunPython(set_end_date_time, migrations.RunPython.noop),
+    ]
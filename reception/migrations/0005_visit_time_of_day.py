@@ -0,0 +1,28 @@
+# Generated by Django 4.2.7 on 2026-10-17 19:53
+
+from django.db import migrations, models
+
+
+def set_time_of_day(apps, schema_editor):
+    Visit = apps.get_model("reception", "Visit")
+    visits = []
+    for visit in Visit.objects.only("date_time").iterator():
+        visit.time_of_day = visit.date_time.time()
+        visits.append(visit)
+    Visit.objects.bulk_update(visits, ["time_of_day"], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("reception", "0004_visit_duration"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="visit",
+            name="time_of_day",
+            field=models.TimeField(editable=False, null=True),
+        ),
+        migrations.RunPython(set_time_of_day, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,40 @@
+# Generated by Django 4.2.7 on 2026-10-17 19:56
+
+import datetime
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("reception", "0005_visit_time_of_day"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="visit",
+            name="date_time",
+            field=models.DateTimeField(default=datetime.datetime.now),
+        ),
+        migrations.AlterField(
+            model_name="visit",
+            name="time_of_day",
+            field=models.TimeField(editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name="visit",
+            index=models.Index(
+                condition=models.Q(("deleted_at__isnull", True)),
+                fields=["date_time"],
+                name="visit_date_time_live",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="visit",
+            index=models.Index(
+                condition=models.Q(("deleted_at__isnull", True)),
+                fields=["time_of_day"],
+                name="visit_time_of_day_live",
+            ),
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 4.2.7 on 2026-10-17 19:59
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("reception", "0006_live_indexes"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="PageViewCounter",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("key", models.CharField(max_length=100, unique=True)),
+                ("count", models.PositiveBigIntegerField(default=0)),
+            ],
+        ),
+    ]
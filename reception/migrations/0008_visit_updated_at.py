@@ -0,0 +1,22 @@
+# Generated by Django 4.2.7 on 2026-10-17 21:02
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("reception", "0007_pageviewcounter"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="visit",
+            name="updated_at",
+            field=models.DateTimeField(
+                auto_now=True, default=django.utils.timezone.now
+            ),
+            preserve_default=False,
+        ),
+    ]
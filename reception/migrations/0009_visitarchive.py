@@ -0,0 +1,71 @@
+# Generated by Django 4.2.7 on 2026-10-17 20:59
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("users", "0008_doctor_manager"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ("reception", "0008_visit_updated_at"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="VisitArchive",
+            fields=[
+                ("id", models.BigIntegerField(primary_key=True, serialize=False)),
+                ("date_time", models.DateTimeField()),
+                ("duration", models.PositiveSmallIntegerField(null=True)),
+                ("end_date_time", models.DateTimeField(null=True)),
+                (
+                    "type_of_visit",
+                    models.CharField(
+                        choices=[("INIT", "Initial"), ("REPT", "Repeat")], max_length=4
+                    ),
+                ),
+                ("deleted_at", models.DateTimeField(null=True)),
+                ("updated_at", models.DateTimeField()),
+                ("archived_at", models.DateTimeField(auto_now_add=True)),
+                (
+                    "doctor",
+                    models.ForeignKey(
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="archived_visits",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+                (
+                    "patient",
+                    models.ForeignKey(
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="archived_visits",
+                        to="users.patient",
+                    ),
+                ),
+                (
+                    "treatment_direction",
+                    models.ForeignKey(
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="+",
+                        to="users.specialization",
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ("date_time",),
+                "indexes": [
+                    models.Index(
+                        fields=["patient", "date_time"],
+                        name="visitarchive_patient_date",
+                    )
+                ],
+            },
+        ),
+    ]
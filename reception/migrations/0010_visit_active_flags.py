@@ -0,0 +1,46 @@
+# Generated by Django 4.2.7 on 2026-10-17 21:03
+
+from django.db import migrations, models
+
+
+def set_active_flags(apps, schema_editor):
+    Visit = apps.get_model("reception", "Visit")
+    Visit.objects.filter(doctor__deleted_at__isnull=False).update(
+        doctor_active=False
+    )
+    Visit.objects.filter(patient__deleted_at__isnull=False).update(
+        patient_active=False
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("reception", "0009_visitarchive"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="visit",
+            name="doctor_active",
+            field=models.BooleanField(default=True, editable=False),
+        ),
+        migrations.AddField(
+            model_name="visit",
+            name="patient_active",
+            field=models.BooleanField(default=True, editable=False),
+        ),
+        migrations.AddIndex(
+            model_name="visit",
+            index=models.Index(
+                condition=models.Q(
+                    ("deleted_at__isnull", True),
+                    ("doctor_active", True),
+                    ("patient_active", True),
+                ),
+                fields=["date_time"],
+                name="visit_date_time_schedule",
+            ),
+        ),
+        migrations.RunPython(set_active_flags, migrations.RunPython.noop),
+    ]
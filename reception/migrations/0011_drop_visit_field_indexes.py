@@ -0,0 +1,29 @@
+from django.db import migrations
+
+# The columns 0005 used to index before the partial live indexes
+# of 0006 replaced them
+COLUMNS = ("date_time", "time_of_day")
+
+
+def drop_field_indexes(apps, schema_editor):
+    """
+    Drop the plain indexes left on databases migrated with the first
+    version of 0005 but not 0006. The other databases never had them.
+    """
+    table = apps.get_model("reception", "Visit")._meta.db_table
+    for column in COLUMNS:
+        name = schema_editor._create_index_name(table, [column])
+        schema_editor.execute(
+            f"DROP INDEX IF EXISTS {schema_editor.quote_name(name)}"
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("reception", "0010_visit_active_flags"),
+    ]
+
+    operations = [
+        migrations.RunPython(drop_field_indexes, migrations.RunPython.noop),
+    ]
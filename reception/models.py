@@ -1,16 +1,101 @@
-from datetime import datetime
+from datetime import datetime, timedelta
 
 from django.db import models
+from django.db.models import F
 from django.conf import settings
+from django.utils import timezone
 
-from users.models import Patient, Specialization
-from utils.models import SoftDeleteModel
+from users.models import (
+    DEFAULT_VISIT_DURATION,
+    MAX_VISIT_DURATION,
+    VISIT_DURATION_VALIDATORS,
+    Patient,
+    Specialization,
+)
+from utils import fragments
+from utils.models import (
+    LIVE,
+    SOFT_DELETE_FIELDS,
+    SoftDeleteManager,
+    SoftDeleteModel,
+    SoftDeleteQuerySet,
+)
 
 VISIT_CHOICES = (
     ("INIT", "Initial"),
     ("REPT", "Repeat"),
 )
 
+MAX_VISIT_SPAN = timedelta(minutes=MAX_VISIT_DURATION)
+# Visits of live doctors and patients
+SCHEDULED = models.Q(doctor_active=True, patient_active=True)
+
+
+def get_visit_duration(duration, treatment_direction):
+    """
+    The duration of a visit, minutes.
+    Falls back to the default of the treatment direction.
+    """
+    if duration:
+        return duration
+    if treatment_direction is not None:
+        return treatment_direction.visit_duration
+
+    return DEFAULT_VISIT_DURATION
+
+
+class VisitQuerySet(SoftDeleteQuerySet):
+    def overlapping(self, start, end):
+        """
+        Visits overlapping the interval [start, end).
+        A visit never lasts longer than MAX_VISIT_SPAN, so only visits
+        starting within that span before `end` can overlap: the lookup
+        stays a bounded range scan of the date_time index.
+        """
+        return self.filter(
+            date_time__gt=start - MAX_VISIT_SPAN,
+            date_time__lt=end,
+            end_date_time__gt=start,
+            patient_active=True,
+        )
+
+    def busy(self, doctor, start, end=None, exclude=None):
+        """
+        Visits that keep the doctor busy at the instant `start`
+        or within the interval [start, end).
+        Served by the (doctor, date_time) index on live rows,
+        so the check costs the same regardless of the table size.
+        """
+        queryset = self.filter(doctor=doctor).overlapping(
+            start, end or start + timedelta.resolution
+        )
+        if exclude is not None:
+            queryset = queryset.exclude(pk=exclude)
+
+        return queryset
+
+    def live_schedule(self):
+        """
+        Visits of live doctors and patients, with the treatment
+        direction, the doctor and the patient. Filters on the flags
+        of the visit rows, no join filters on the related tables.
+        """
+        return self.filter(SCHEDULED).select_related(
+            "treatment_direction", "doctor", "patient"
+        )
+
+    def upcoming(self, now=None):
+        """
+        Visits that have not started yet, the nearest first.
+        """
+        return self.filter(date_time__gte=now or datetime.now()).order_by(
+            "date_time", "id"
+        )
+
+
+class VisitManager(SoftDeleteManager.from_queryset(VisitQuerySet)):
+    pass
+
 
 class Visit(SoftDeleteModel):
     treatment_direction = models.ForeignKey(
@@ -19,6 +104,15 @@ class Visit(SoftDeleteModel):
         on_delete=models.SET_NULL,
     )
     date_time = models.DateTimeField(default=datetime.now)
+    duration = models.PositiveSmallIntegerField(
+        null=True,
+        blank=True,
+        validators=VISIT_DURATION_VALIDATORS,
+        help_text="Minutes. Defaults to the duration "
+        "of the treatment direction",
+    )
+    end_date_time = models.DateTimeField(null=True, editable=False)
+    time_of_day = models.TimeField(null=True, editable=False)
     doctor = models.ForeignKey(
         settings.AUTH_USER_MODEL,
         null=True,
@@ -33,6 +127,164 @@ class Visit(SoftDeleteModel):
     patient = models.ForeignKey(
         Patient, null=True, on_delete=models.SET_NULL, related_name="visits"
     )
+    # False while the doctor or the patient is soft deleted. Set on
+    # save, kept by reception.signals (see refresh_active_flags)
+    doctor_active = models.BooleanField(default=True, editable=False)
+    patient_active = models.BooleanField(default=True, editable=False)
+
+    objects = VisitManager()
+    all_objects = VisitQuerySet.as_manager()
+
+    live_index_fields = ("date_time", "time_of_day")
+
+    class Meta:
+        ordering = ("date_time",)
+        indexes = (
+            models.Index(
+                fields=("doctor", "date_time"),
+                condition=LIVE,
+                name="visit_doctor_date_time_live",
+            ),
+            models.Index(
+                fields=("date_time",),
+                condition=LIVE & SCHEDULED,
+                name="visit_date_time_schedule",
+            ),
+        )
+
+    def save(self, *args, **kwargs):
+        # Soft delete and restore leave the derived fields as they are
+        if kwargs.get("update_fields") != SOFT_DELETE_FIELDS:
+            self.set_derived_fields(fetch=True)
+        super().save(*args, **kwargs)
+
+    def set_derived_fields(self, fetch=False):
+        """
+        Compute when the visit ends, the time of day it starts at and
+        whether its doctor and its patient are live. A visit without
+        a duration of its own takes the one of its treatment direction,
+        which is not stored: the visit follows a change of direction.
+        The flags are computed from the doctor and the patient loaded
+        on the visit; `fetch` loads the missing ones. Bulk loads that
+        do not load them refresh the flags afterwards.
+        Call it before `bulk_create()`, which bypasses `save()`.
+        """
+        self.date_time = self._meta.get_field("date_time").to_python(
+            self.date_time
+        )
+        duration = get_visit_duration(self.duration, self.treatment_direction)
+        self.end_date_time = self.date_time + timedelta(minutes=duration)
+        self.time_of_day = self.date_time.time()
+        for relation in ("doctor", "patient"):
+            field = self._meta.get_field(relation)
+            if fetch or field.is_cached(self):
+                related = getattr(self, relation)
+                setattr(
+                    self,
+                    f"{relation}_active",
+                    related is None or related.deleted_at is None,
+                )
+
+    @property
+    def length(self):
+        """
+        Minutes, the default of the treatment direction included.
+        """
+        return (self.end_date_time - self.date_time) // timedelta(minutes=1)
+
+
+class PageViewCounter(models.Model):
+    key = models.CharField(max_length=100, unique=True)
+    count = models.PositiveBigIntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.key}: {self.count}"
+
+
+def refresh_active_flags(relation, pks=None):
+    """
+    Bring the `doctor_active` or the `patient_active` flags of the
+    visits of the doctors or the patients (all of them by default)
+    in line with their soft deletes. Returns the number of updated visits.
+    """
+    visits = Visit.all_objects.all()
+    if pks is not None:
+        visits = visits.filter(**{f"{relation}__in": pks})
+    flag = f"{relation}_active"
+    updated = 0
+    for active in (True, False):
+        updated += visits.filter(
+            **{f"{relation}__deleted_at__isnull": active, flag: not active}
+        ).update(**{flag: active, "updated_at": timezone.now()})
+    if updated:
+        fragments.bump(Visit)
+
+    return updated
+
+
+def refresh_end_date_times(specialization):
+    """
+    Move the ends of the upcoming visits taking the default duration
+    of the treatment direction after it changed. The past visits keep
+    the duration they had. Returns the number of updated visits.
+    """
+    updated = (
+        Visit.all_objects.upcoming()
+        .filter(treatment_direction=specialization, duration__isnull=True)
+        .update(
+            end_date_time=F("date_time")
+            + timedelta(minutes=specialization.visit_duration),
+            updated_at=timezone.now(),
+        )
+    )
+    if updated:
+        fragments.bump(Visit)
+
+    return updated
+
+
+class VisitArchive(models.Model):
+    """
+    A visit moved out of the visit table by reception.archive:
+    a visit of the distant past or a visit deleted long ago.
+    Keeps the id of the visit.
+    """
+
+    id = models.BigIntegerField(primary_key=True)  # noqa: VNE003
+    treatment_direction = models.ForeignKey(
+        Specialization,
+        null=True,
+        on_delete=models.SET_NULL,
+        related_name="+",
+    )
+    date_time = models.DateTimeField()
+    duration = models.PositiveSmallIntegerField(null=True)
+    end_date_time = models.DateTimeField(null=True)
+    doctor = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        null=True,
+        on_delete=models.SET_NULL,
+        related_name="archived_visits",
+    )
+    type_of_visit = models.CharField(max_length=4, choices=VISIT_CHOICES)
+    patient = models.ForeignKey(
+        Patient,
+        null=True,
+        on_delete=models.SET_NULL,
+        related_name="archived_visits",
+    )
+    deleted_at = models.DateTimeField(null=True)
+    updated_at = models.DateTimeField()
+    archived_at = models.DateTimeField(auto_now_add=True)
 
     class Meta:
         ordering = ("date_time",)
+        indexes = (
+            models.Index(
+                fields=("patient", "date_time"),
+                name="visitarchive_patient_date",
+            ),
+        )
+
+    def __str__(self):
+        return f"{self.date_time} {self.patient} (archived)"
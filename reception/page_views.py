@@ -0,0 +1,108 @@
+"""
+Page view counters buffered in memory.
+
+Views are added up per process and written to PageViewCounter
+in batches, so counting a page view does not write to the database.
+"""
+
+import atexit
+import logging
+import threading
+import time
+from collections import Counter
+
+from django.db import DatabaseError, transaction
+from django.db.models import F
+
+from reception.models import PageViewCounter
+
+FLUSH_SIZE = 100
+# Seconds
+FLUSH_INTERVAL = 60
+
+logger = logging.getLogger(__name__)
+
+
+class PageViewBuffer:
+    def __init__(self, flush_size=FLUSH_SIZE, flush_interval=FLUSH_INTERVAL):
+        self.flush_size = flush_size
+        self.flush_interval = flush_interval
+        self.lock = threading.Lock()
+        self.pending = Counter()
+        # Totals in the database as last seen by this process
+        self.stored = {}
+        self.flushed_at = time.monotonic()
+
+    def record(self, key):
+        """
+        Count a view of the page `key` and return its total.
+        Reads the stored total once per key, writes every
+        `flush_size` views or `flush_interval` seconds.
+        """
+        if key not in self.stored:
+            stored = (
+                PageViewCounter.objects.filter(key=key)
+                .values_list("count", flat=True)
+                .first()
+            )
+            self.stored.setdefault(key, stored or 0)
+
+        with self.lock:
+            self.pending[key] += 1
+            total = self.stored[key] + self.pending[key]
+            due = (
+                sum(self.pending.values()) >= self.flush_size
+                or time.monotonic() - self.flushed_at >= self.flush_interval
+            )
+        if due:
+            try:
+                self.flush()
+            except DatabaseError:
+                # A busy database does not fail the page, the views
+                # wait in the buffer for the next flush
+                logger.warning("Cannot write the page views", exc_info=True)
+
+        return total
+
+    def flush(self):
+        """
+        Write the buffered views in one transaction.
+        """
+        with self.lock:
+            pending, self.pending = self.pending, Counter()
+            self.flushed_at = time.monotonic()
+        if not pending:
+            return
+
+        try:
+            with transaction.atomic():
+                for key, count in pending.items():
+                    PageViewCounter.objects.get_or_create(key=key)
+                    PageViewCounter.objects.filter(key=key).update(
+                        count=F("count") + count
+                    )
+                totals = dict(
+                    PageViewCounter.objects.filter(
+                        key__in=pending
+                    ).values_list("key", "count")
+                )
+        except Exception:
+            # Keep the views for the next flush
+            with self.lock:
+                self.pending.update(pending)
+            raise
+
+        with self.lock:
+            self.stored.update(totals)
+
+
+buffer = PageViewBuffer()
+
+
+def record(key):
+    return buffer.record(key)
+
+
+@atexit.register
+def flush():
+    buffer.flush()
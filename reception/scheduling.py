@@ -0,0 +1,170 @@
+"""
+In-memory interval index over the visits of doctors.
+
+`Visit.objects.busy()` answers one question with one query. When many
+visits are checked at once (bulk booking, imports) the doctors' visits
+are loaded once into `DoctorSchedule`s and checked in memory instead.
+"""
+
+from bisect import bisect_left, insort
+from collections import defaultdict
+from datetime import datetime, time, timedelta
+
+from reception import dashboard
+from reception.models import MAX_VISIT_SPAN, Visit
+from users.models import Doctor
+from utils import fragments
+
+WORKDAY_START = time(9)
+WORKDAY_END = time(18)
+
+
+class DoctorSchedule:
+    """
+    Visits of one doctor as (start, end) intervals sorted by start.
+    Visits never last longer than MAX_VISIT_SPAN, so an overlap check
+    only looks at intervals starting within that span: O(log n + k).
+    """
+
+    def __init__(self, intervals=()):
+        self.intervals = sorted(intervals)
+
+    def __len__(self):
+        return len(self.intervals)
+
+    def __iter__(self):
+        return iter(self.intervals)
+
+    def overlaps(self, start, end):
+        low = bisect_left(self.intervals, (start - MAX_VISIT_SPAN,))
+        high = bisect_left(self.intervals, (end,))
+        # The nearest preceding visits are the likeliest to overlap
+        return any(
+            self.intervals[index][1] > start
+            for index in range(high - 1, low - 1, -1)
+        )
+
+    def add(self, start, end):
+        insort(self.intervals, (start, end))
+
+
+def load_schedules(doctor_ids, start, end):
+    """
+    Build the schedules of the doctors for [start, end) in one query.
+    """
+    schedules = defaultdict(DoctorSchedule)
+    intervals = (
+        Visit.objects.filter(doctor_id__in=doctor_ids)
+        .overlapping(start, end)
+        .order_by("doctor_id", "date_time")
+        .values_list("doctor_id", "date_time", "end_date_time")
+    )
+    for doctor_id, visit_start, visit_end in intervals:
+        schedules[doctor_id].intervals.append((visit_start, visit_end))
+
+    return schedules
+
+
+def book_visits(visits, batch_size=1000):
+    """
+    Create many visits at once, skipping the ones that overlap
+    an existing visit of the doctor or an earlier visit of the batch.
+    Returns the created visits and the rejected ones.
+    """
+    if not visits:
+        return [], []
+    for visit in visits:
+        visit.set_derived_fields()
+
+    schedules = load_schedules(
+        {visit.doctor_id for visit in visits if visit.doctor_id},
+        min(visit.date_time for visit in visits),
+        max(visit.end_date_time for visit in visits),
+    )
+    accepted, rejected = [], []
+    for visit in visits:
+        if visit.doctor_id is None:
+            accepted.append(visit)
+            continue
+        schedule = schedules[visit.doctor_id]
+        if schedule.overlaps(visit.date_time, visit.end_date_time):
+            rejected.append(visit)
+        else:
+            schedule.add(visit.date_time, visit.end_date_time)
+            accepted.append(visit)
+
+    created = Visit.objects.bulk_create(accepted, batch_size=batch_size)
+    if created:
+        # bulk_create() sends no post_save
+        dashboard.invalidate("num_visits")
+        fragments.bump(Visit)
+
+    return created, rejected
+
+
+def working_windows(date_from, date_to, now=None):
+    """
+    Working hours of every day from `date_from` to `date_to` inclusive,
+    the past cut off.
+    """
+    now = now or datetime.now()
+    windows = []
+    day = date_from
+    while day <= date_to:
+        start = max(datetime.combine(day, WORKDAY_START), now)
+        end = datetime.combine(day, WORKDAY_END)
+        if start < end:
+            windows.append((start, end))
+        day += timedelta(days=1)
+
+    return windows
+
+
+def free_windows(schedule, windows, min_length):
+    """
+    Gaps of at least `min_length` between the visits of the schedule
+    inside the working windows.
+    A single sweep over both sorted sequences.
+    """
+    free = []
+    visits = iter(schedule)
+    visit = next(visits, None)
+    for window_start, window_end in windows:
+        cursor = window_start
+        while visit is not None and visit[0] < window_end:
+            visit_start, visit_end = visit
+            if visit_start - cursor >= min_length:
+                free.append((cursor, visit_start))
+            cursor = max(cursor, visit_end)
+            if visit_end > window_end:
+                # The visit runs into the next window
+                break
+            visit = next(visits, None)
+        if window_end - cursor >= min_length:
+            free.append((cursor, window_end))
+
+    return free
+
+
+def find_free_slots(specialization, date_from, date_to, now=None):
+    """
+    Open appointment windows of every doctor of the specialization,
+    long enough for a visit of its duration.
+    Costs two queries whatever the number of doctors.
+    """
+    windows = working_windows(date_from, date_to, now)
+    doctors = list(
+        Doctor.objects.filter(specializations=specialization, is_staff=False)
+    )
+    if not windows or not doctors:
+        return {doctor: [] for doctor in doctors}
+
+    schedules = load_schedules(
+        [doctor.id for doctor in doctors], windows[0][0], windows[-1][1]
+    )
+    min_length = timedelta(minutes=specialization.visit_duration)
+
+    return {
+        doctor: free_windows(schedules[doctor.id], windows, min_length)
+        for doctor in doctors
+    }
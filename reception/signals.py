@@ -0,0 +1,60 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from reception import dashboard
+from reception.models import (
+    Visit,
+    refresh_active_flags,
+    refresh_end_date_times,
+)
+from users.models import Doctor, Patient, Specialization
+from utils.signals import post_restore, post_soft_delete
+
+CHANGES = (post_save, post_delete, post_soft_delete, post_restore)
+
+
+@receiver(CHANGES, sender=Visit)
+def invalidate_visit_counter(sender, **kwargs):
+    dashboard.invalidate("num_visits")
+
+
+@receiver(CHANGES, sender=Patient)
+def invalidate_patient_counter(sender, **kwargs):
+    dashboard.invalidate("num_patients")
+
+
+@receiver(CHANGES, sender=Doctor)
+def invalidate_doctor_counter(sender, update_fields=None, **kwargs):
+    # Logging in only updates last_login
+    if update_fields is not None and set(update_fields) == {"last_login"}:
+        return
+    dashboard.invalidate("num_doctors")
+
+
+@receiver(post_save, sender=Patient)
+@receiver(post_save, sender=Doctor)
+def update_active_flags(
+    sender, instance, created, update_fields=None, raw=False, **kwargs
+):
+    if created or raw:
+        return
+    if update_fields is not None and "deleted_at" not in update_fields:
+        return
+    refresh_active_flags(sender._meta.model_name, [instance.pk])
+
+
+@receiver([post_soft_delete, post_restore], sender=Patient)
+@receiver([post_soft_delete, post_restore], sender=Doctor)
+def update_active_flags_in_bulk(sender, pks, **kwargs):
+    refresh_active_flags(sender._meta.model_name, pks)
+
+
+@receiver(post_save, sender=Specialization)
+def update_default_durations(
+    sender, instance, created, update_fields=None, raw=False, **kwargs
+):
+    if created or raw:
+        return
+    if update_fields is not None and "visit_duration" not in update_fields:
+        return
+    refresh_end_date_times(instance)
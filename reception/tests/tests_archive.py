@@ -0,0 +1,138 @@
+import io
+from datetime import datetime, timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+
+from reception import dashboard
+from reception.archive import archive_visits, patient_history
+from reception.models import Visit, VisitArchive
+from users.models import Patient, Specialization
+from utils.checks import LOCAL_CACHE_WARNING
+
+NOW = datetime(2031, 6, 1, 12)
+
+
+class ArchiveTestCase(TestCase):
+    def setUp(self):
+        self.doctor = get_user_model().objects.create_user(
+            username="ivanenko", first_name="Petro", last_name="Ivanenko"
+        )
+        self.patient = Patient.objects.create(
+            first_name="Ivan", last_name="Petrenko", phone_number="0671234567"
+        )
+        self.surgeon = Specialization.objects.create(name="Surgeon")
+
+    def create_visit(self, days, deleted_days=None):
+        visit = Visit.objects.create(
+            date_time=NOW + timedelta(days=days),
+            doctor=self.doctor,
+            patient=self.patient,
+            treatment_direction=self.surgeon,
+        )
+        if deleted_days is not None:
+            Visit.objects.filter(pk=visit.pk).update(
+                deleted_at=NOW + timedelta(days=deleted_days)
+            )
+        return visit
+
+
+class ArchiveVisitsTest(ArchiveTestCase):
+    def test_old_visits_and_tombstones_are_moved(self):
+        old = self.create_visit(-400)
+        tombstone = self.create_visit(-10, deleted_days=-40)
+        recent = self.create_visit(-10)
+        recently_deleted = self.create_visit(5, deleted_days=-1)
+
+        self.assertEqual(archive_visits(now=NOW), 2)
+
+        self.assertEqual(
+            set(Visit.all_objects.values_list("pk", flat=True)),
+            {recent.pk, recently_deleted.pk},
+        )
+        archived = VisitArchive.objects.get(pk=old.pk)
+        self.assertEqual(archived.date_time, old.date_time)
+        self.assertEqual(archived.doctor, self.doctor)
+        self.assertEqual(archived.treatment_direction, self.surgeon)
+        self.assertIsNone(archived.duration)
+        self.assertEqual(archived.end_date_time, old.end_date_time)
+        self.assertIsNone(archived.deleted_at)
+        self.assertIsNotNone(
+            VisitArchive.objects.get(pk=tombstone.pk).deleted_at
+        )
+
+    def test_batches(self):
+        for days in range(-410, -400):
+            self.create_visit(days)
+
+        # A savepoint, a select, an insert, a delete and a release
+        # per batch, the empty select in a savepoint
+        with self.assertNumQueries(4 * 5 + 3):
+            self.assertEqual(archive_visits(batch_size=3, now=NOW), 10)
+        self.assertFalse(Visit.all_objects.exists())
+        self.assertEqual(VisitArchive.objects.count(), 10)
+
+    def test_nothing_to_archive(self):
+        self.create_visit(-10)
+        self.assertEqual(archive_visits(now=NOW), 0)
+
+    def test_horizon_and_retention(self):
+        self.create_visit(-10)
+        self.create_visit(5, deleted_days=-3)
+        moved = archive_visits(
+            horizon=timedelta(days=7), retention=timedelta(days=2), now=NOW
+        )
+        self.assertEqual(moved, 2)
+
+    def test_counter_is_invalidated(self):
+        self.create_visit(-400)
+        dashboard.get_counters()
+        with self.assertNumQueries(0):
+            dashboard.get_counters()
+
+        archive_visits(now=NOW)
+        with self.assertNumQueries(1):
+            self.assertEqual(dashboard.get_counters()["num_visits"], 0)
+
+    def test_command(self):
+        Visit.objects.create(
+            date_time=datetime.now() - timedelta(days=20),
+            patient=self.patient,
+        )
+        out, err = io.StringIO(), io.StringIO()
+        call_command(
+            "archive_visits", "--horizon-days=7", stdout=out, stderr=err
+        )
+        self.assertIn("Archived 1 visit(s)", out.getvalue())
+        self.assertIn(LOCAL_CACHE_WARNING, err.getvalue())
+
+
+class PatientHistoryTest(ArchiveTestCase):
+    def history(self, **kwargs):
+        return [
+            visit["id"]
+            for visit in patient_history(self.patient, now=NOW, **kwargs)
+        ]
+
+    def test_history_reads_both_tables(self):
+        archived = self.create_visit(-400)
+        self.create_visit(-300, deleted_days=-299)
+        recent = self.create_visit(-10)
+        self.create_visit(-5, deleted_days=-4)
+        self.create_visit(10)
+        archive_visits(now=NOW)
+
+        with self.assertNumQueries(1):
+            self.assertEqual(self.history(), [recent.pk, archived.pk])
+
+    def test_history_is_limited(self):
+        visits = [self.create_visit(-days) for days in range(1, 6)]
+        self.assertEqual(self.history(limit=2), [visits[0].pk, visits[1].pk])
+
+    def test_history_shows_the_doctor(self):
+        self.create_visit(-400)
+        archive_visits(now=NOW)
+        [visit] = patient_history(self.patient, now=NOW)
+        self.assertEqual(visit["doctor__last_name"], "Ivanenko")
+        self.assertEqual(visit["treatment_direction__name"], "Surgeon")
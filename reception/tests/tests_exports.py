@@ -0,0 +1,153 @@
+import csv
+import io
+import json
+from datetime import datetime
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+
+from reception.imports import import_visits, read_records
+from reception.models import Visit
+from users.models import Patient, Specialization
+
+VISIT_EXPORT_URL = reverse("reception:visit-export")
+
+
+class VisitExportTest(TestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            username="DocUsername", password="DocPassword123"
+        )
+        self.client.force_login(self.user)
+        self.doctor = get_user_model().objects.create_user(
+            username="ivanenko", first_name="Petro", last_name="Ivanenko"
+        )
+        self.patient = Patient.objects.create(
+            first_name="Ivan", last_name="Petrenko", phone_number="0671234567"
+        )
+        self.specialization = Specialization.objects.create(name="Surgeon")
+        self.visits = [
+            Visit.objects.create(
+                date_time=datetime(2031, 1, day, 10),
+                doctor=self.doctor,
+                patient=self.patient,
+                treatment_direction=self.specialization,
+                duration=30,
+            )
+            for day in (3, 1, 2)
+        ]
+
+    def read_csv(self, response):
+        self.assertTrue(response.streaming)
+        content = b"".join(response.streaming_content).decode()
+        return list(csv.DictReader(io.StringIO(content)))
+
+    def test_login_required(self):
+        self.client.logout()
+        response = self.client.get(VISIT_EXPORT_URL)
+        self.assertEqual(response.status_code, 302)
+
+    def test_csv(self):
+        response = self.client.get(VISIT_EXPORT_URL)
+
+        self.assertEqual(response["Content-Type"], "text/csv")
+        self.assertIn('filename="visits.csv"', response["Content-Disposition"])
+        rows = self.read_csv(response)
+        self.assertEqual(
+            [row["date_time"] for row in rows],
+            [
+                "2031-01-01 10:00:00",
+                "2031-01-02 10:00:00",
+                "2031-01-03 10:00:00",
+            ],
+        )
+        self.assertEqual(rows[0]["doctor"], "ivanenko")
+        self.assertEqual(rows[0]["patient"], "0671234567")
+        self.assertEqual(rows[0]["treatment_direction"], "Surgeon")
+
+    def test_json_lines(self):
+        response = self.client.get(VISIT_EXPORT_URL, {"format": "jsonl"})
+
+        self.assertEqual(response["Content-Type"], "application/x-ndjson")
+        lines = b"".join(response.streaming_content).decode().splitlines()
+        self.assertEqual(
+            json.loads(lines[0])["date_time"], "2031-01-01T10:00:00"
+        )
+
+    def test_filters(self):
+        other = get_user_model().objects.create_user(username="melnyk")
+        Visit.objects.create(
+            date_time=datetime(2031, 1, 2, 10),
+            doctor=other,
+            patient=self.patient,
+        )
+        response = self.client.get(
+            VISIT_EXPORT_URL,
+            {
+                "date_from": "2031-01-02",
+                "date_to": "2031-01-02",
+                "doctor": other.id,
+            },
+        )
+
+        self.assertEqual(
+            [row["doctor"] for row in self.read_csv(response)], ["melnyk"]
+        )
+
+    def test_deleted_rows_are_skipped(self):
+        self.visits[0].delete()
+        response = self.client.get(VISIT_EXPORT_URL)
+        self.assertEqual(len(self.read_csv(response)), 2)
+
+    def test_invalid_parameters(self):
+        for params in ({"format": "xml"}, {"date_from": "tomorrow"}):
+            response = self.client.get(VISIT_EXPORT_URL, params)
+            self.assertEqual(response.status_code, 400)
+
+    def test_export_can_be_imported(self):
+        out = io.StringIO()
+        call_command("export_visits", stdout=out)
+        Visit.all_objects.all().hard_delete()
+
+        created, errors = import_visits(
+            read_records(io.StringIO(out.getvalue()), "csv")
+        )
+        self.assertEqual((created, errors), (3, []))
+
+    def test_past_visits_are_not_imported(self):
+        Visit.objects.create(
+            date_time=datetime(2020, 1, 1, 10),
+            doctor=self.doctor,
+            patient=self.patient,
+        )
+        out = io.StringIO()
+        call_command("export_visits", stdout=out)
+        Visit.all_objects.all().hard_delete()
+
+        created, errors = import_visits(
+            read_records(io.StringIO(out.getvalue()), "csv")
+        )
+        self.assertEqual(created, 3)
+        self.assertEqual([line for line, message in errors], [2])
+        self.assertIn("overdue", errors[0][1])
+
+    def test_command_filters(self):
+        out = io.StringIO()
+        call_command(
+            "export_visits",
+            "--format=jsonl",
+            "--date-from=2031-01-03",
+            stdout=out,
+        )
+
+        self.assertEqual(
+            [json.loads(line)["id"] for line in out.getvalue().splitlines()],
+            [self.visits[0].id],
+        )
+
+    def test_reads_rows_in_chunks(self):
+        with self.assertNumQueries(3):
+            response = self.client.get(VISIT_EXPORT_URL)
+            self.read_csv(response)
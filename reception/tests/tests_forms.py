@@ -0,0 +1,179 @@
+from datetime import datetime, time
+
+from django.contrib.auth import get_user_model
+from django.test import SimpleTestCase, TestCase
+
+from reception.forms import VisitForm, VisitSearchForm
+from reception.models import Visit
+from users.models import Specialization, Patient
+
+
+class VisitFormSlotConflictTest(TestCase):
+    def setUp(self):
+        self.specialization = Specialization.objects.create(name="Surgery")
+        self.doctor = get_user_model().objects.create_user(
+            username="DocUsername",
+            first_name="Firstname",
+            last_name="Lastname",
+            password="DocPassword123",
+        )
+        self.other_doctor = get_user_model().objects.create_user(
+            username="OtherDocUsername",
+            first_name="Otherfirst",
+            last_name="Otherlast",
+            password="DocPassword123",
+        )
+        self.patient = Patient.objects.create(
+            phone_number="0123456789",
+            first_name="Firstname",
+            last_name="Lastname",
+            date_of_birth="2000-01-02",
+        )
+        self.visit = Visit.objects.create(
+            treatment_direction=self.specialization,
+            date_time="2031-01-01 10:00",
+            doctor=self.doctor,
+            patient=self.patient,
+        )
+
+    def form_data(self, **params):
+        data = {
+            "patient": self.patient.id,
+            "date_time": "2031-01-01 10:00",
+            "treatment_direction": self.specialization.id,
+            "doctor": self.doctor.id,
+            "type_of_visit": "REPT",
+        }
+        data.update(params)
+
+        return data
+
+    def test_doctor_busy_at_this_date_time(self):
+        form = VisitForm(data=self.form_data())
+        self.assertFalse(form.is_valid())
+        self.assertIn("date_time", form.errors)
+
+    def test_doctor_busy_during_the_visit(self):
+        form = VisitForm(data=self.form_data(date_time="2031-01-01 10:15"))
+        self.assertFalse(form.is_valid())
+        self.assertIn("date_time", form.errors)
+
+    def test_doctor_busy_if_the_visit_runs_into_the_next_one(self):
+        form = VisitForm(
+            data=self.form_data(date_time="2031-01-01 09:45", duration=20)
+        )
+        self.assertFalse(form.is_valid())
+
+    def test_doctor_free_right_after_the_visit(self):
+        form = VisitForm(data=self.form_data(date_time="2031-01-01 10:30"))
+        self.assertTrue(form.is_valid())
+
+    def test_other_doctor_free_at_this_date_time(self):
+        form = VisitForm(data=self.form_data(doctor=self.other_doctor.id))
+        self.assertTrue(form.is_valid())
+
+    def test_edited_visit_does_not_conflict_with_itself(self):
+        form = VisitForm(
+            data=self.form_data(type_of_visit="INIT"), instance=self.visit
+        )
+        self.assertTrue(form.is_valid())
+
+    def test_deleted_visit_does_not_occupy_the_slot(self):
+        self.visit.delete()
+        form = VisitForm(data=self.form_data())
+        self.assertTrue(form.is_valid())
+
+    def test_busy_check_is_a_single_query(self):
+        with self.assertNumQueries(1):
+            Visit.objects.busy(self.doctor, self.visit.date_time).exists()
+
+
+class VisitFormAutocompleteTest(TestCase):
+    def setUp(self):
+        for num in range(30):
+            Patient.objects.create(
+                phone_number=f"01234567{num:02d}",
+                first_name=f"Firstname{num}",
+                last_name=f"Lastname{num}",
+                date_of_birth="2000-01-02",
+            )
+        self.patient = Patient.objects.get(last_name="Lastname7")
+
+    def test_patients_are_not_rendered(self):
+        html = VisitForm().as_p()
+        self.assertNotIn("Lastname", html)
+        self.assertIn('data-autocomplete-url="/users/patients/', html)
+        self.assertIn("js/autocomplete.js", str(VisitForm().media))
+
+    def test_selected_patient_is_rendered(self):
+        html = str(VisitForm(initial={"patient": self.patient.id})["patient"])
+        self.assertIn("Lastname7 Firstname7", html)
+        self.assertNotIn("Lastname8", html)
+
+    def test_doctor_depends_on_treatment_direction(self):
+        html = str(VisitForm()["doctor"])
+        self.assertIn("data-depends-on", html)
+        self.assertIn("treatment_direction", html)
+
+    def test_invalid_choice_is_reported(self):
+        form = VisitForm(data={"patient": "garbage"})
+        self.assertIn("patient", form.errors)
+        self.assertNotIn("Lastname", form.as_p())
+
+
+class VisitSearchFormTest(SimpleTestCase):
+    def search(self, value):
+        form = VisitSearchForm(data={"date_time": value})
+        self.assertTrue(form.is_valid())
+        return form.cleaned_data["date_time"]
+
+    def test_empty_search(self):
+        self.assertEqual(self.search(""), {})
+
+    def test_search_by_date(self):
+        self.assertEqual(
+            self.search("2030-01-02"),
+            {
+                "date_time__range": (
+                    datetime(2030, 1, 2),
+                    datetime(2030, 1, 2, 23, 59, 59, 999999),
+                )
+            },
+        )
+
+    def test_search_by_month(self):
+        self.assertEqual(
+            self.search("2030-12")["date_time__range"][1],
+            datetime(2030, 12, 31, 23, 59, 59, 999999),
+        )
+
+    def test_search_by_year(self):
+        self.assertEqual(
+            self.search("2030")["date_time__range"],
+            (datetime(2030, 1, 1), datetime(2030, 12, 31, 23, 59, 59, 999999)),
+        )
+
+    def test_search_by_date_and_hour(self):
+        self.assertEqual(
+            self.search("2030-01-02 10")["date_time__range"],
+            (
+                datetime(2030, 1, 2, 10),
+                datetime(2030, 1, 2, 10, 59, 59, 999999),
+            ),
+        )
+
+    def test_search_by_date_and_time(self):
+        self.assertEqual(
+            self.search("2030-01-02 10:30")["date_time__range"][0],
+            datetime(2030, 1, 2, 10, 30),
+        )
+
+    def test_search_by_time_of_day(self):
+        self.assertEqual(
+            self.search("23:59"),
+            {"time_of_day__range": (time(23, 59), time(23, 59, 59, 999999))},
+        )
+
+    def test_search_unknown_format(self):
+        form = VisitSearchForm(data={"date_time": "Monday"})
+        self.assertFalse(form.is_valid())
@@ -0,0 +1,216 @@
+import io
+import json
+import os
+import tempfile
+from datetime import datetime
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+
+from reception import dashboard
+from reception.imports import import_visits, read_records
+from reception.models import Visit
+from users.models import Patient, Specialization
+
+VISIT_IMPORT_URL = reverse("reception:visit-import")
+HEADER = "date_time,doctor,patient,treatment_direction,duration,type_of_visit"
+
+
+def csv_records(*lines):
+    return read_records(io.StringIO("\n".join((HEADER, *lines))), "csv")
+
+
+class ImportVisitsTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.doctor = get_user_model().objects.create_user(
+            username="ivanenko", first_name="Petro", last_name="Ivanenko"
+        )
+        self.patient = Patient.objects.create(
+            first_name="Ivan", last_name="Petrenko", phone_number="0671234567"
+        )
+        self.specialization = Specialization.objects.create(
+            name="Surgeon", visit_duration=45
+        )
+
+    def test_import_invalidates_the_visit_counter(self):
+        self.assertEqual(dashboard.get_counters()["num_visits"], 0)
+
+        import_visits(
+            csv_records("2031-01-10 09:30,ivanenko,0671234567,Surgeon,30,")
+        )
+        self.assertEqual(dashboard.get_counters()["num_visits"], 1)
+
+    def test_csv(self):
+        created, errors = import_visits(
+            csv_records(
+                "2031-01-10 09:30,ivanenko,0671234567,Surgeon,30,INIT",
+                "2031-01-10 10:00,ivanenko,0671234567,Surgeon,,",
+            )
+        )
+
+        self.assertEqual((created, errors), (2, []))
+        first, second = Visit.objects.order_by("date_time")
+        self.assertEqual(first.doctor, self.doctor)
+        self.assertEqual(first.patient, self.patient)
+        self.assertEqual(first.type_of_visit, "INIT")
+        self.assertEqual(first.end_date_time, datetime(2031, 1, 10, 10))
+        self.assertIsNone(second.duration)
+        self.assertEqual(second.end_date_time, datetime(2031, 1, 10, 10, 45))
+        self.assertEqual(second.type_of_visit, "REPT")
+
+    def test_json_lines(self):
+        records = read_records(
+            io.StringIO(
+                json.dumps(
+                    {
+                        "date_time": "2031-01-10T09:30:00",
+                        "doctor": "ivanenko",
+                        "patient": "0671234567",
+                        "treatment_direction": "Surgeon",
+                        "duration": 30,
+                    }
+                )
+                + "\n\nnot json\n[]\n"
+            ),
+            "jsonl",
+        )
+        created, errors = import_visits(records)
+
+        self.assertEqual(created, 1)
+        self.assertEqual(
+            errors,
+            [
+                (3, "The record cannot be parsed."),
+                (4, "The record cannot be parsed."),
+            ],
+        )
+
+    def test_errors_are_reported_per_row(self):
+        created, errors = import_visits(
+            csv_records(
+                "2031-01-10 09:30,nobody,0671234567,Surgeon,30,INIT",
+                "2020-01-10 09:30,ivanenko,0671234567,Surgeon,30,INIT",
+                "2031-01-10 09:30,ivanenko,0671234567,,zero,VISIT",
+                "2031-01-10 09:30,ivanenko,0671234567,Surgeon,1000,",
+                ",,,,,",
+            )
+        )
+
+        self.assertEqual(created, 0)
+        lines = dict(errors)
+        self.assertEqual(lines[2], "No doctor with the username 'nobody'.")
+        self.assertIn("overdue", lines[3])
+        self.assertIn("The treatment direction is required.", lines[4])
+        self.assertIn("The duration 'zero' is not a number.", lines[4])
+        self.assertIn("The type of visit is one of INIT, REPT.", lines[4])
+        self.assertIn("less than or equal", lines[5])
+        self.assertIn("The patient is required.", lines[6])
+
+    def test_deleted_references_are_not_resolved(self):
+        self.patient.delete()
+        _, errors = import_visits(
+            csv_records("2031-01-10 09:30,ivanenko,0671234567,Surgeon,30,")
+        )
+
+        self.assertEqual(
+            errors, [(2, "No patient with the phone number '0671234567'.")]
+        )
+
+    def test_conflicts_are_rejected(self):
+        Visit.objects.create(
+            date_time=datetime(2031, 1, 10, 9),
+            doctor=self.doctor,
+            patient=self.patient,
+            duration=30,
+        )
+        created, errors = import_visits(
+            csv_records(
+                "2031-01-10 09:15,ivanenko,0671234567,Surgeon,30,",
+                "2031-01-10 09:30,ivanenko,0671234567,Surgeon,30,",
+                "2031-01-10 09:45,ivanenko,0671234567,Surgeon,30,",
+                "2031-01-10 10:00,ivanenko,0671234567,Surgeon,30,",
+            ),
+            chunk_size=2,
+        )
+
+        self.assertEqual(created, 2)
+        self.assertEqual([line_number for line_number, _ in errors], [2, 4])
+        self.assertIn("already has a visit", errors[0][1])
+
+    def test_references_are_resolved_once(self):
+        lines = [
+            f"2031-01-{day:02d} 09:00,ivanenko,0671234567,Surgeon,30,"
+            for day in range(1, 29)
+        ]
+        # Doctors, patients, specializations, schedules, the savepoint
+        # and the insert
+        with self.assertNumQueries(7):
+            created, _ = import_visits(csv_records(*lines), chunk_size=100)
+        self.assertEqual(created, 28)
+
+
+class ImportVisitsCommandTest(TestCase):
+    def test_command(self):
+        get_user_model().objects.create_user(username="ivanenko")
+        Patient.objects.create(
+            first_name="Ivan", last_name="Petrenko", phone_number="0671234567"
+        )
+        with tempfile.NamedTemporaryFile(
+            "w", suffix=".csv", delete=False
+        ) as stream:
+            stream.write(
+                f"{HEADER}\n"
+                "2031-01-10 09:30,ivanenko,0671234567,,30,\n"
+                "2031-01-10 09:30,ivanenko,0671234567,Surgeon,30,\n"
+            )
+        self.addCleanup(os.remove, stream.name)
+        out, err = io.StringIO(), io.StringIO()
+        call_command("import_visits", stream.name, stdout=out, stderr=err)
+
+        self.assertIn("Created 0 visit(s), rejected 2", out.getvalue())
+        self.assertIn("Line 3: No treatment direction", err.getvalue())
+
+
+class VisitImportViewTest(TestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            username="ivanenko", password="DocPassword123"
+        )
+        Patient.objects.create(
+            first_name="Ivan", last_name="Petrenko", phone_number="0671234567"
+        )
+        Specialization.objects.create(name="Surgeon")
+
+    def test_login_required(self):
+        response = self.client.get(VISIT_IMPORT_URL)
+        self.assertEqual(response.status_code, 302)
+
+    def test_upload(self):
+        self.client.force_login(self.user)
+        upload = SimpleUploadedFile(
+            "visits.jsonl",
+            b'{"date_time": "2031-01-10 09:30", "doctor": "ivanenko", '
+            b'"patient": "0671234567", "treatment_direction": "Surgeon"}\n'
+            b'{"date_time": "2031-01-10 09:30"}\n',
+        )
+        response = self.client.post(VISIT_IMPORT_URL, {"visits_file": upload})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context["created"], 1)
+        self.assertEqual(response.context["error_count"], 1)
+        self.assertContains(response, "The doctor is required.")
+        self.assertEqual(Visit.objects.count(), 1)
+
+    def test_undecodable_upload(self):
+        self.client.force_login(self.user)
+        upload = SimpleUploadedFile("visits.csv", b"\xff\xfe\x00broken")
+        response = self.client.post(VISIT_IMPORT_URL, {"visits_file": upload})
+
+        self.assertIn(
+            "cannot be read", response.context["form"].errors["visits_file"][0]
+        )
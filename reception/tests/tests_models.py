@@ -1,9 +1,11 @@
-from datetime import date
+from datetime import date, datetime, timedelta
+from unittest import skipUnless
 
 from django.contrib.auth import get_user_model
+from django.db import connection
 from django.test import TestCase
 
-from reception.models import Visit
+from reception.models import Visit, refresh_active_flags
 from users.models import Specialization, Patient
 
 
@@ -69,3 +71,167 @@ class VisitModelTests(TestCase):
         visit = Visit.objects.get(id=1)
         field_label = visit._meta.get_field("patient").verbose_name
         self.assertEqual(field_label, "patient")
+
+    def test_duration_defaults_to_treatment_direction(self):
+        visit = Visit.objects.get(id=1)
+        self.assertIsNone(visit.duration)
+        self.assertEqual(
+            visit.length, visit.treatment_direction.visit_duration
+        )
+        self.assertEqual(
+            visit.end_date_time - visit.date_time,
+            timedelta(minutes=visit.length),
+        )
+
+    def test_new_treatment_direction_brings_its_duration(self):
+        visit = Visit.objects.get(id=1)
+        visit.treatment_direction = Specialization.objects.create(
+            name="Therapy", visit_duration=60
+        )
+        visit.save()
+
+        self.assertIsNone(visit.duration)
+        self.assertEqual(visit.length, 60)
+
+    def test_upcoming_visits_follow_the_default_duration(self):
+        visit = Visit.objects.get(id=1)
+        upcoming = Visit.objects.create(
+            date_time=datetime(2031, 1, 10, 9),
+            treatment_direction=visit.treatment_direction,
+            patient=visit.patient,
+        )
+        overridden = Visit.objects.create(
+            date_time=datetime(2031, 1, 11, 9),
+            treatment_direction=visit.treatment_direction,
+            patient=visit.patient,
+            duration=20,
+        )
+        visit.treatment_direction.visit_duration = 60
+        visit.treatment_direction.save()
+
+        upcoming.refresh_from_db()
+        self.assertEqual(upcoming.end_date_time, datetime(2031, 1, 10, 10))
+        overridden.refresh_from_db()
+        self.assertEqual(overridden.length, 20)
+
+    def test_duration_overridden_per_visit(self):
+        visit = Visit.objects.get(id=1)
+        visit.duration = 45
+        visit.save()
+        self.assertEqual(
+            visit.end_date_time - visit.date_time, timedelta(minutes=45)
+        )
+
+
+class VisitLiveScheduleTests(TestCase):
+    def setUp(self):
+        self.doctor = sample_doctor()
+        self.patient = sample_patient()
+        self.visit = Visit.objects.create(
+            date_time=datetime(2031, 1, 10, 9),
+            treatment_direction=sample_specialization(),
+            doctor=self.doctor,
+            patient=self.patient,
+        )
+
+    def schedule(self):
+        return list(Visit.objects.live_schedule())
+
+    def test_one_query_without_joined_filters(self):
+        with self.assertNumQueries(1):
+            [visit] = self.schedule()
+            self.assertEqual(visit.doctor, self.doctor)
+            self.assertEqual(visit.patient, self.patient)
+            self.assertIsNotNone(visit.treatment_direction)
+
+        joins, where = str(Visit.objects.live_schedule().query).split(
+            " WHERE "
+        )
+        self.assertNotIn("INNER JOIN", joins)
+        self.assertNotIn('"users_doctor"', where)
+        self.assertNotIn('"users_patient"', where)
+
+    def test_doctor_soft_delete_hides_the_visits(self):
+        self.doctor.delete()
+        self.assertEqual(self.schedule(), [])
+        self.assertFalse(Visit.objects.get().doctor_active)
+
+        self.doctor.restore()
+        self.assertEqual(self.schedule(), [self.visit])
+
+    def test_patient_soft_delete_hides_the_visits(self):
+        self.patient.delete()
+        self.assertEqual(self.schedule(), [])
+
+        Patient.all_objects.all().restore()
+        self.assertEqual(self.schedule(), [self.visit])
+
+    def test_bulk_soft_delete_hides_the_visits(self):
+        get_user_model().objects.filter(pk=self.doctor.pk).delete()
+        self.assertEqual(self.schedule(), [])
+
+        get_user_model().all_objects.filter(pk=self.doctor.pk).restore()
+        self.assertEqual(self.schedule(), [self.visit])
+
+    def test_saving_a_live_doctor_keeps_the_flags(self):
+        self.doctor.first_name = "Renamed"
+        with self.assertNumQueries(4):
+            # The update, the flag checks, the search index
+            self.doctor.save()
+        self.assertEqual(self.schedule(), [self.visit])
+
+    def test_refresh_active_flags(self):
+        Visit.objects.update(doctor_active=False)
+        self.assertEqual(refresh_active_flags("doctor"), 1)
+        self.assertEqual(refresh_active_flags("doctor"), 0)
+        self.assertEqual(self.schedule(), [self.visit])
+
+    def test_visits_without_a_doctor_stay_in_the_schedule(self):
+        self.doctor.hard_delete()
+        refresh_active_flags("doctor")
+        self.assertEqual(len(self.schedule()), 1)
+
+    def test_reassigning_to_a_live_doctor_sets_the_flag(self):
+        self.doctor.delete()
+        self.visit.refresh_from_db()
+        self.visit.doctor = sample_doctor(username="Replacement")
+        self.visit.save()
+        self.assertEqual(self.schedule(), [self.visit])
+        self.assertTrue(
+            Visit.objects.busy(self.visit.doctor, self.visit.date_time)
+        )
+
+    def test_reassigning_by_id_fetches_the_doctor(self):
+        self.doctor.delete()
+        replacement = sample_doctor(username="Replacement")
+        visit = Visit.objects.get()
+        visit.doctor_id = replacement.pk
+        visit.save()
+        self.assertTrue(Visit.objects.get().doctor_active)
+
+    def test_visits_of_deleted_doctors_and_patients_are_not_scheduled(self):
+        self.doctor.delete()
+        self.patient.delete()
+        visit = Visit.objects.create(
+            date_time=datetime(2031, 1, 11, 9),
+            doctor_id=self.doctor.pk,
+            patient=self.patient,
+        )
+        self.assertFalse(visit.doctor_active)
+        self.assertFalse(visit.patient_active)
+        self.assertEqual(self.schedule(), [])
+
+    def test_patient_soft_delete_frees_the_doctor(self):
+        self.patient.delete()
+        self.assertFalse(
+            Visit.objects.busy(self.doctor, self.visit.date_time).exists()
+        )
+
+    @skipUnless(connection.vendor == "sqlite", "EXPLAIN QUERY PLAN of SQLite")
+    def test_upcoming_schedule_uses_its_index(self):
+        plan = (
+            Visit.objects.live_schedule()
+            .filter(date_time__gte=datetime(2030, 1, 1))
+            .explain()
+        )
+        self.assertIn("USING INDEX visit_date_time_schedule", plan)
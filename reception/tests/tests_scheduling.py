@@ -0,0 +1,181 @@
+from datetime import date, datetime, timedelta
+
+from django.contrib.auth import get_user_model
+from django.test import SimpleTestCase, TestCase
+
+from reception.models import Visit
+from reception.scheduling import (
+    DoctorSchedule,
+    book_visits,
+    find_free_slots,
+    free_windows,
+    working_windows,
+)
+from users.models import Patient, Specialization
+
+START = datetime(2031, 1, 1, 10)
+
+
+def minutes(count):
+    return timedelta(minutes=count)
+
+
+class DoctorScheduleTest(SimpleTestCase):
+    def setUp(self):
+        self.schedule = DoctorSchedule(
+            [
+                (START + minutes(60), START + minutes(90)),
+                (START, START + minutes(30)),
+            ]
+        )
+
+    def test_intervals_are_sorted(self):
+        self.assertEqual(
+            [start for start, _ in self.schedule],
+            [START, START + minutes(60)],
+        )
+
+    def test_overlaps(self):
+        self.assertTrue(
+            self.schedule.overlaps(START + minutes(15), START + minutes(45))
+        )
+        self.assertTrue(
+            self.schedule.overlaps(START - minutes(5), START + minutes(5))
+        )
+        self.assertTrue(
+            self.schedule.overlaps(START - minutes(5), START + minutes(120))
+        )
+
+    def test_back_to_back_intervals_do_not_overlap(self):
+        self.assertFalse(
+            self.schedule.overlaps(START + minutes(30), START + minutes(60))
+        )
+
+    def test_added_interval_overlaps(self):
+        self.schedule.add(START + minutes(30), START + minutes(45))
+        self.assertTrue(
+            self.schedule.overlaps(START + minutes(40), START + minutes(50))
+        )
+
+
+class FreeWindowsTest(SimpleTestCase):
+    def setUp(self):
+        self.windows = working_windows(
+            date(2031, 1, 1), date(2031, 1, 2), now=datetime(2030, 1, 1)
+        )
+
+    def test_working_windows(self):
+        self.assertEqual(
+            self.windows,
+            [
+                (datetime(2031, 1, 1, 9), datetime(2031, 1, 1, 18)),
+                (datetime(2031, 1, 2, 9), datetime(2031, 1, 2, 18)),
+            ],
+        )
+
+    def test_working_windows_skip_the_past(self):
+        windows = working_windows(
+            date(2031, 1, 1), date(2031, 1, 2), now=datetime(2031, 1, 1, 12)
+        )
+        self.assertEqual(windows[0][0], datetime(2031, 1, 1, 12))
+
+    def test_free_windows_between_visits(self):
+        schedule = DoctorSchedule(
+            [
+                (START, START + minutes(30)),
+                (START + minutes(45), START + minutes(60)),
+                # Runs over the end of the first day
+                (datetime(2031, 1, 1, 17, 50), datetime(2031, 1, 2, 9, 10)),
+            ]
+        )
+        self.assertEqual(
+            free_windows(schedule, self.windows, minutes(30)),
+            [
+                (datetime(2031, 1, 1, 9), START),
+                (START + minutes(60), datetime(2031, 1, 1, 17, 50)),
+                (datetime(2031, 1, 2, 9, 10), datetime(2031, 1, 2, 18)),
+            ],
+        )
+
+
+class BookVisitsTest(TestCase):
+    def setUp(self):
+        self.doctor = get_user_model().objects.create_user(
+            username="DocUsername",
+            first_name="Firstname",
+            last_name="Lastname",
+            password="DocPassword123",
+        )
+        self.patient = Patient.objects.create(
+            phone_number="0123456789",
+            first_name="Firstname",
+            last_name="Lastname",
+        )
+        Visit.objects.create(
+            date_time=START, doctor=self.doctor, patient=self.patient
+        )
+
+    def sample_visit(self, date_time):
+        return Visit(
+            date_time=date_time, doctor=self.doctor, patient=self.patient
+        )
+
+    def test_book_visits(self):
+        created, rejected = book_visits(
+            [
+                self.sample_visit(START + minutes(10)),
+                self.sample_visit(START + minutes(30)),
+                self.sample_visit(START + minutes(45)),
+                self.sample_visit(START + minutes(60)),
+            ]
+        )
+        self.assertEqual(
+            [visit.date_time for visit in created],
+            [START + minutes(30), START + minutes(60)],
+        )
+        self.assertEqual(len(rejected), 2)
+        self.assertEqual(Visit.objects.count(), 3)
+
+    def test_book_visits_loads_existing_visits_in_one_query(self):
+        visits = [self.sample_visit(START + minutes(30 * n)) for n in range(5)]
+        with self.assertNumQueries(2):
+            book_visits(visits)
+
+
+class FindFreeSlotsTest(TestCase):
+    def setUp(self):
+        self.specialization = Specialization.objects.create(
+            name="Surgery", visit_duration=60
+        )
+        self.doctor = get_user_model().objects.create_user(
+            username="DocUsername",
+            first_name="Firstname",
+            last_name="Lastname",
+            password="DocPassword123",
+        )
+        self.doctor.specializations.add(self.specialization)
+        deleted_doctor = get_user_model().objects.create_user(
+            username="DeletedUsername",
+            password="DocPassword123",
+        )
+        deleted_doctor.specializations.add(self.specialization)
+        deleted_doctor.delete()
+        Visit.objects.create(
+            date_time=datetime(2031, 1, 1, 9, 30),
+            doctor=self.doctor,
+            treatment_direction=self.specialization,
+        )
+
+    def test_find_free_slots(self):
+        with self.assertNumQueries(2):
+            slots = find_free_slots(
+                self.specialization, date(2031, 1, 1), date(2031, 1, 1)
+            )
+        self.assertEqual(
+            slots,
+            {
+                self.doctor: [
+                    (datetime(2031, 1, 1, 10, 30), datetime(2031, 1, 1, 18))
+                ]
+            },
+        )
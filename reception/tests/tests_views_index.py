@@ -0,0 +1,146 @@
+from datetime import datetime, timedelta
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import OperationalError, connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from reception import dashboard, page_views
+from reception.models import PageViewCounter, Visit
+from users.models import Patient
+
+INDEX_URL = reverse("reception:index")
+
+
+class PublicIndexViewTest(TestCase):
+    def test_login_required(self):
+        response = self.client.get(INDEX_URL)
+        self.assertEqual(response.status_code, 302)
+
+
+class PrivateIndexViewTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        patcher = mock.patch.object(
+            page_views, "buffer", page_views.PageViewBuffer()
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.doctor = get_user_model().objects.create_user(
+            username="DocUsername",
+            first_name="Firstname",
+            last_name="Lastname",
+            password="DocPassword123",
+        )
+        self.client.force_login(self.doctor)
+
+        self.patient = Patient.objects.create(
+            phone_number="0123456789",
+            first_name="Firstname",
+            last_name="Lastname",
+        )
+        Visit.objects.create(
+            date_time=datetime.now() + timedelta(days=1),
+            doctor=self.doctor,
+            patient=self.patient,
+        )
+        Visit.objects.create(
+            date_time=datetime.now() - timedelta(days=1),
+            doctor=self.doctor,
+            patient=self.patient,
+        )
+
+    def test_index_counters(self):
+        response = self.client.get(INDEX_URL)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context["num_visits"], 1)
+        self.assertEqual(response.context["num_patients"], 1)
+        self.assertEqual(response.context["num_doctors"], 1)
+
+    def test_counters_are_served_from_the_cache(self):
+        dashboard.get_counters()
+        with self.assertNumQueries(0):
+            dashboard.get_counters()
+
+    def test_new_visit_invalidates_the_visit_counter(self):
+        dashboard.get_counters()
+        Visit.objects.create(
+            date_time=datetime.now() + timedelta(days=2),
+            doctor=self.doctor,
+            patient=self.patient,
+        )
+        with self.assertNumQueries(2):
+            counters = dashboard.get_counters()
+        self.assertEqual(counters["num_visits"], 2)
+
+    def test_soft_delete_invalidates_the_patient_counter(self):
+        dashboard.get_counters()
+        self.patient.delete()
+        self.assertEqual(dashboard.get_counters()["num_patients"], 0)
+        self.patient.restore()
+        self.assertEqual(dashboard.get_counters()["num_patients"], 1)
+
+    def test_login_keeps_the_doctor_counter(self):
+        dashboard.get_counters()
+        self.client.login(username="DocUsername", password="DocPassword123")
+        with self.assertNumQueries(0):
+            dashboard.get_counters()
+
+    def test_visit_counter_expires_when_the_nearest_visit_starts(self):
+        Visit.objects.create(
+            date_time=datetime.now() + timedelta(minutes=10),
+            doctor=self.doctor,
+            patient=self.patient,
+        )
+        count, timeout = dashboard.count_visits()
+        self.assertEqual(count, 2)
+        self.assertLessEqual(timeout, 10 * 60 + 1)
+        self.assertGreater(timeout, 9 * 60)
+
+    def test_index_counts_page_views(self):
+        for num_visit_page in range(1, 4):
+            response = self.client.get(INDEX_URL)
+            self.assertEqual(
+                response.context["num_visit_page"], num_visit_page
+            )
+
+    def test_index_does_not_write_to_the_database(self):
+        self.client.get(INDEX_URL)
+        with CaptureQueriesContext(connection) as context:
+            self.client.get(INDEX_URL)
+        for query in context.captured_queries:
+            self.assertTrue(query["sql"].startswith("SELECT"), query["sql"])
+
+
+class PageViewBufferTest(TestCase):
+    def test_views_are_written_in_batches(self):
+        buffer = page_views.PageViewBuffer(flush_size=3)
+        self.assertEqual(buffer.record("page"), 1)
+        self.assertEqual(buffer.record("page"), 2)
+        self.assertFalse(PageViewCounter.objects.exists())
+
+        self.assertEqual(buffer.record("page"), 3)
+        self.assertEqual(PageViewCounter.objects.get(key="page").count, 3)
+
+    def test_views_are_added_to_the_stored_total(self):
+        PageViewCounter.objects.create(key="page", count=10)
+        buffer = page_views.PageViewBuffer()
+        self.assertEqual(buffer.record("page"), 11)
+        buffer.flush()
+        self.assertEqual(PageViewCounter.objects.get(key="page").count, 11)
+
+    def test_failed_flush_keeps_the_views(self):
+        buffer = page_views.PageViewBuffer(flush_size=1)
+        with mock.patch.object(
+            PageViewCounter.objects,
+            "get_or_create",
+            side_effect=OperationalError("database is locked"),
+        ), self.assertLogs("reception.page_views", "WARNING"):
+            self.assertEqual(buffer.record("page"), 1)
+        self.assertFalse(PageViewCounter.objects.exists())
+
+        self.assertEqual(buffer.record("page"), 2)
+        self.assertEqual(PageViewCounter.objects.get(key="page").count, 2)
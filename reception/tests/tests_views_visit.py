@@ -1,4 +1,5 @@
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
 from django.test import TestCase
 from django.urls import reverse, reverse_lazy
 
@@ -7,6 +8,7 @@ from users.models import Specialization, Patient
 
 VISIT_LIST_URL = reverse("reception:visit-list")
 VISIT_CREATE_URL = reverse("reception:visit-create")
+FREE_SLOTS_URL = reverse("reception:free-slots")
 
 
 class PublicVisitListViewTest(TestCase):
@@ -100,6 +102,55 @@ class PrivateVisitListViewTest(TestCase):
             in str(response.context["visit_list"][0].date_time)
         )
 
+    def test_visit_search_by_time_of_day(self):
+        response = self.client.get(VISIT_LIST_URL + "?date_time=00:00")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.context["visit_list"]), 2)
+
+        response = self.client.get(VISIT_LIST_URL + "?date_time=10:00")
+        self.assertEqual(len(response.context["visit_list"]), 0)
+
+    def test_visit_search_by_year(self):
+        response = self.client.get(VISIT_LIST_URL + "?date_time=2030")
+        self.assertEqual(len(response.context["visit_list"]), 2)
+
+    def test_unknown_search_shows_the_error(self):
+        response = self.client.get(VISIT_LIST_URL + "?date_time=Monday")
+        self.assertEqual(len(response.context["visit_list"]), 0)
+        self.assertContains(response, "Enter a year (YYYY)")
+        self.assertContains(response, 'value="Monday"')
+
+    def test_visit_search_uses_date_time_range(self):
+        response = self.client.get(VISIT_LIST_URL + "?date_time=2030-01-02")
+        queryset = response.context["view"].get_queryset()
+        self.assertNotIn("LIKE", str(queryset.query))
+
+    def test_visits_of_deleted_doctors_are_hidden(self):
+        self.doctor.delete()
+        response = self.client.get(VISIT_LIST_URL + "?date_time=2030-01-02")
+        self.assertEqual(len(response.context["visit_list"]), 0)
+
+    def test_visit_list_query_count(self):
+        cache.clear()
+        # Session, user, validators, the total and the page
+        # with its doctors and patients
+        with self.assertNumQueries(5):
+            self.client.get(VISIT_LIST_URL + "?date_time=2030-01-02")
+
+    def test_visit_list_cursor_pagination(self):
+        response = self.client.get(VISIT_LIST_URL + "?date_time=2030-01-02")
+        first_page = response.context["visit_list"]
+        response = self.client.get(
+            VISIT_LIST_URL,
+            {
+                "date_time": "2030-01-02",
+                "cursor": response.context["page_obj"].next_cursor,
+            },
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.context["visit_list"]), 1)
+        self.assertNotIn(response.context["visit_list"][0], first_page)
+
 
 class PrivateVisitCreateViewTest(TestCase):
     def setUp(self):
@@ -282,3 +333,51 @@ class PrivateVisitDeleteViewTest(TestCase):
         self.assertRedirects(
             post_response, reverse("reception:visit-list"), status_code=302
         )
+
+
+class PrivateFreeSlotsViewTest(TestCase):
+    def setUp(self):
+        self.specialization = Specialization.objects.create(name="Surgery")
+        self.doctor = get_user_model().objects.create_user(
+            username="DocUsername",
+            first_name="Firstname",
+            last_name="Lastname",
+            password="DocPassword123",
+        )
+        self.doctor.specializations.add(self.specialization)
+        self.client.force_login(self.doctor)
+
+    def test_login_required(self):
+        self.client.logout()
+        response = self.client.get(FREE_SLOTS_URL)
+        self.assertEqual(response.status_code, 302)
+
+    def test_free_slots(self):
+        response = self.client.get(
+            FREE_SLOTS_URL,
+            {
+                "specialization": self.specialization.id,
+                "date_from": "2031-01-01",
+                "date_to": "2031-01-02",
+            },
+        )
+        self.assertEqual(response.status_code, 200)
+        doctors = response.json()["doctors"]
+        self.assertEqual(len(doctors), 1)
+        self.assertEqual(doctors[0]["id"], self.doctor.id)
+        self.assertEqual(
+            doctors[0]["free"][0],
+            ["2031-01-01T09:00:00", "2031-01-01T18:00:00"],
+        )
+
+    def test_free_slots_period_is_limited(self):
+        response = self.client.get(
+            FREE_SLOTS_URL,
+            {
+                "specialization": self.specialization.id,
+                "date_from": "2031-01-01",
+                "date_to": "2031-03-01",
+            },
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("__all__", response.json()["errors"])
@@ -2,11 +2,14 @@ from django.urls import path
 
 from .views import (
     index,
+    free_slots,
+    export_visits,
     VisitListView,
     VisitDetailView,
     VisitCreateView,
     VisitUpdateView,
     VisitDeleteView,
+    VisitImportView,
 )
 
 app_name = "reception"
@@ -16,6 +19,9 @@ urlpatterns = [
     path("visits/", VisitListView.as_view(), name="visit-list"),
     path("visits/<int:pk>/", VisitDetailView.as_view(), name="visit-detail"),
     path("visits/create/", VisitCreateView.as_view(), name="visit-create"),
+    path("visits/free-slots/", free_slots, name="free-slots"),
+    path("visits/import/", VisitImportView.as_view(), name="visit-import"),
+    path("visits/export/", export_visits, name="visit-export"),
     path(
         "visits/<int:pk>/update/",
         VisitUpdateView.as_view(),
@@ -1,14 +1,38 @@
+import csv
+import io
 from datetime import datetime
+from functools import cached_property
 
 from django.contrib.auth.decorators import login_required
 from django.contrib.auth.mixins import LoginRequiredMixin
+from django.http import JsonResponse
 from django.shortcuts import render
 from django.urls import reverse_lazy
 from django.views import generic
 
-from reception.forms import VisitSearchForm, VisitForm
+from reception import page_views
+from reception.dashboard import get_counters
+from reception.forms import (
+    VisitSearchForm,
+    VisitForm,
+    FreeSlotForm,
+    VisitImportForm,
+    VisitFilterForm,
+)
+from reception.exports import VISIT_COLUMNS, visits_to_export
+from reception.imports import guess_format, import_visits, read_records
 from reception.models import Visit
-from users.models import Patient, Doctor
+from reception.scheduling import find_free_slots
+from users.models import Doctor, Patient, Specialization
+from utils.conditional import ConditionalGetMixin
+from utils.exports import FORMAT_ERRORS, export_response, requested_format
+from utils.pagination import KeysetPaginationMixin
+
+# Errors of an import shown on the page
+MAX_SHOWN_IMPORT_ERRORS = 100
+
+# A visit and the rows shown with it
+VISIT_VALIDATOR_MODELS = (Visit, Doctor, Patient, Specialization)
 
 
 @login_required
@@ -16,25 +40,12 @@ def index(request):
     """
     View function for the home page of the site.
     """
-    num_visits = (
-        Visit.objects.filter(deleted_at__isnull=True)
-        .filter(date_time__gte=datetime.now())
-        .count()
-    )
-    num_patients = Patient.objects.filter(deleted_at__isnull=True).count()
-    num_doctors = (
-        Doctor.objects.filter(is_staff=False)
-        .filter(deleted_at__isnull=True)
-        .count()
-    )
+    counters = get_counters()
 
-    num_visit_page = request.session.get("num_visit_page", 0) + 1
-    request.session["num_visit_page"] = num_visit_page
+    num_visit_page = page_views.record(f"index:{request.user.pk}")
 
     context = {
-        "num_patients": num_patients,
-        "num_visits": num_visits,
-        "num_doctors": num_doctors,
+        **counters,
         "num_visit_page": num_visit_page,
         "is_show_counter": True,
     }
@@ -42,47 +53,116 @@ def index(request):
     return render(request, "reception/index.html", context=context)
 
 
-class VisitListView(LoginRequiredMixin, generic.ListView):
+@login_required
+def free_slots(request):
+    """
+    Open appointment windows of the doctors of a specialization, as JSON.
+    Every window is a [start, end] pair of ISO 8601 datetimes.
+    """
+    form = FreeSlotForm(request.GET)
+    if not form.is_valid():
+        return JsonResponse({"errors": form.errors}, status=400)
+
+    specialization = form.cleaned_data["specialization"]
+    slots = find_free_slots(
+        specialization,
+        form.cleaned_data["date_from"],
+        form.cleaned_data["date_to"],
+    )
+
+    return JsonResponse(
+        {
+            "specialization": {
+                "id": specialization.id,
+                "name": specialization.name,
+                "visit_duration": specialization.visit_duration,
+            },
+            "doctors": [
+                {
+                    "id": doctor.id,
+                    "name": str(doctor),
+                    "free": [
+                        [start.isoformat(), end.isoformat()]
+                        for start, end in free
+                    ],
+                }
+                for doctor, free in slots.items()
+            ],
+        }
+    )
+
+
+@login_required
+def export_visits(request):
+    """
+    The visits as a CSV (default) or JSON Lines download, filtered
+    like the visits of the API. The file is streamed as it is read.
+    """
+    form = VisitFilterForm(request.GET)
+    file_format = requested_format(request)
+    if file_format is None:
+        return JsonResponse({"errors": FORMAT_ERRORS}, status=400)
+    if not form.is_valid():
+        return JsonResponse({"errors": form.errors}, status=400)
+
+    return export_response(
+        visits_to_export(form.cleaned_data),
+        VISIT_COLUMNS,
+        file_format,
+        "visits",
+    )
+
+
+class VisitListView(
+    LoginRequiredMixin,
+    ConditionalGetMixin,
+    KeysetPaginationMixin,
+    generic.ListView,
+):
     model = Visit
+    validator_models = VISIT_VALIDATOR_MODELS
+    # Started visits leave the list
+    send_last_modified = False
     paginate_by = 2
+    keyset_ordering = ("date_time", "id")
+
+    def get_validator_values(self):
+        # The first visit to start, the index of the schedule finds it
+        return (
+            self.get_queryset()
+            .order_by(*self.keyset_ordering)
+            .values_list("pk", flat=True)
+            .first(),
+        )
+
+    @cached_property
+    def search_form(self):
+        return VisitSearchForm(self.request.GET)
 
     def get_context_data(self, *, object_list=None, **kwargs):
         context = super(VisitListView, self).get_context_data(**kwargs)
-        date_time = self.request.GET.get("date_time", "")
-        context["search_form"] = VisitSearchForm(
-            initial={"date_time": date_time}
-        )
+        # Bound, so that an unparsed search shows its error
+        context["search_form"] = self.search_form
         return context
 
     def get_queryset(self):
-        queryset = (
-            Visit.objects.select_related(
-                "treatment_direction", "doctor", "patient"
-            )
-            .filter(patient__deleted_at__isnull=True)
-            .filter(doctor__deleted_at__isnull=True)
-            .filter(date_time__gte=datetime.now())
+        queryset = Visit.objects.live_schedule().filter(
+            date_time__gte=datetime.now()
         )
-        form = VisitSearchForm(self.request.GET)
-        if form.is_valid():
+        if self.search_form.is_valid():
             return queryset.filter(
-                date_time__icontains=form.cleaned_data["date_time"]
+                **self.search_form.cleaned_data["date_time"]
             )
 
-        return queryset
+        return queryset.none()
 
 
-class VisitDetailView(LoginRequiredMixin, generic.DetailView):
+class VisitDetailView(
+    LoginRequiredMixin, ConditionalGetMixin, generic.DetailView
+):
     model = Visit
-    queryset = (
-        Visit.objects.select_related(
-            "treatment_direction",
-            "doctor",
-            "patient",
-        )
-        .filter(patient__deleted_at__isnull=True)
-        .filter(doctor__deleted_at__isnull=True)
-    )
+    validator_models = VISIT_VALIDATOR_MODELS
+    queryset = Visit.objects.live_schedule()
 
 
 class VisitCreateView(LoginRequiredMixin, generic.CreateView):
@@ -100,3 +180,33 @@ class VisitUpdateView(LoginRequiredMixin, generic.UpdateView):
 class VisitDeleteView(LoginRequiredMixin, generic.DeleteView):
     model = Visit
     success_url = reverse_lazy("reception:visit-list")
+
+
+class VisitImportView(LoginRequiredMixin, generic.FormView):
+    """
+    Upload a CSV or JSON Lines file of visits. The file is read
+    as a stream and the valid visits are created chunk by chunk.
+    """
+
+    form_class = VisitImportForm
+    template_name = "reception/visit_import.html"
+
+    def form_valid(self, form):
+        upload = form.cleaned_data["visits_file"]
+        file_format = form.cleaned_data["format"] or guess_format(upload.name)
+        stream = io.TextIOWrapper(upload.file, encoding="utf-8", newline="")
+        try:
+            created, errors = import_visits(read_records(stream, file_format))
+        except (UnicodeDecodeError, csv.Error) as error:
+            # The chunks before the broken one are already imported
+            form.add_error("visits_file", f"The file cannot be read: {error}")
+            return self.form_invalid(form)
+
+        return self.render_to_response(
+            self.get_context_data(
+                form=form,
+                created=created,
+                errors=errors[:MAX_SHOWN_IMPORT_ERRORS],
+                error_count=len(errors),
+            )
+        )
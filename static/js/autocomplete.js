@@ -0,0 +1,111 @@
+// Autocomplete for the selects rendered by utils.widgets.AutocompleteSelect:
+// the options are fetched page by page from the JSON endpoint as the user types.
+(function () {
+  "use strict";
+
+  const DELAY = 250;
+
+  function setUp(select) {
+    const url = select.dataset.autocompleteUrl;
+    const dependsOn = JSON.parse(select.dataset.dependsOn || "{}");
+    const input = document.createElement("input");
+    input.type = "search";
+    input.className = "form-control mb-1";
+    input.placeholder = "Type to search";
+    input.autocomplete = "off";
+    select.parentNode.insertBefore(input, select);
+
+    let page = 1;
+    let timer = null;
+    let request = 0;
+
+    function params() {
+      const query = new URLSearchParams({term: input.value, page: page});
+      for (const [param, field] of Object.entries(dependsOn)) {
+        const element = select.form.elements[field];
+        if (element && element.value) {
+          query.set(param, element.value);
+        }
+      }
+      return query;
+    }
+
+    function option(value, text, disabled) {
+      const element = document.createElement("option");
+      element.value = value;
+      element.textContent = text;
+      element.disabled = Boolean(disabled);
+      return element;
+    }
+
+    function render(data, append) {
+      select.querySelectorAll("option[data-more]").forEach((more) => more.remove());
+      if (!append) {
+        // Keep the empty and the selected options
+        Array.from(select.options)
+          .filter((element) => element.value && !element.selected)
+          .forEach((element) => element.remove());
+      }
+      const present = new Set(Array.from(select.options, (element) => element.value));
+      for (const result of data.results) {
+        if (!present.has(String(result.id))) {
+          select.appendChild(option(result.id, result.text));
+        }
+      }
+      if (data.more) {
+        const more = option("", "More results...");
+        more.dataset.more = "true";
+        select.appendChild(more);
+      }
+    }
+
+    function load(append) {
+      const current = ++request;
+      fetch(`${url}?${params()}`, {credentials: "same-origin"})
+        .then((response) => (response.ok ? response.json() : null))
+        .then((data) => {
+          if (data && current === request) {
+            render(data, append);
+          }
+        });
+    }
+
+    input.addEventListener("input", () => {
+      clearTimeout(timer);
+      timer = setTimeout(() => {
+        page = 1;
+        load(false);
+      }, DELAY);
+    });
+
+    select.addEventListener("change", () => {
+      const selected = select.options[select.selectedIndex];
+      if (selected && selected.dataset.more) {
+        select.selectedIndex = 0;
+        page += 1;
+        load(true);
+      }
+    });
+
+    select.addEventListener("focus", () => {
+      if (request === 0) {
+        load(false);
+      }
+    });
+
+    for (const field of Object.values(dependsOn)) {
+      const element = select.form.elements[field];
+      if (element) {
+        element.addEventListener("change", () => {
+          select.value = "";
+          page = 1;
+          load(false);
+        });
+      }
+    }
+  }
+
+  document.addEventListener("DOMContentLoaded", () => {
+    document.querySelectorAll("select[data-autocomplete-url]").forEach(setUp);
+  });
+})();
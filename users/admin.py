@@ -1,20 +1,23 @@
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin
 
+from users.forms import DoctorForm
 from users.models import Specialization, Patient, Doctor
+from utils.admin import SoftDeleteAdmin
 
 
 @admin.register(Specialization)
-class SpecializationAdmin(admin.ModelAdmin):
+class SpecializationAdmin(SoftDeleteAdmin):
     list_display = (
         "__str__",
+        "visit_duration",
         "deleted_at",
     )
     list_filter = ("deleted_at",)
 
 
 @admin.register(Patient)
-class PatientAdmin(admin.ModelAdmin):
+class PatientAdmin(SoftDeleteAdmin):
     list_display = (
         "__str__",
         "phone_number",
@@ -26,8 +29,10 @@ class PatientAdmin(admin.ModelAdmin):
 
 
 @admin.register(Doctor)
-class DoctorAdmin(UserAdmin):
+class DoctorAdmin(SoftDeleteAdmin, UserAdmin):
+    add_form = DoctorForm
     list_display = UserAdmin.list_display + (
+        "specialization_labels",
         "recertification_with",
         "deleted_at",
     )
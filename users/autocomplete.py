@@ -0,0 +1,88 @@
+"""
+Pages of patients and doctors for the autocomplete selects of VisitForm,
+served from the cache.
+
+The cache keys carry a version of the model that users.signals bumps
+whenever a row is saved or deleted, so a new patient can be picked
+right away while repeated lookups skip the database.
+"""
+
+import hashlib
+import time
+
+from django.core.cache import cache
+
+from users.models import Doctor, Patient
+from users.search import search
+
+CACHE_PREFIX = "autocomplete:"
+CACHE_TIMEOUT = 5 * 60
+PAGE_SIZE = 20
+
+
+def version_key(model):
+    return f"{CACHE_PREFIX}{model._meta.model_name}:version"
+
+
+def get_version(model):
+    # Start from the clock: a version lost by the cache is never reused
+    return cache.get_or_set(version_key(model), time.time_ns, None)
+
+
+def invalidate(model):
+    try:
+        cache.incr(version_key(model))
+    except ValueError:
+        cache.set(version_key(model), time.time_ns(), None)
+
+
+def cached_page(model, queryset, text, page, *params):
+    """
+    The page of the queryset matching the text, as
+    {"results": [{"id": ..., "text": ...}], "more": bool}.
+    """
+    digest = hashlib.md5(repr((text, page, *params)).encode()).hexdigest()
+    version = get_version(model)
+    key = f"{CACHE_PREFIX}{model._meta.model_name}:{version}:{digest}"
+    result = cache.get(key)
+    if result is not None:
+        return result
+
+    if text:
+        queryset = search(queryset, text).order_by("search_rank", "id")
+    else:
+        queryset = queryset.order_by("last_name", "id")
+    start = (page - 1) * PAGE_SIZE
+    end = start + PAGE_SIZE + 1
+    rows = list(queryset[start:end])
+    result = {
+        "results": [
+            {"id": obj.pk, "text": str(obj)} for obj in rows[:PAGE_SIZE]
+        ],
+        "more": len(rows) > PAGE_SIZE,
+    }
+    cache.set(key, result, CACHE_TIMEOUT)
+
+    return result
+
+
+def patient_page(text="", page=1):
+    return cached_page(
+        Patient, Patient.objects.only("first_name", "last_name"), text, page
+    )
+
+
+def doctor_page(text="", page=1, specialization_id=None):
+    """
+    Doctors practising the specialization (any by default).
+    """
+    queryset = Doctor.objects.filter(is_staff=False).only(
+        "first_name", "last_name"
+    )
+    if specialization_id is not None:
+        queryset = queryset.filter(
+            specializations=specialization_id,
+            specializations__deleted_at__isnull=True,
+        )
+
+    return cached_page(Doctor, queryset, text, page, specialization_id)
@@ -0,0 +1,17 @@
+"""
+Export of the patient roster.
+"""
+
+from users.models import Patient
+
+PATIENT_COLUMNS = {
+    "id": "id",
+    "first_name": "first_name",
+    "last_name": "last_name",
+    "phone_number": "phone_number",
+    "date_of_birth": "date_of_birth",
+}
+
+
+def patients_to_export():
+    return Patient.objects.order_by("id")
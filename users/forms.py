@@ -4,18 +4,57 @@ from django import forms
 from django.contrib.auth.forms import UserCreationForm
 from django.core.exceptions import ValidationError
 
-from users.models import Doctor, Specialization, Patient
+from users.models import Doctor, Specialization, Patient, phone_digits
+
+MIN_PHONE_LOOKUP_DIGITS = 3
 
 
 class UserSearchForm(forms.Form):
+    # Kept as "last_name" for existing links, searches any indexed field
     last_name = forms.CharField(
-        max_length=10,
+        max_length=50,
         required=False,
         label="",
-        widget=forms.TextInput(attrs={"placeholder": "Search by last name"}),
+        widget=forms.TextInput(
+            attrs={"placeholder": "Search by name, phone or e-mail"}
+        ),
     )
 
 
+class AutocompleteForm(forms.Form):
+    term = forms.CharField(max_length=50, required=False)
+    page = forms.IntegerField(min_value=1, required=False)
+
+    def clean_page(self):
+        return self.cleaned_data["page"] or 1
+
+
+class DoctorAutocompleteForm(AutocompleteForm):
+    specialization = forms.IntegerField(min_value=1, required=False)
+
+
+class PhoneLookupForm(forms.Form):
+    phone = forms.CharField(max_length=20)
+
+    def clean_phone(self):
+        return validate_phone_lookup(self.cleaned_data["phone"])
+
+
+def validate_phone_lookup(phone):
+    """
+    Check the typed part of a phone number.
+    Returns its digits, at least MIN_PHONE_LOOKUP_DIGITS of them.
+    """
+    digits = phone_digits(phone)
+    if len(digits) < MIN_PHONE_LOOKUP_DIGITS:
+        raise ValidationError(
+            f"Type at least {MIN_PHONE_LOOKUP_DIGITS} digits "
+            f"of the phone number."
+        )
+
+    return digits
+
+
 class PatientForm(forms.ModelForm):
     class Meta(UserCreationForm.Meta):
         model = Patient
@@ -63,6 +102,21 @@ class DoctorForm(UserCreationForm):
             "password2",
         )
 
+    def clean_username(self):
+        # Usernames of deleted doctors stay taken
+        username = self.cleaned_data.get("username")
+        if (
+            username
+            and Doctor.all_objects.filter(username__iexact=username)
+            .exclude(pk=self.instance.pk)
+            .exists()
+        ):
+            raise ValidationError(
+                Doctor._meta.get_field("username").error_messages["unique"]
+            )
+
+        return username
+
     def clean_recertification_with(self):
         return validate_recertification_with(
             self.cleaned_data["recertification_with"]
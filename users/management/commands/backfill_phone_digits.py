@@ -0,0 +1,38 @@
+from django.core.management.base import BaseCommand
+
+from users.models import Patient
+
+
+class Command(BaseCommand):
+    help = (  # noqa: VNE003
+        "Fill the normalized phone digits of patients "
+        "saved without them, e.g. by bulk loads."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=5_000)
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        fields = ("phone_number", "phone_digits", "phone_digits_reversed")
+        patients = Patient.all_objects.only(*fields).order_by("pk")
+        updated = 0
+        last_pk = 0
+        while True:
+            batch = list(patients.filter(pk__gt=last_pk)[:batch_size])
+            if not batch:
+                break
+            last_pk = batch[-1].pk
+            stale = []
+            for patient in batch:
+                current = patient.phone_digits, patient.phone_digits_reversed
+                patient.set_derived_fields()
+                if current != (
+                    patient.phone_digits,
+                    patient.phone_digits_reversed,
+                ):
+                    stale.append(patient)
+            Patient.all_objects.bulk_update(stale, fields[1:])
+            updated += len(stale)
+
+        self.stdout.write(f"Updated the phone digits of {updated} patient(s)")
@@ -0,0 +1,57 @@
+from django.core.management.base import BaseCommand
+from django.core.paginator import Paginator
+
+from users.models import Patient
+from utils.benchmark import measure, rollback, seed_patients
+from utils.pagination import NEXT, KeysetPaginator, encode_cursor
+
+ORDERING = ("last_name", "id")
+
+
+class Command(BaseCommand):
+    help = (  # noqa: VNE003
+        "Compare offset pagination with keyset pagination "
+        "of the patient list, near the start and deep into it."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--patients", type=int, default=500_000)
+        parser.add_argument("--per-page", type=int, default=50)
+        parser.add_argument(
+            "--pages", type=int, nargs="+", default=[1, 10_000]
+        )
+        parser.add_argument("--repeat", type=int, default=10)
+
+    def handle(self, *args, **options):
+        per_page = options["per_page"]
+        with rollback():
+            seed_patients(options["patients"])
+            queryset = Patient.objects.all()
+            offset_paginator = Paginator(
+                queryset.order_by(*ORDERING), per_page
+            )
+            keyset_paginator = KeysetPaginator(queryset, per_page, ORDERING)
+            for number in options["pages"]:
+                offset = (number - 1) * per_page
+                if offset >= options["patients"]:
+                    continue
+                # The cursor a client holds after paging up to the page
+                cursor = None
+                if offset:
+                    values = queryset.order_by(*ORDERING).values_list(
+                        *ORDERING
+                    )[offset - 1]
+                    cursor = encode_cursor(values, NEXT)
+
+                offset_ms = measure(
+                    lambda: list(offset_paginator.page(number)),
+                    options["repeat"],
+                )
+                keyset_ms = measure(
+                    lambda: list(keyset_paginator.page(cursor)),
+                    options["repeat"],
+                )
+                self.stdout.write(
+                    f"page {number:>6}: offset {offset_ms:9.3f} ms | "
+                    f"keyset {keyset_ms:9.3f} ms"
+                )
@@ -0,0 +1,32 @@
+from django.core.management.base import BaseCommand
+from django.test import RequestFactory
+from django.urls import reverse
+
+from users.views import patient_phone_lookup
+from utils.benchmark import measure, rollback, seed_doctors, seed_patients
+
+
+class Command(BaseCommand):
+    help = (  # noqa: VNE003
+        "Measure the phone lookup endpoint by the first "
+        "and by the last digits of the phone number."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--patients", type=int, default=2_000_000)
+        parser.add_argument("--repeat", type=int, default=25)
+
+    def handle(self, *args, **options):
+        with rollback():
+            user = seed_doctors(1)[0]
+            seed_patients(options["patients"])
+            probe = f"{options['patients'] // 2:010d}"
+            for phone in (probe[:3], probe[:7], probe[-4:], probe):
+                request = RequestFactory().get(
+                    reverse("user:patient-phone-lookup"), {"phone": phone}
+                )
+                request.user = user
+                elapsed = measure(
+                    lambda: patient_phone_lookup(request), options["repeat"]
+                )
+                self.stdout.write(f"{phone!r:>12}: {elapsed:.3f} ms")
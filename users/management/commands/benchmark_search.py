@@ -0,0 +1,50 @@
+from django.core.management.base import BaseCommand
+
+from users import search
+from users.models import Patient
+from utils.benchmark import measure, rollback, seed_patients
+
+
+class Command(BaseCommand):
+    help = (  # noqa: VNE003
+        "Compare the icontains search of patients with the indexed search."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--patients", type=int, default=1_000_000)
+        parser.add_argument("--per-page", type=int, default=50)
+        parser.add_argument("--repeat", type=int, default=10)
+
+    def handle(self, *args, **options):
+        per_page = options["per_page"]
+        with rollback():
+            seed_patients(options["patients"])
+            search.rebuild(Patient)
+            probe = options["patients"] // 2
+            searches = (
+                f"Bench{probe:07d}",
+                f"Bench{probe // 100:05d}",
+                f"{probe:010d}",
+                f"Patient{probe} Bench{probe:07d}",
+            )
+            for text in searches:
+                scan = measure(
+                    lambda: list(
+                        Patient.objects.filter(
+                            last_name__icontains=text
+                        ).order_by("last_name", "id")[:per_page]
+                    ),
+                    options["repeat"],
+                )
+                indexed = measure(
+                    lambda: list(
+                        search.search(Patient.objects.all(), text).order_by(
+                            "search_rank", "id"
+                        )[:per_page]
+                    ),
+                    options["repeat"],
+                )
+                self.stdout.write(
+                    f"{text!r:>30}: icontains {scan:9.3f} ms | "
+                    f"indexed {indexed:9.3f} ms"
+                )
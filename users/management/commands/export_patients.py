@@ -0,0 +1,31 @@
+from django.core.management.base import BaseCommand
+
+from users.exports import PATIENT_COLUMNS, patients_to_export
+from utils.exports import CSV, FORMATS, export_lines
+
+
+class Command(BaseCommand):
+    help = (  # noqa: VNE003
+        "Export the live patients as CSV or JSON Lines, "
+        "streamed with constant memory."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--format", choices=FORMATS, default=CSV)
+        parser.add_argument(
+            "--output", help="The file to write, standard output by default"
+        )
+
+    def handle(self, *args, **options):
+        lines = export_lines(
+            patients_to_export(), PATIENT_COLUMNS, options["format"]
+        )
+        if options["output"] is None:
+            for line in lines:
+                self.stdout.write(line, ending="")
+            return
+
+        with open(
+            options["output"], "w", encoding="utf-8", newline=""
+        ) as stream:
+            stream.writelines(lines)
@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+
+from users import autocomplete, search
+from users.models import Doctor, Patient
+from utils.checks import LOCAL_CACHE_WARNING, cache_is_local
+
+
+class Command(BaseCommand):
+    help = (  # noqa: VNE003
+        "Rebuild the search index of patients and doctors after bulk loads."
+    )
+
+    def handle(self, *args, **options):
+        for model in (Patient, Doctor):
+            search.rebuild(model)
+            autocomplete.invalidate(model)
+            self.stdout.write(f"Rebuilt the index of {model.__name__}")
+        if cache_is_local():
+            self.stderr.write(self.style.WARNING(LOCAL_CACHE_WARNING))
@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+
+from users.models import refresh_specialization_labels
+from utils.checks import LOCAL_CACHE_WARNING, cache_is_local
+
+
+class Command(BaseCommand):
+    help = (  # noqa: VNE003
+        "Rebuild the specialization labels of all doctors "
+        "from their live specializations."
+    )
+
+    def handle(self, *args, **options):
+        updated = refresh_specialization_labels()
+        self.stdout.write(f"Fixed the labels of {updated} doctor(s)")
+        if updated and cache_is_local():
+            self.stderr.write(self.style.WARNING(LOCAL_CACHE_WARNING))
@@ -0,0 +1,26 @@
+# Generated by Django 4.2.7 on 2026-10-17 19:47
+
+import django.core.validators
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("users", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="specialization",
+            name="visit_duration",
+            field=models.PositiveSmallIntegerField(
+                default=30,
+                help_text="Default duration of a visit, minutes",
+                validators=[
+                    django.core.validators.MinValueValidator(1),
+                    django.core.validators.MaxValueValidator(240),
+                ],
+            ),
+        ),
+    ]
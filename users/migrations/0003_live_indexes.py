@@ -0,0 +1,37 @@
+# Generated by Django 4.2.7 on 2026-10-17 19:56
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("users", "0002_specialization_visit_duration"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="doctor",
+            index=models.Index(
+                condition=models.Q(("deleted_at__isnull", True)),
+                fields=["last_name"],
+                name="doctor_last_name_live",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="patient",
+            index=models.Index(
+                condition=models.Q(("deleted_at__isnull", True)),
+                fields=["last_name"],
+                name="patient_last_name_live",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="specialization",
+            index=models.Index(
+                condition=models.Q(("deleted_at__isnull", True)),
+                fields=["name"],
+                name="specialization_name_live",
+            ),
+        ),
+    ]
@@ -0,0 +1,45 @@
+# Generated by Django 4.2.7 on 2026-10-17 20:09
+
+from collections import defaultdict
+
+from django.db import migrations, models
+
+
+def set_specialization_labels(apps, schema_editor):
+    Doctor = apps.get_model("users", "Doctor")
+    names = defaultdict(list)
+    for doctor_id, name in (
+        Doctor.specializations.through.objects.filter(
+            specialization__deleted_at__isnull=True
+        )
+        .order_by("specialization__name")
+        .values_list("doctor_id", "specialization__name")
+    ):
+        names[doctor_id].append(name)
+    doctors = []
+    for doctor in Doctor.objects.filter(pk__in=names):
+        doctor.specialization_labels = ", ".join(names[doctor.pk])[:255]
+        doctors.append(doctor)
+    Doctor.objects.bulk_update(
+        doctors, ["specialization_labels"], batch_size=1000
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("users", "0003_live_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="doctor",
+            name="specialization_labels",
+            field=models.CharField(
+                blank=True, default="", editable=False, max_length=255
+            ),
+        ),
+        migrations.RunPython(
+            set_specialization_labels, migrations.RunPython.noop
+        ),
+    ]
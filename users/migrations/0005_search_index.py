@@ -0,0 +1,101 @@
+# Generated by Django 4.2.7 on 2026-10-17 20:13
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+import utils.models
+
+SEARCH_INDEXES = {
+    "users_patient": ("first_name", "last_name", "phone_number"),
+    "users_doctor": ("first_name", "last_name", "username", "email"),
+}
+
+
+def create_search_index(apps, schema_editor):
+    execute = schema_editor.execute
+    if schema_editor.connection.vendor == "sqlite":
+        for table, columns in SEARCH_INDEXES.items():
+            execute(
+                f"CREATE VIRTUAL TABLE {table}_fts USING fts5("
+                f"{', '.join(columns)}, "
+                f"tokenize='unicode61 remove_diacritics 2', prefix='2 3 4')"
+            )
+            execute(
+                f"INSERT INTO {table}_fts (rowid, {', '.join(columns)}) "
+                f"SELECT id, {', '.join(columns)} FROM {table} "
+                f"WHERE deleted_at IS NULL"
+            )
+    elif schema_editor.connection.vendor == "postgresql":
+        execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+        for table, columns in SEARCH_INDEXES.items():
+            for column in columns:
+                execute(
+                    f"CREATE INDEX {table}_{column}_trgm ON {table} "
+                    f"USING gin (UPPER({column}) gin_trgm_ops)"
+                )
+
+
+def drop_search_index(apps, schema_editor):
+    execute = schema_editor.execute
+    if schema_editor.connection.vendor == "sqlite":
+        for table in SEARCH_INDEXES:
+            execute(f"DROP TABLE {table}_fts")
+    elif schema_editor.connection.vendor == "postgresql":
+        for table, columns in SEARCH_INDEXES.items():
+            for column in columns:
+                execute(f"DROP INDEX {table}_{column}_trgm")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("users", "0004_doctor_specialization_labels"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="DoctorSearchEntry",
+            fields=[
+                (
+                    "doctor",
+                    models.OneToOneField(
+                        db_column="rowid",
+                        on_delete=django.db.models.deletion.DO_NOTHING,
+                        primary_key=True,
+                        related_name="search_entry",
+                        serialize=False,
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+                ("document", utils.models.FullTextField(db_column="users_doctor_fts")),
+                ("rank", models.FloatField()),
+            ],
+            options={
+                "db_table": "users_doctor_fts",
+                "managed": False,
+            },
+        ),
+        migrations.CreateModel(
+            name="PatientSearchEntry",
+            fields=[
+                (
+                    "patient",
+                    models.OneToOneField(
+                        db_column="rowid",
+                        on_delete=django.db.models.deletion.DO_NOTHING,
+                        primary_key=True,
+                        related_name="search_entry",
+                        serialize=False,
+                        to="users.patient",
+                    ),
+                ),
+                ("document", utils.models.FullTextField(db_column="users_patient_fts")),
+                ("rank", models.FloatField()),
+            ],
+            options={
+                "db_table": "users_patient_fts",
+                "managed": False,
+            },
+        ),
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
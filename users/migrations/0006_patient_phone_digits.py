@@ -0,0 +1,54 @@
+# Generated by Django 4.2.7 on 2026-10-17 20:19
+
+from django.db import migrations, models
+
+
+def set_phone_digits(apps, schema_editor):
+    Patient = apps.get_model("users", "Patient")
+    patients = []
+    for patient in Patient.objects.only("phone_number").iterator():
+        patient.phone_digits = "".join(
+            char for char in patient.phone_number if char.isdigit()
+        )
+        patient.phone_digits_reversed = patient.phone_digits[::-1]
+        patients.append(patient)
+    Patient.objects.bulk_update(
+        patients, ["phone_digits", "phone_digits_reversed"], batch_size=1000
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("users", "0005_search_index"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="patient",
+            name="phone_digits",
+            field=models.CharField(default="", editable=False, max_length=10),
+        ),
+        migrations.AddField(
+            model_name="patient",
+            name="phone_digits_reversed",
+            field=models.CharField(default="", editable=False, max_length=10),
+        ),
+        migrations.RunPython(set_phone_digits, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name="patient",
+            index=models.Index(
+                condition=models.Q(("deleted_at__isnull", True)),
+                fields=["phone_digits"],
+                name="patient_phone_digits_live",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="patient",
+            index=models.Index(
+                condition=models.Q(("deleted_at__isnull", True)),
+                fields=["phone_digits_reversed"],
+                name="patient_phone_digits__0e00a9be",
+            ),
+        ),
+    ]
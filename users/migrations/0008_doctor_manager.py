@@ -0,0 +1,20 @@
+# Generated by Django 4.2.7 on 2026-10-17 20:56
+
+from django.db import migrations
+import users.models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("users", "0007_updated_at"),
+    ]
+
+    operations = [
+        migrations.AlterModelManagers(
+            name="doctor",
+            managers=[
+                ("objects", users.models.DoctorManager()),
+            ],
+        ),
+    ]
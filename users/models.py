@@ -1,14 +1,40 @@
+from collections import defaultdict
 from datetime import date
 
-from django.contrib.auth.models import AbstractUser
+from django.contrib.auth.models import AbstractUser, UserManager
+from django.core.validators import MaxValueValidator, MinValueValidator
 from django.db import models
 from django.urls import reverse
+from django.utils import timezone
 
-from utils.models import SoftDeleteModel
+from utils import fragments
+from utils.models import (
+    SOFT_DELETE_FIELDS,
+    FullTextField,
+    SoftDeleteManager,
+    SoftDeleteModel,
+    SoftDeleteQuerySet,
+)
+
+# Visit durations, minutes
+DEFAULT_VISIT_DURATION = 30
+MAX_VISIT_DURATION = 240
+
+VISIT_DURATION_VALIDATORS = (
+    MinValueValidator(1),
+    MaxValueValidator(MAX_VISIT_DURATION),
+)
 
 
 class Specialization(SoftDeleteModel):
     name = models.CharField(max_length=30)
+    visit_duration = models.PositiveSmallIntegerField(
+        default=DEFAULT_VISIT_DURATION,
+        validators=VISIT_DURATION_VALIDATORS,
+        help_text="Default duration of a visit, minutes",
+    )
+
+    live_index_fields = ("name",)
 
     class Meta:
         ordering = ("name",)
@@ -17,11 +43,45 @@ class Specialization(SoftDeleteModel):
         return self.name
 
 
+def future_visits(model, pks):
+    """
+    The future visits of the doctors or the patients of the pks.
+    The past ones stay in the history.
+    """
+    relation = model._meta.get_field("visits")
+    return relation.related_model.objects.filter(
+        **{f"{relation.field.name}__in": pks}
+    ).upcoming()
+
+
+class DoctorManager(UserManager, SoftDeleteManager):
+    """
+    The user manager over live doctors. As the default manager it also
+    backs the related managers, the prefetches and the logins.
+    """
+
+    def _create_user(self, username, email, password, **extra_fields):
+        # createsuperuser looks for a taken username with this manager,
+        # which skips the deleted doctors
+        self.model(
+            username=self.model.normalize_username(username)
+        ).validate_unique()
+        return super()._create_user(username, email, password, **extra_fields)
+
+
 class Doctor(AbstractUser, SoftDeleteModel):
     recertification_with = models.DateField(default=date.today)
     specializations = models.ManyToManyField(
         Specialization, related_name="doctors"
     )
+    # Names of the live specializations, kept by users.signals
+    specialization_labels = models.CharField(
+        max_length=255, blank=True, default="", editable=False
+    )
+
+    objects = DoctorManager()
+
+    live_index_fields = ("last_name",)
 
     class Meta:
         ordering = ("last_name",)
@@ -34,18 +94,183 @@ class Doctor(AbstractUser, SoftDeleteModel):
     def get_absolute_url(self):
         return reverse("user:doctor-detail", kwargs={"pk": self.pk})
 
+    @classmethod
+    def get_soft_delete_cascade(cls, pks):
+        return (future_visits(cls, pks),)
+
+
+def phone_digits(text):
+    return "".join(char for char in text if char.isdigit())
+
+
+def prefix_range(prefix):
+    """
+    Bounds of the strings starting with the prefix, for an index range
+    scan: LIKE 'prefix%' cannot use a plain index on SQLite.
+    """
+    return prefix, prefix[:-1] + chr(ord(prefix[-1]) + 1)
+
+
+class PatientQuerySet(SoftDeleteQuerySet):
+    def phone_startswith(self, digits):
+        """
+        Patients whose phone number starts with the digits,
+        in the order of the phone digits index.
+        """
+        low, high = prefix_range(digits)
+        return self.filter(
+            phone_digits__gte=low, phone_digits__lt=high
+        ).order_by("phone_digits")
+
+    def phone_endswith(self, digits):
+        """
+        Patients whose phone number ends with the digits,
+        in the order of the reversed phone digits index.
+        """
+        low, high = prefix_range(digits[::-1])
+        return self.filter(
+            phone_digits_reversed__gte=low, phone_digits_reversed__lt=high
+        ).order_by("phone_digits_reversed")
+
+
+class PatientManager(SoftDeleteManager.from_queryset(PatientQuerySet)):
+    pass
+
 
 class Patient(SoftDeleteModel):
     phone_number = models.CharField(max_length=10, unique=True)
+    # The digits of the phone number, as is and reversed,
+    # to look patients up by the start or the end of the number
+    phone_digits = models.CharField(max_length=10, default="", editable=False)
+    phone_digits_reversed = models.CharField(
+        max_length=10, default="", editable=False
+    )
     first_name = models.CharField(max_length=30)
     last_name = models.CharField(max_length=30)
     date_of_birth = models.DateField(default=date.today)
 
+    objects = PatientManager()
+    all_objects = PatientQuerySet.as_manager()
+
+    live_index_fields = ("last_name", "phone_digits", "phone_digits_reversed")
+
     class Meta:
         ordering = ("last_name",)
 
     def __str__(self):
         return f"{self.last_name} {self.first_name}"
 
+    def save(self, *args, **kwargs):
+        # Soft delete and restore leave the derived fields as they are
+        if kwargs.get("update_fields") != SOFT_DELETE_FIELDS:
+            self.set_derived_fields()
+        super().save(*args, **kwargs)
+
+    def set_derived_fields(self):
+        """
+        Normalize the phone number for the lookups.
+        Call it before `bulk_create()`, which bypasses `save()`.
+        """
+        self.phone_digits = phone_digits(self.phone_number)
+        self.phone_digits_reversed = self.phone_digits[::-1]
+
     def get_absolute_url(self):
         return reverse("user:patient-detail", kwargs={"pk": self.pk})
+
+    @classmethod
+    def get_soft_delete_cascade(cls, pks):
+        return (future_visits(cls, pks),)
+
+
+class PatientSearchEntry(models.Model):
+    """
+    A live patient in the FTS5 table of users.search, SQLite only.
+    """
+
+    patient = models.OneToOneField(
+        Patient,
+        primary_key=True,
+        db_column="rowid",
+        on_delete=models.DO_NOTHING,
+        related_name="search_entry",
+    )
+    document = FullTextField(db_column="users_patient_fts")
+    rank = models.FloatField()
+
+    class Meta:
+        managed = False
+        db_table = "users_patient_fts"
+
+
+class DoctorSearchEntry(models.Model):
+    """
+    A live doctor in the FTS5 table of users.search, SQLite only.
+    """
+
+    doctor = models.OneToOneField(
+        Doctor,
+        primary_key=True,
+        db_column="rowid",
+        on_delete=models.DO_NOTHING,
+        related_name="search_entry",
+    )
+    document = FullTextField(db_column="users_doctor_fts")
+    rank = models.FloatField()
+
+    class Meta:
+        managed = False
+        db_table = "users_doctor_fts"
+
+
+def build_specialization_labels(doctor_ids=None):
+    """
+    The labels of the doctors (all of them by default)
+    from their live specializations, in one query.
+    """
+    through = Doctor.specializations.through.objects.filter(
+        specialization__deleted_at__isnull=True
+    )
+    if doctor_ids is not None:
+        through = through.filter(doctor_id__in=doctor_ids)
+
+    rows = through.order_by("specialization__name").values_list(
+        "doctor_id", "specialization__name"
+    )
+    names = defaultdict(list)
+    for doctor_id, name in rows:
+        names[doctor_id].append(name)
+
+    return {
+        doctor_id: ", ".join(doctor_names)[:255]
+        for doctor_id, doctor_names in names.items()
+    }
+
+
+def refresh_specialization_labels(doctor_ids=None, batch_size=500):
+    """
+    Rewrite the labels of the doctors (all of them by default).
+    Doctors sharing a label are updated by a single statement.
+    Returns the number of updated doctors.
+    """
+    doctors = Doctor.all_objects.all()
+    if doctor_ids is not None:
+        doctors = doctors.filter(pk__in=doctor_ids)
+    labels = build_specialization_labels(doctor_ids)
+
+    by_label = defaultdict(list)
+    rows = doctors.values_list("pk", "specialization_labels")
+    for doctor_id, current in rows:
+        label = labels.get(doctor_id, "")
+        if label != current:
+            by_label[label].append(doctor_id)
+
+    updated = 0
+    for label, ids in by_label.items():
+        for start in range(0, len(ids), batch_size):
+            end = start + batch_size
+            updated += Doctor.all_objects.filter(pk__in=ids[start:end]).update(
+                specialization_labels=label, updated_at=timezone.now()
+            )
+        fragments.bump(Doctor, *ids)
+
+    return updated
@@ -0,0 +1,166 @@
+"""
+Search of patients and doctors by name, phone number, username or e-mail.
+
+Every word of the search line has to match the start of a word
+of the row. On SQLite the live rows are copied into FTS5 tables with
+prefix indexes, kept in sync by users.signals, and the matches are
+ranked with bm25. On PostgreSQL the columns have trigram indexes and
+the matches are ranked by word similarity. Other databases scan
+the table with `icontains`.
+
+`search_rank` is lower for better matches.
+"""
+
+import re
+from functools import reduce
+from operator import or_
+
+from django.db import connection
+from django.db.models import F, FloatField, Func, Q, Value
+from django.db.models.functions import Greatest
+
+from users.models import Doctor, Patient
+
+SEARCH_FIELDS = {
+    Patient: ("first_name", "last_name", "phone_number"),
+    Doctor: ("first_name", "last_name", "username", "email"),
+}
+SEARCH_TABLES = {
+    Patient: "users_patient_fts",
+    Doctor: "users_doctor_fts",
+}
+
+
+def split_words(text):
+    return re.findall(r"\w+", text.lower())
+
+
+def fts_query(words):
+    """
+    An FTS5 query matching rows with a word starting with every word.
+    """
+    return " ".join(f'"{word}"*' for word in words)
+
+
+def search(queryset, text):
+    """
+    The rows of the queryset matching the search line,
+    annotated with `search_rank`.
+    """
+    words = split_words(text)
+    if not words:
+        return queryset.annotate(search_rank=Value(0.0))
+
+    if connection.vendor == "sqlite":
+        return queryset.filter(
+            search_entry__document__match=fts_query(words)
+        ).annotate(search_rank=F("search_entry__rank"))
+
+    queryset = scan(queryset, words)
+    if connection.vendor != "postgresql":
+        return queryset.annotate(search_rank=Value(0.0))
+
+    fields = SEARCH_FIELDS[queryset.model]
+    similarity = Greatest(
+        *(
+            Func(
+                Value(" ".join(words)),
+                F(field),
+                function="word_similarity",
+                output_field=FloatField(),
+            )
+            for field in fields
+        )
+    )
+    return queryset.annotate(search_rank=-similarity)
+
+
+def scan(queryset, words):
+    """
+    Rows with every word in one of the fields, without the FTS5 index.
+    """
+    fields = SEARCH_FIELDS[queryset.model]
+    for word in words:
+        queryset = queryset.filter(
+            reduce(
+                or_, (Q(**{f"{field}__icontains": word}) for field in fields)
+            )
+        )
+
+    return queryset
+
+
+def index(instance):
+    """
+    Add, update or (for soft-deleted rows) remove the row in the index.
+    """
+    if connection.vendor != "sqlite":
+        return
+    if instance.deleted_at is not None:
+        return unindex(instance)
+
+    model = type(instance)
+    fields = SEARCH_FIELDS[model]
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"INSERT OR REPLACE INTO {SEARCH_TABLES[model]} "
+            f"(rowid, {', '.join(fields)}) "
+            f"VALUES (%s{', %s' * len(fields)})",
+            [instance.pk, *(getattr(instance, field) for field in fields)],
+        )
+
+
+def unindex(instance):
+    if connection.vendor != "sqlite":
+        return
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"DELETE FROM {SEARCH_TABLES[type(instance)]} WHERE rowid = %s",
+            [instance.pk],
+        )
+
+
+def rebuild(model):
+    """
+    Refill the index of the model from its live rows, in one statement.
+    Run it after bulk loads, which bypass the signals.
+    """
+    if connection.vendor != "sqlite":
+        return
+
+    table = SEARCH_TABLES[model]
+    columns = ", ".join(SEARCH_FIELDS[model])
+    with connection.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {table}")
+        cursor.execute(
+            f"INSERT INTO {table} (rowid, {columns}) "
+            f"SELECT id, {columns} FROM {model._meta.db_table} "
+            f"WHERE deleted_at IS NULL"
+        )
+
+
+def reindex(model, pks, batch_size=500):
+    """
+    Bring the index of the rows of the pks in line with the table.
+    Run it after bulk soft deletes and restores, which bypass post_save.
+    """
+    if connection.vendor != "sqlite":
+        return
+
+    table = SEARCH_TABLES[model]
+    columns = ", ".join(SEARCH_FIELDS[model])
+    with connection.cursor() as cursor:
+        for start in range(0, len(pks), batch_size):
+            end = start + batch_size
+            batch = pks[start:end]
+            placeholders = ", ".join(["%s"] * len(batch))
+            cursor.execute(
+                f"DELETE FROM {table} WHERE rowid IN ({placeholders})", batch
+            )
+            cursor.execute(
+                f"INSERT INTO {table} (rowid, {columns}) "
+                f"SELECT id, {columns} FROM {model._meta.db_table} "
+                f"WHERE deleted_at IS NULL AND id IN ({placeholders})",
+                batch,
+            )
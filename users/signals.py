@@ -0,0 +1,106 @@
+from django.db.models.signals import (
+    m2m_changed,
+    post_delete,
+    post_save,
+    pre_delete,
+)
+from django.dispatch import receiver
+from django.utils import timezone
+
+from users import autocomplete, search
+from users.models import (
+    Doctor,
+    Patient,
+    Specialization,
+    build_specialization_labels,
+    refresh_specialization_labels,
+)
+from utils import fragments
+from utils.signals import post_restore, post_soft_delete
+
+
+def doctor_ids_of(specialization):
+    # The deleted doctors keep their labels up to date too
+    return list(
+        Doctor.specializations.through.objects.filter(
+            specialization=specialization
+        ).values_list("doctor_id", flat=True)
+    )
+
+
+@receiver(m2m_changed, sender=Doctor.specializations.through)
+def update_labels_of_doctors(
+    sender, instance, action, reverse, pk_set, **kwargs
+):
+    if action == "pre_clear" and reverse:
+        # The doctors are no longer linked after the clear
+        instance._doctor_ids = doctor_ids_of(instance)
+    elif action == "post_clear" and reverse:
+        refresh_specialization_labels(instance.__dict__.pop("_doctor_ids"))
+    elif action in ("post_add", "post_remove") and reverse:
+        refresh_specialization_labels(pk_set)
+    elif action in ("post_add", "post_remove", "post_clear"):
+        # Keep the instance in sync too, it may be saved again
+        label = build_specialization_labels([instance.pk]).get(instance.pk, "")
+        instance.specialization_labels = label
+        instance.updated_at = timezone.now()
+        Doctor.all_objects.filter(pk=instance.pk).update(
+            specialization_labels=label, updated_at=instance.updated_at
+        )
+        fragments.bump(Doctor, instance.pk)
+
+
+@receiver(m2m_changed, sender=Doctor.specializations.through)
+def invalidate_doctor_pages(sender, action, **kwargs):
+    if action.startswith("post_"):
+        autocomplete.invalidate(Doctor)
+
+
+@receiver(post_save, sender=Specialization)
+def update_labels_on_rename(sender, instance, created, raw=False, **kwargs):
+    # A renamed or (soft) deleted specialization changes the labels
+    if not created and not raw:
+        refresh_specialization_labels(doctor_ids_of(instance))
+
+
+@receiver([post_soft_delete, post_restore], sender=Specialization)
+def update_labels_in_bulk(sender, pks, **kwargs):
+    refresh_specialization_labels(
+        Doctor.specializations.through.objects.filter(
+            specialization_id__in=pks
+        ).values_list("doctor_id", flat=True)
+    )
+
+
+@receiver(pre_delete, sender=Specialization)
+def remember_doctors(sender, instance, **kwargs):
+    instance._doctor_ids = doctor_ids_of(instance)
+
+
+@receiver(post_delete, sender=Specialization)
+def update_labels_on_delete(sender, instance, **kwargs):
+    refresh_specialization_labels(instance.__dict__.pop("_doctor_ids", []))
+
+
+@receiver(post_save, sender=Patient)
+@receiver(post_save, sender=Doctor)
+def update_search_index(sender, instance, update_fields=None, **kwargs):
+    # Logging in only updates last_login
+    if update_fields is not None and set(update_fields) == {"last_login"}:
+        return
+    search.index(instance)
+    autocomplete.invalidate(sender)
+
+
+@receiver(post_delete, sender=Patient)
+@receiver(post_delete, sender=Doctor)
+def remove_from_search_index(sender, instance, **kwargs):
+    search.unindex(instance)
+    autocomplete.invalidate(sender)
+
+
+@receiver([post_soft_delete, post_restore], sender=Patient)
+@receiver([post_soft_delete, post_restore], sender=Doctor)
+def reindex_in_bulk(sender, pks, **kwargs):
+    search.reindex(sender, pks)
+    autocomplete.invalidate(sender)
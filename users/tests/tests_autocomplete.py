@@ -0,0 +1,110 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+
+from users import autocomplete
+from users.models import Patient, Specialization
+
+PATIENT_AUTOCOMPLETE_URL = reverse("user:patient-autocomplete")
+DOCTOR_AUTOCOMPLETE_URL = reverse("user:doctor-autocomplete")
+
+
+class AutocompleteViewTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = get_user_model().objects.create_user(
+            username="DocUsername",
+            first_name="Firstname",
+            last_name="Admin",
+            password="DocPassword123",
+            is_staff=True,
+        )
+        self.client.force_login(self.user)
+
+        for num in range(autocomplete.PAGE_SIZE + 5):
+            Patient.objects.create(
+                phone_number=f"01234567{num:02d}",
+                first_name=f"Firstname{num}",
+                last_name=f"Lastname{num:02d}",
+                date_of_birth="2000-01-02",
+            )
+
+        self.surgery = Specialization.objects.create(name="Surgery")
+        self.therapy = Specialization.objects.create(name="Therapy")
+        self.surgeon = get_user_model().objects.create_user(
+            username="Surgeon",
+            first_name="John",
+            last_name="Cutter",
+            password="DocPassword123",
+        )
+        self.surgeon.specializations.add(self.surgery)
+        self.therapist = get_user_model().objects.create_user(
+            username="Therapist",
+            first_name="Jane",
+            last_name="Healer",
+            password="DocPassword123",
+        )
+        self.therapist.specializations.add(self.therapy)
+
+    def get(self, url, **params):
+        response = self.client.get(url, params)
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def test_login_required(self):
+        self.client.logout()
+        response = self.client.get(PATIENT_AUTOCOMPLETE_URL)
+        self.assertEqual(response.status_code, 302)
+
+    def test_patients_are_paginated(self):
+        first = self.get(PATIENT_AUTOCOMPLETE_URL)
+        self.assertEqual(len(first["results"]), autocomplete.PAGE_SIZE)
+        self.assertTrue(first["more"])
+        self.assertEqual(first["results"][0]["text"], "Lastname00 Firstname0")
+
+        second = self.get(PATIENT_AUTOCOMPLETE_URL, page=2)
+        self.assertEqual(len(second["results"]), 5)
+        self.assertFalse(second["more"])
+
+    def test_patients_are_searched(self):
+        data = self.get(PATIENT_AUTOCOMPLETE_URL, term="firstname3")
+        self.assertEqual(data["results"][0]["text"], "Lastname03 Firstname3")
+
+    def test_doctors_are_filtered_by_specialization(self):
+        data = self.get(
+            DOCTOR_AUTOCOMPLETE_URL, specialization=self.surgery.id
+        )
+        self.assertEqual(
+            [result["id"] for result in data["results"]], [self.surgeon.id]
+        )
+
+        data = self.get(DOCTOR_AUTOCOMPLETE_URL)
+        self.assertEqual(len(data["results"]), 2)
+
+    def test_invalid_page(self):
+        response = self.client.get(PATIENT_AUTOCOMPLETE_URL, {"page": 0})
+        self.assertEqual(response.status_code, 400)
+
+    def test_pages_are_cached_until_a_change(self):
+        autocomplete.patient_page("last")
+        with self.assertNumQueries(0):
+            autocomplete.patient_page("last")
+
+        Patient.objects.create(
+            phone_number="0987654321",
+            first_name="New",
+            last_name="Lastnew",
+            date_of_birth="2000-01-02",
+        )
+        texts = [
+            result["text"]
+            for result in autocomplete.patient_page("lastnew")["results"]
+        ]
+        self.assertEqual(texts, ["Lastnew New"])
+
+    def test_doctor_pages_follow_specializations(self):
+        autocomplete.doctor_page(specialization_id=self.surgery.id)
+        self.therapist.specializations.add(self.surgery)
+        data = autocomplete.doctor_page(specialization_id=self.surgery.id)
+        self.assertEqual(len(data["results"]), 2)
@@ -0,0 +1,56 @@
+import csv
+import io
+import tempfile
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+
+from users.models import Patient
+
+PATIENT_EXPORT_URL = reverse("user:patient-export")
+
+
+class PatientExportTest(TestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            username="DocUsername", password="DocPassword123"
+        )
+        self.client.force_login(self.user)
+        for number in range(3):
+            Patient.objects.create(
+                first_name=f"Ivan{number}",
+                last_name=f"Petrenko{number}",
+                phone_number=f"067123456{number}",
+            )
+
+    def test_csv(self):
+        response = self.client.get(PATIENT_EXPORT_URL)
+
+        self.assertTrue(response.streaming)
+        self.assertIn(
+            'filename="patients.csv"', response["Content-Disposition"]
+        )
+        content = b"".join(response.streaming_content).decode()
+        rows = list(csv.DictReader(io.StringIO(content)))
+        self.assertEqual(
+            [row["phone_number"] for row in rows],
+            ["0671234560", "0671234561", "0671234562"],
+        )
+
+    def test_unknown_format(self):
+        response = self.client.get(PATIENT_EXPORT_URL, {"format": "xml"})
+        self.assertEqual(response.status_code, 400)
+
+    def test_command_output_file(self):
+        Patient.objects.get(phone_number="0671234561").delete()
+        with tempfile.TemporaryDirectory() as directory:
+            path = f"{directory}/patients.jsonl"
+            call_command(
+                "export_patients", "--format=jsonl", f"--output={path}"
+            )
+            with open(path, encoding="utf-8") as stream:
+                lines = stream.read().splitlines()
+
+        self.assertEqual(len(lines), 2)
@@ -1,9 +1,13 @@
 from datetime import date
 
+from io import StringIO
+
 from django.contrib.auth import get_user_model
+from django.core.management import call_command
 from django.test import TestCase
 
-from users.models import Specialization, Patient
+from users.models import Doctor, Specialization, Patient
+from utils.checks import LOCAL_CACHE_WARNING
 
 
 class SpecializationModelTests(TestCase):
@@ -77,6 +81,66 @@ class DoctorModelTests(TestCase):
         self.assertEqual(doctor.get_absolute_url(), "/users/doctors/1/")
 
 
+class DoctorSpecializationLabelsTests(TestCase):
+    def setUp(self):
+        self.doctor = get_user_model().objects.create_user(
+            username="DocUsername", password="DocPassword123"
+        )
+        self.surgery = Specialization.objects.create(name="Surgery")
+        self.therapy = Specialization.objects.create(name="Therapy")
+
+    def assert_labels(self, labels):
+        self.assertEqual(self.doctor.specialization_labels, labels)
+        self.doctor.refresh_from_db()
+        self.assertEqual(self.doctor.specialization_labels, labels)
+
+    def test_labels_follow_the_specializations(self):
+        self.doctor.specializations.add(self.therapy, self.surgery)
+        self.assert_labels("Surgery, Therapy")
+
+        self.doctor.specializations.remove(self.surgery)
+        self.assert_labels("Therapy")
+
+        self.doctor.specializations.clear()
+        self.assert_labels("")
+
+    def test_labels_follow_the_doctors_of_a_specialization(self):
+        self.surgery.doctors.add(self.doctor)
+        self.doctor.refresh_from_db()
+        self.assert_labels("Surgery")
+
+        self.surgery.doctors.clear()
+        self.doctor.refresh_from_db()
+        self.assert_labels("")
+
+    def test_labels_follow_renamed_and_deleted_specializations(self):
+        self.doctor.specializations.add(self.surgery, self.therapy)
+
+        self.surgery.name = "Cardiology"
+        self.surgery.save()
+        self.doctor.refresh_from_db()
+        self.assert_labels("Cardiology, Therapy")
+
+        self.surgery.delete()
+        self.doctor.refresh_from_db()
+        self.assert_labels("Therapy")
+
+        self.therapy.hard_delete()
+        self.doctor.refresh_from_db()
+        self.assert_labels("")
+
+    def test_rebuild_command_repairs_labels(self):
+        self.doctor.specializations.add(self.surgery)
+        Doctor.objects.update(specialization_labels="Stale")
+
+        out, err = StringIO(), StringIO()
+        call_command("rebuild_specialization_labels", stdout=out, stderr=err)
+        self.assertIn("1 doctor", out.getvalue())
+        self.assertIn(LOCAL_CACHE_WARNING, err.getvalue())
+        self.doctor.refresh_from_db()
+        self.assert_labels("Surgery")
+
+
 class PatientModelTests(TestCase):
     def setUp(self):
         self.phone_number = "9876543210"
@@ -139,3 +203,21 @@ class PatientModelTests(TestCase):
     def test_get_absolute_url_patient(self):
         patient = Patient.objects.get(id=1)
         self.assertEqual(patient.get_absolute_url(), "/users/patients/1/")
+
+    def test_phone_digits_are_normalized(self):
+        patient = Patient.objects.create(
+            phone_number="(050)12-34", first_name="A", last_name="B"
+        )
+        patient.refresh_from_db()
+        self.assertEqual(patient.phone_digits, "0501234")
+        self.assertEqual(patient.phone_digits_reversed, "4321050")
+
+    def test_backfill_phone_digits_command(self):
+        Patient.objects.update(phone_digits="", phone_digits_reversed="")
+
+        out = StringIO()
+        call_command("backfill_phone_digits", stdout=out)
+        self.assertIn("1 patient", out.getvalue())
+        patient = Patient.objects.get(id=1)
+        self.assertEqual(patient.phone_digits, self.phone_number)
+        self.assertEqual(patient.phone_digits_reversed, "0123456789")
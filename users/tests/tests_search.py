@@ -0,0 +1,130 @@
+from io import StringIO
+from unittest import skipUnless
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.urls import reverse
+
+from users.models import Doctor, Patient
+from users.search import search
+from utils.checks import LOCAL_CACHE_WARNING
+
+PATIENT_LIST_URL = reverse("user:patient-list")
+
+
+class SearchTest(TestCase):
+    def setUp(self):
+        self.smith = Patient.objects.create(
+            phone_number="0501112233",
+            first_name="John",
+            last_name="Smith",
+            date_of_birth="2000-01-02",
+        )
+        self.smithson = Patient.objects.create(
+            phone_number="0671112233",
+            first_name="Anna",
+            last_name="Smithson",
+            date_of_birth="2000-01-02",
+        )
+        self.doctor = get_user_model().objects.create_user(
+            username="o_bogdanov",
+            email="oleg.bogdanov@ukr.net",
+            first_name="Oleg",
+            last_name="Bogdanov",
+            password="DocPassword123",
+        )
+
+    def assert_found(self, model, text, expected):
+        found = search(model.objects.all(), text).order_by("search_rank", "id")
+        self.assertEqual(list(found), expected)
+
+    def test_search_by_prefix_of_any_field(self):
+        self.assert_found(Patient, "smi", [self.smith, self.smithson])
+        self.assert_found(Patient, "an", [self.smithson])
+        self.assert_found(Patient, "067", [self.smithson])
+        self.assert_found(Patient, "Bogdanov", [])
+
+    def test_every_word_must_match(self):
+        self.assert_found(Patient, "smi jo", [self.smith])
+        self.assert_found(Patient, "smith 067", [self.smithson])
+
+    def test_search_doctors_by_username_and_email(self):
+        self.assert_found(Doctor, "o_bog", [self.doctor])
+        self.assert_found(Doctor, "oleg.bogdanov@ukr", [self.doctor])
+
+    def test_index_follows_changes(self):
+        self.smith.last_name = "Johnson"
+        self.smith.save()
+        self.assert_found(Patient, "smi", [self.smithson])
+        self.assert_found(Patient, "johnson", [self.smith])
+
+        self.smithson.delete()
+        self.assert_found(Patient, "smi", [])
+        self.smithson.restore()
+        self.assert_found(Patient, "smi", [self.smithson])
+
+        self.smithson.hard_delete()
+        self.assert_found(Patient, "smi", [])
+
+    def test_no_words_finds_everything(self):
+        self.assertEqual(search(Patient.objects.all(), "?!").count(), 2)
+
+    @skipUnless(connection.vendor == "sqlite", "FTS5 tables of SQLite")
+    def test_rebuild_command(self):
+        Patient.objects.bulk_create(
+            [
+                Patient(
+                    phone_number="0931112233",
+                    first_name="Bulk",
+                    last_name="Loaded",
+                    date_of_birth="2000-01-02",
+                )
+            ]
+        )
+        self.assert_found(Patient, "loaded", [])
+        out, err = StringIO(), StringIO()
+        call_command("rebuild_search_index", stdout=out, stderr=err)
+        self.assertIn("Rebuilt the index of Patient", out.getvalue())
+        self.assertIn(LOCAL_CACHE_WARNING, err.getvalue())
+        self.assertEqual(
+            search(Patient.objects.all(), "loaded").get().first_name, "Bulk"
+        )
+
+    @skipUnless(connection.vendor == "sqlite", "FTS5 tables of SQLite")
+    def test_search_uses_the_index(self):
+        plan = search(Patient.objects.all(), "smi").explain()
+        self.assertIn("SCAN users_patient_fts VIRTUAL TABLE", plan)
+        self.assertIn("SEARCH users_patient USING INTEGER PRIMARY KEY", plan)
+
+
+class SearchViewTest(TestCase):
+    def setUp(self):
+        user = get_user_model().objects.create_user(
+            username="DocUsername", password="DocPassword123"
+        )
+        self.client.force_login(user)
+        for num in range(7):
+            Patient.objects.create(
+                phone_number=f"050111223{num}",
+                first_name=f"Firstname{num}",
+                last_name="Smith" if num % 2 else f"Smith Jr{num}",
+                date_of_birth="2000-01-02",
+            )
+
+    def test_search_results_page_by_cursor(self):
+        found = []
+        params = {"last_name": "smith"}
+        while True:
+            response = self.client.get(PATIENT_LIST_URL, params)
+            found += response.context["patient_list"]
+            page_obj = response.context["page_obj"]
+            if not page_obj.has_next():
+                break
+            params["cursor"] = page_obj.next_cursor
+
+        self.assertEqual(len(found), 7)
+        self.assertEqual(len(set(found)), 7)
+        ranks = [patient.search_rank for patient in found]
+        self.assertEqual(ranks, sorted(ranks))
@@ -1,8 +1,14 @@
+from datetime import datetime, timedelta
+from io import StringIO
+
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import CommandError, call_command
 from django.test import TestCase
 from django.urls import reverse, reverse_lazy
 
-from users.models import Specialization
+from reception.models import Visit
+from users.models import Patient, Specialization
 
 DOCTOR_LIST_URL = reverse("user:doctor-list")
 DOCTOR_CREATE_URL = reverse("user:doctor-create")
@@ -79,6 +85,98 @@ class PrivateDoctorListViewTest(TestCase):
             "Lastname2 Firstname2" in str(response.context["doctor_list"][0])
         )
 
+    def test_doctor_list_renders_specializations_without_a_join(self):
+        surgery = Specialization.objects.create(name="Surgery")
+        for doctor in get_user_model().objects.all():
+            doctor.specializations.add(surgery)
+        cache.clear()
+        # Session, user, the page of doctors and the total
+        with self.assertNumQueries(4):
+            response = self.client.get(DOCTOR_LIST_URL)
+        self.assertContains(response, "Surgery", count=3)
+
+
+class PrivateDoctorDetailViewTest(TestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            username="DocUsername",
+            first_name="Firstname",
+            last_name="Lastname",
+            password="DocPassword123",
+        )
+        self.client.force_login(self.user)
+        self.user.specializations.add(
+            Specialization.objects.create(name="Therapist")
+        )
+
+        self.patient = Patient.objects.create(
+            phone_number="0123456789",
+            first_name="Firstname",
+            last_name="Patient",
+            date_of_birth="2000-01-02",
+        )
+        self.url = reverse("user:doctor-detail", args=[self.user.id])
+        self.today = datetime.now().replace(microsecond=0)
+
+    def create_visit(self, days, patient=None):
+        return Visit.objects.create(
+            date_time=self.today + timedelta(days=days),
+            doctor=self.user,
+            patient=patient or self.patient,
+        )
+
+    def test_next_visit_is_the_nearest_upcoming(self):
+        self.create_visit(-1)
+        self.create_visit(5)
+        nearest = self.create_visit(2)
+
+        response = self.client.get(self.url)
+        self.assertEqual(response.context["next_visit"], nearest)
+        self.assertContains(response, str(self.patient))
+
+    def test_next_visit_skips_deleted_visits_and_patients(self):
+        deleted_patient = Patient.objects.create(
+            phone_number="0123456780",
+            first_name="Firstname",
+            last_name="Deleted",
+            date_of_birth="2000-01-02",
+        )
+        self.create_visit(1, patient=deleted_patient)
+        deleted_patient.delete()
+        self.create_visit(2).delete()
+        visit = self.create_visit(3)
+
+        response = self.client.get(self.url)
+        self.assertEqual(response.context["next_visit"], visit)
+
+    def test_next_visit_skips_hard_deleted_patients(self):
+        removed_patient = Patient.objects.create(
+            phone_number="0123456780",
+            first_name="Firstname",
+            last_name="Removed",
+            date_of_birth="2000-01-02",
+        )
+        self.create_visit(1, patient=removed_patient)
+        removed_patient.hard_delete()
+        visit = self.create_visit(3)
+
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context["next_visit"], visit)
+
+    def test_no_next_visit(self):
+        self.create_visit(-1)
+        response = self.client.get(self.url)
+        self.assertIsNone(response.context["next_visit"])
+        self.assertNotContains(response, "Nearest visit")
+
+    def test_doctor_detail_query_count(self):
+        for days in range(1, 11):
+            self.create_visit(days)
+        # Session, user, validators, doctor and the nearest visit
+        with self.assertNumQueries(5):
+            self.client.get(self.url)
+
 
 class PrivateDoctorCreateViewTest(TestCase):
     def setUp(self) -> None:
@@ -128,6 +226,78 @@ class PrivateDoctorCreateViewTest(TestCase):
             response, reverse_lazy("user:doctor-list"), status_code=302
         )
 
+    def test_username_of_a_deleted_doctor_is_taken(self):
+        self.client.post(DOCTOR_CREATE_URL, data=self.data)
+        get_user_model().objects.get(username="DocUsername").delete()
+
+        response = self.client.post(
+            DOCTOR_CREATE_URL, data={**self.data, "username": "docusername"}
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertFormError(
+            response.context["form"],
+            "username",
+            "A user with that username already exists.",
+        )
+        self.assertEqual(get_user_model().all_objects.count(), 2)
+
+
+class DoctorAdminTest(TestCase):
+    def setUp(self):
+        self.admin = get_user_model().objects.create_superuser(
+            username="AdminUsername", password="AdminPassword123"
+        )
+        self.client.force_login(self.admin)
+        self.doctor = get_user_model().objects.create_user(
+            username="DocUsername", password="DocPassword123"
+        )
+        self.doctor.delete()
+        self.url = reverse("admin:users_doctor_changelist")
+
+    def test_deleted_doctors_are_listed(self):
+        response = self.client.get(self.url)
+        self.assertContains(response, "DocUsername")
+
+    def test_restore_selected(self):
+        response = self.client.post(
+            self.url,
+            {
+                "action": "restore_selected",
+                "_selected_action": [self.doctor.pk],
+            },
+        )
+        self.assertEqual(response.status_code, 302)
+        self.doctor.refresh_from_db()
+        self.assertIsNone(self.doctor.deleted_at)
+
+    def test_change_form_keeps_deleted_usernames_taken(self):
+        response = self.client.post(
+            reverse("admin:users_doctor_change", args=[self.admin.pk]),
+            {
+                "username": "DocUsername",
+                "date_joined_0": "2024-01-01",
+                "date_joined_1": "09:00:00",
+                "recertification_with": "2024-01-01",
+            },
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, "A user with that username")
+        self.admin.refresh_from_db()
+        self.assertEqual(self.admin.username, "AdminUsername")
+
+    def test_createsuperuser_keeps_deleted_usernames_taken(self):
+        with self.assertRaisesMessage(
+            CommandError, "A user with that username already exists."
+        ):
+            call_command(
+                "createsuperuser",
+                username="DocUsername",
+                email="doc@example.com",
+                interactive=False,
+                stdout=StringIO(),
+            )
+
 
 class PrivatePatientUpdateViewTest(TestCase):
     def setUp(self) -> None:
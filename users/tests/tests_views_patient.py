@@ -1,11 +1,16 @@
+from datetime import datetime, timedelta
+
 from django.contrib.auth import get_user_model
 from django.test import TestCase
 from django.urls import reverse, reverse_lazy
 
+from reception.archive import archive_visits
+from reception.models import Visit
 from users.models import Patient
 
 PATIENT_LIST_URL = reverse("user:patient-list")
 PATIENT_CREATE_URL = reverse("user:patient-create")
+PHONE_LOOKUP_URL = reverse("user:patient-phone-lookup")
 
 
 class PublicPatientListViewTest(TestCase):
@@ -78,6 +83,165 @@ class PrivatePatientListViewTest(TestCase):
             "Lastname5 Firstname5" in str(response.context["patient_list"][0])
         )
 
+    def test_patient_list_cursor_pagination(self):
+        response = self.client.get(PATIENT_LIST_URL)
+        page_obj = response.context["page_obj"]
+        self.assertTrue(response.context["paginator"].is_keyset)
+        self.assertContains(response, f"cursor={page_obj.next_cursor}")
+
+        response = self.client.get(
+            PATIENT_LIST_URL, {"cursor": page_obj.next_cursor}
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            [str(patient) for patient in response.context["patient_list"]],
+            ["Lastname5 Firstname5"],
+        )
+        self.assertFalse(response.context["page_obj"].has_next())
+
+    def test_patient_list_invalid_cursor(self):
+        response = self.client.get(PATIENT_LIST_URL, {"cursor": "invalid"})
+        self.assertEqual(response.status_code, 404)
+
+
+class PrivatePatientDetailViewTest(TestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            username="DocUsername",
+            first_name="Firstname",
+            last_name="Lastname",
+            password="DocPassword123",
+        )
+        self.client.force_login(self.user)
+
+        self.patient = Patient.objects.create(
+            phone_number="0123456789",
+            first_name="Firstname",
+            last_name="Lastname",
+            date_of_birth="2000-01-02",
+        )
+        self.url = reverse("user:patient-detail", args=[self.patient.id])
+        self.today = datetime.now().replace(microsecond=0)
+
+    def create_visit(self, days, doctor=None):
+        return Visit.objects.create(
+            date_time=self.today + timedelta(days=days),
+            doctor=doctor or self.user,
+            patient=self.patient,
+        )
+
+    def test_next_visit_is_the_nearest_upcoming(self):
+        self.create_visit(-1)
+        self.create_visit(5)
+        nearest = self.create_visit(2)
+
+        response = self.client.get(self.url)
+        self.assertEqual(response.context["next_visit"], nearest)
+        self.assertContains(response, str(self.user))
+
+    def test_next_visit_skips_deleted_doctors(self):
+        deleted_doctor = get_user_model().objects.create_user(
+            username="Deleted", password="DocPassword123"
+        )
+        self.create_visit(1, doctor=deleted_doctor)
+        deleted_doctor.delete()
+        visit = self.create_visit(3)
+
+        response = self.client.get(self.url)
+        self.assertEqual(response.context["next_visit"], visit)
+
+    def test_next_visit_skips_hard_deleted_doctors(self):
+        removed_doctor = get_user_model().objects.create_user(
+            username="Removed", password="DocPassword123"
+        )
+        self.create_visit(1, doctor=removed_doctor)
+        removed_doctor.hard_delete()
+        visit = self.create_visit(3)
+
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context["next_visit"], visit)
+
+    def test_no_next_visit(self):
+        self.create_visit(-1)
+        response = self.client.get(self.url)
+        self.assertIsNone(response.context["next_visit"])
+        self.assertNotContains(response, "Nearest visit")
+
+    def test_patient_detail_query_count(self):
+        for days in range(-10, 11):
+            self.create_visit(days)
+        # Session, user, validators, patient, its nearest visit
+        # with the doctor and its history
+        with self.assertNumQueries(6):
+            self.client.get(self.url)
+
+    def test_history_includes_archived_visits(self):
+        archived = self.create_visit(-400)
+        recent = self.create_visit(-1)
+        self.create_visit(1)
+        archive_visits()
+
+        response = self.client.get(self.url)
+        self.assertEqual(
+            [visit["id"] for visit in response.context["history"]],
+            [recent.id, archived.id],
+        )
+        self.assertContains(response, "Visit history")
+
+
+class PatientPhoneLookupViewTest(TestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            username="DocUsername", password="DocPassword123"
+        )
+        self.client.force_login(self.user)
+
+        for phone_number in (
+            "0501234567",
+            "0509994567",
+            "0671110501",
+            "0934567050",
+        ):
+            Patient.objects.create(
+                phone_number=phone_number,
+                first_name="Firstname",
+                last_name="Lastname",
+                date_of_birth="2000-01-02",
+            )
+
+    def lookup(self, phone):
+        response = self.client.get(PHONE_LOOKUP_URL, {"phone": phone})
+        self.assertEqual(response.status_code, 200)
+        return [
+            patient["phone_number"] for patient in response.json()["patients"]
+        ]
+
+    def test_login_required(self):
+        self.client.logout()
+        response = self.client.get(PHONE_LOOKUP_URL, {"phone": "050"})
+        self.assertEqual(response.status_code, 302)
+
+    def test_lookup_by_prefix(self):
+        self.assertEqual(self.lookup("050 99"), ["0509994567"])
+
+    def test_lookup_by_last_digits(self):
+        self.assertEqual(self.lookup("4567"), ["0501234567", "0509994567"])
+
+    def test_numbers_starting_with_the_digits_come_first(self):
+        self.assertEqual(
+            self.lookup("050"), ["0501234567", "0509994567", "0934567050"]
+        )
+
+    def test_deleted_patients_are_not_found(self):
+        Patient.objects.get(phone_number="0671110501").delete()
+        self.assertEqual(self.lookup("067"), [])
+
+    def test_too_few_digits(self):
+        response = self.client.get(PHONE_LOOKUP_URL, {"phone": "0-5"})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("phone", response.json()["errors"])
+
 
 class PrivatePatientCreateViewTest(TestCase):
     def setUp(self) -> None:
@@ -6,6 +6,10 @@ from .views import (
     PatientCreateView,
     PatientUpdateView,
     PatientDeleteView,
+    patient_phone_lookup,
+    patient_autocomplete,
+    export_patients,
+    doctor_autocomplete,
     DoctorListView,
     DoctorDetailView,
     DoctorCreateView,
@@ -17,6 +21,10 @@ app_name = "user"
 
 urlpatterns = [
     path("patients/", PatientListView.as_view(), name="patient-list"),
+    path(
+        "patients/lookup/", patient_phone_lookup, name="patient-phone-lookup"
+    ),
+    path("patients/export/", export_patients, name="patient-export"),
     path(
         "patients/<int:pk>/",
         PatientDetailView.as_view(),
@@ -35,7 +43,17 @@ urlpatterns = [
         PatientDeleteView.as_view(),
         name="patient-delete",
     ),
+    path(
+        "patients/autocomplete/",
+        patient_autocomplete,
+        name="patient-autocomplete",
+    ),
     path("doctors/", DoctorListView.as_view(), name="doctor-list"),
+    path(
+        "doctors/autocomplete/",
+        doctor_autocomplete,
+        name="doctor-autocomplete",
+    ),
     path(
         "doctors/<int:pk>/", DoctorDetailView.as_view(), name="doctor-detail"
     ),
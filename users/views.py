@@ -1,14 +1,55 @@
+from datetime import datetime
+
+from django.contrib.auth.decorators import login_required
 from django.contrib.auth.mixins import LoginRequiredMixin
+from django.db.models import OuterRef, Prefetch, Subquery
+from django.http import JsonResponse
 from django.urls import reverse_lazy
 from django.views import generic
 
-from users.forms import UserSearchForm, DoctorForm, PatientForm
-from users.models import Doctor, Patient
+from reception.archive import patient_history
+from reception.models import Visit, VisitArchive
+from users import autocomplete
+from users.exports import PATIENT_COLUMNS, patients_to_export
+from users.forms import (
+    AutocompleteForm,
+    UserSearchForm,
+    DoctorAutocompleteForm,
+    DoctorForm,
+    PatientForm,
+    PhoneLookupForm,
+)
+from users.models import Doctor, Patient, Specialization
+from users.search import search
+from utils.conditional import ConditionalGetMixin
+from utils.exports import FORMAT_ERRORS, export_response, requested_format
+from utils.pagination import KeysetPaginationMixin
+
+PHONE_LOOKUP_LIMIT = 10
+
 
+def first_upcoming_visit(relation):
+    """
+    The next visit of a detail page changes as the time goes by
+    without a write. The first visit to start of the object (in any
+    state) follows it: every visit is that one when it starts.
+    """
+    return Subquery(
+        Visit.objects.upcoming()
+        .filter(**{relation: OuterRef("pk")})
+        .values("pk")[:1]
+    )
 
-class PatientListView(LoginRequiredMixin, generic.ListView):
+
+class PatientListView(
+    LoginRequiredMixin,
+    ConditionalGetMixin,
+    KeysetPaginationMixin,
+    generic.ListView,
+):
     model = Patient
     paginate_by = 5
+    keyset_ordering = ("last_name", "id")
 
     def get_context_data(self, *, object_list=None, **kwargs):
         context = super(PatientListView, self).get_context_data(**kwargs)
@@ -19,19 +60,117 @@ class PatientListView(LoginRequiredMixin, generic.ListView):
         return context
 
     def get_queryset(self):
-        queryset = Patient.objects.filter(deleted_at__isnull=True)
+        queryset = Patient.objects.all()
         form = UserSearchForm(self.request.GET)
-        if form.is_valid():
-            return queryset.filter(
-                last_name__icontains=form.cleaned_data["last_name"]
+        if form.is_valid() and form.cleaned_data["last_name"]:
+            # Best matches first
+            self.keyset_ordering = ("search_rank", "id")
+            return search(queryset, form.cleaned_data["last_name"]).order_by(
+                *self.keyset_ordering
             )
 
         return queryset
 
 
-class PatientDetailView(LoginRequiredMixin, generic.DetailView):
+class PatientDetailView(
+    LoginRequiredMixin, ConditionalGetMixin, generic.DetailView
+):
     model = Patient
-    queryset = Patient.objects.filter(deleted_at__isnull=True)
+    # The patient, its next visit and its history
+    validator_models = (Patient, Visit, Doctor, Specialization, VisitArchive)
+    validator_fields = ("pk", "first_upcoming_visit")
+    send_last_modified = False
+
+    def get_validator_queryset(self):
+        return (
+            super()
+            .get_validator_queryset()
+            .annotate(first_upcoming_visit=first_upcoming_visit("patient"))
+        )
+
+    def get_queryset(self):
+        next_visit = (
+            Visit.objects.upcoming()
+            .filter(doctor_active=True, doctor__isnull=False)
+            .select_related("doctor")
+        )
+        return Patient.objects.prefetch_related(
+            Prefetch("visits", next_visit[:1], to_attr="upcoming_visits")
+        )
+
+    def get_context_data(self, **kwargs):
+        context = super(PatientDetailView, self).get_context_data(**kwargs)
+        context["next_visit"] = next(iter(self.object.upcoming_visits), None)
+        context["history"] = patient_history(self.object)
+        return context
+
+
+@login_required
+def patient_phone_lookup(request):
+    """
+    Live patients whose phone number starts or ends with the typed
+    digits, as JSON. Numbers starting with them come first.
+    Every query is a range scan of a phone digits index.
+    """
+    form = PhoneLookupForm(request.GET)
+    if not form.is_valid():
+        return JsonResponse({"errors": form.errors}, status=400)
+
+    digits = form.cleaned_data["phone"]
+    patients = list(
+        Patient.objects.phone_startswith(digits)[:PHONE_LOOKUP_LIMIT]
+    )
+    limit = PHONE_LOOKUP_LIMIT - len(patients)
+    if limit:
+        patients += Patient.objects.phone_endswith(digits).exclude(
+            pk__in=[patient.pk for patient in patients]
+        )[:limit]
+
+    return JsonResponse(
+        {
+            "patients": [
+                {
+                    "id": patient.id,
+                    "name": str(patient),
+                    "phone_number": patient.phone_number,
+                    "date_of_birth": patient.date_of_birth,
+                    "url": patient.get_absolute_url(),
+                }
+                for patient in patients
+            ]
+        }
+    )
+
+
+@login_required
+def patient_autocomplete(request):
+    """
+    A page of patients matching `term`, for the autocomplete selects.
+    """
+    form = AutocompleteForm(request.GET)
+    if not form.is_valid():
+        return JsonResponse({"errors": form.errors}, status=400)
+
+    return JsonResponse(
+        autocomplete.patient_page(
+            form.cleaned_data["term"], form.cleaned_data["page"]
+        )
+    )
+
+
+@login_required
+def export_patients(request):
+    """
+    The live patients as a CSV (default) or JSON Lines download,
+    streamed as they are read.
+    """
+    file_format = requested_format(request)
+    if file_format is None:
+        return JsonResponse({"errors": FORMAT_ERRORS}, status=400)
+
+    return export_response(
+        patients_to_export(), PATIENT_COLUMNS, file_format, "patients"
+    )
 
 
 class PatientCreateView(LoginRequiredMixin, generic.CreateView):
@@ -51,9 +190,15 @@ class PatientDeleteView(LoginRequiredMixin, generic.DeleteView):
     success_url = reverse_lazy("user:patient-list")
 
 
-class DoctorListView(LoginRequiredMixin, generic.ListView):
+class DoctorListView(
+    LoginRequiredMixin,
+    ConditionalGetMixin,
+    KeysetPaginationMixin,
+    generic.ListView,
+):
     model = Doctor
     paginate_by = 3
+    keyset_ordering = ("last_name", "id")
 
     def get_context_data(self, *, object_list=None, **kwargs):
         context = super(DoctorListView, self).get_context_data(**kwargs)
@@ -64,23 +209,67 @@ class DoctorListView(LoginRequiredMixin, generic.ListView):
         return context
 
     def get_queryset(self):
-        queryset = (
-            Doctor.objects.prefetch_related("specializations")
-            .filter(is_staff=False)
-            .filter(deleted_at__isnull=True)
-        )
+        queryset = Doctor.objects.filter(is_staff=False)
         form = UserSearchForm(self.request.GET)
-        if form.is_valid():
-            return queryset.filter(
-                last_name__icontains=form.cleaned_data["last_name"]
+        if form.is_valid() and form.cleaned_data["last_name"]:
+            # Best matches first
+            self.keyset_ordering = ("search_rank", "id")
+            return search(queryset, form.cleaned_data["last_name"]).order_by(
+                *self.keyset_ordering
             )
 
         return queryset
 
 
-class DoctorDetailView(LoginRequiredMixin, generic.DetailView):
+class DoctorDetailView(
+    LoginRequiredMixin, ConditionalGetMixin, generic.DetailView
+):
     model = Doctor
-    queryset = Doctor.objects.prefetch_related("specializations")
+    # The doctor and its next visit
+    validator_models = (Doctor, Visit, Patient)
+    validator_fields = ("pk", "first_upcoming_visit")
+    send_last_modified = False
+
+    def get_validator_queryset(self):
+        return (
+            super()
+            .get_validator_queryset()
+            .annotate(first_upcoming_visit=first_upcoming_visit("doctor"))
+        )
+
+    def get_queryset(self):
+        next_visit = (
+            Visit.objects.upcoming()
+            .filter(patient_active=True, patient__isnull=False)
+            .select_related("patient")
+        )
+        return Doctor.objects.prefetch_related(
+            Prefetch("visits", next_visit[:1], to_attr="upcoming_visits")
+        )
+
+    def get_context_data(self, **kwargs):
+        context = super(DoctorDetailView, self).get_context_data(**kwargs)
+        context["next_visit"] = next(iter(self.object.upcoming_visits), None)
+        return context
+
+
+@login_required
+def doctor_autocomplete(request):
+    """
+    A page of doctors matching `term` and practising the `specialization`,
+    for the autocomplete selects.
+    """
+    form = DoctorAutocompleteForm(request.GET)
+    if not form.is_valid():
+        return JsonResponse({"errors": form.errors}, status=400)
+
+    return JsonResponse(
+        autocomplete.doctor_page(
+            form.cleaned_data["term"],
+            form.cleaned_data["page"],
+            form.cleaned_data["specialization"],
+        )
+    )
 
 
 class DoctorCreateView(LoginRequiredMixin, generic.CreateView):
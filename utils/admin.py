@@ -0,0 +1,54 @@
+from django.contrib import admin, messages
+
+
+class SoftDeleteAdmin(admin.ModelAdmin):
+    """
+    Lists the deleted rows of a soft-delete model too,
+    and restores them. Deleting soft deletes the rows only,
+    so the confirmation pages list no cascade.
+    """
+
+    actions = ("restore_selected",)
+    delete_confirmation_template = "admin/soft_delete_confirmation.html"
+    delete_selected_confirmation_template = (
+        "admin/soft_delete_selected_confirmation.html"
+    )
+
+    def get_queryset(self, request):
+        queryset = self.model.all_objects.get_queryset()
+        ordering = self.get_ordering(request)
+        if ordering:
+            queryset = queryset.order_by(*ordering)
+
+        return queryset
+
+    def get_actions(self, request):
+        actions = super().get_actions(request)
+        if "delete_selected" in actions:
+            function, name, _ = actions["delete_selected"]
+            actions["delete_selected"] = (
+                function,
+                name,
+                "Soft delete selected %(verbose_name_plural)s",
+            )
+
+        return actions
+
+    def get_deleted_objects(self, rows, request):
+        """
+        The rows themselves: a soft delete does not cascade
+        like the collector of a hard delete.
+        """
+        rows = list(rows)
+        model_count = {}
+        if rows:
+            model_count[self.opts.verbose_name_plural] = len(rows)
+
+        return [str(row) for row in rows], model_count, set(), []
+
+    @admin.action(description="Restore selected %(verbose_name_plural)s")
+    def restore_selected(self, request, queryset):
+        restored = queryset.restore()
+        self.message_user(
+            request, f"Restored {restored} row(s).", messages.SUCCESS
+        )
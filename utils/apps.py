@@ -0,0 +1,9 @@
+from django.apps import AppConfig
+
+
+class UtilsConfig(AppConfig):
+    default_auto_field = "django.db.models.BigAutoField"
+    name = "utils"
+
+    def ready(self):
+        from utils import checks, signals  # noqa: F401
@@ -0,0 +1,121 @@
+"""
+Helpers shared by the `benchmark_*` management commands.
+
+Every benchmark seeds its data inside `rollback()`,
+so running one never leaves rows behind in the database.
+"""
+
+import statistics
+import time
+from contextlib import contextmanager
+from datetime import date, datetime, timedelta
+
+from django.db import transaction
+
+from users.models import Doctor, Patient, Specialization
+
+BATCH_SIZE = 10_000
+
+
+class Rollback(Exception):
+    pass
+
+
+@contextmanager
+def rollback():
+    """
+    Run the block in a transaction that is always rolled back.
+    """
+    try:
+        with transaction.atomic():
+            yield
+            raise Rollback
+    except Rollback:
+        pass
+
+
+def measure(func, repeat=25):
+    """
+    Call `func` `repeat` times and return the median duration in ms.
+    """
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - started) * 1000)
+
+    return statistics.median(timings)
+
+
+def seed_specialization(name="Benchmark"):
+    return Specialization.objects.create(name=name)
+
+
+def seed_doctors(count, specialization=None):
+    doctors = Doctor.objects.bulk_create(
+        Doctor(
+            username=f"bench-doctor-{num}",
+            first_name=f"Doctor{num}",
+            last_name=f"Bench{num:07d}",
+            password="!",
+            recertification_with=date.today() + timedelta(days=365),
+        )
+        for num in range(count)
+    )
+    if specialization is not None:
+        specialization.doctors.add(*doctors)
+
+    return doctors
+
+
+def seed_patients(count, start=0):
+    patients = []
+    for offset in range(0, count, BATCH_SIZE):
+        batch = [
+            Patient(
+                phone_number=f"{num:010d}",
+                first_name=f"Patient{num}",
+                last_name=f"Bench{num:07d}",
+                date_of_birth=date(1990, 1, 1),
+            )
+            for num in range(
+                start + offset, start + min(offset + BATCH_SIZE, count)
+            )
+        ]
+        for patient in batch:
+            patient.set_derived_fields()
+        patients += Patient.objects.bulk_create(batch, batch_size=BATCH_SIZE)
+
+    return patients
+
+
+def seed_visits(
+    count, doctors, patients, specialization=None, start=None, duration=30
+):
+    """
+    Book `count` future visits of `duration` minutes spread round-robin
+    over the doctors, back to back per doctor starting from `start`.
+    Returns the datetime right after the last booked slot.
+    """
+    from reception.models import Visit
+
+    start = start or datetime.now().replace(
+        minute=0, second=0, microsecond=0
+    ) + timedelta(days=1)
+    step = timedelta(minutes=duration)
+    for offset in range(0, count, BATCH_SIZE):
+        visits = [
+            Visit(
+                treatment_direction=specialization,
+                date_time=start + step * (num // len(doctors)),
+                duration=duration,
+                doctor=doctors[num % len(doctors)],
+                patient=patients[num % len(patients)],
+            )
+            for num in range(offset, min(offset + BATCH_SIZE, count))
+        ]
+        for visit in visits:
+            visit.set_derived_fields()
+        Visit.objects.bulk_create(visits, batch_size=BATCH_SIZE)
+
+    return start + step * (count // len(doctors) + 1)
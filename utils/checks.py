@@ -0,0 +1,35 @@
+"""
+The caches of the site (list rows, HTTP validators, home page counters,
+autocomplete pages) are invalidated by bumping keys of the default
+cache. A cache local to the process only reaches that process: the
+other workers, and the server when a management command changes the
+data, keep serving what they cached.
+"""
+
+from django.conf import settings
+from django.core import checks
+
+LOCAL_CACHE_BACKENDS = ("django.core.cache.backends.locmem.LocMemCache",)
+LOCAL_CACHE_WARNING = (
+    "The cache is local to this process: the running server keeps its "
+    "cached pages until it is restarted."
+)
+
+
+def cache_is_local():
+    return settings.CACHES["default"]["BACKEND"] in LOCAL_CACHE_BACKENDS
+
+
+@checks.register(checks.Tags.caches, deploy=True)
+def check_shared_cache(app_configs=None, **kwargs):
+    if not cache_is_local():
+        return []
+
+    return [
+        checks.Error(
+            "The default cache has to be shared by the processes "
+            "of the site.",
+            hint="Set CACHE_BACKEND and CACHE_LOCATION, e.g. to Redis.",
+            id="utils.E002",
+        )
+    ]
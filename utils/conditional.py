@@ -0,0 +1,98 @@
+"""
+Conditional GET for the generic list and detail views.
+
+The validators of a page are built from the version stamps of the
+tables behind it, which utils.fragments bumps on every write (saves,
+soft and hard deletes, bulk updates and inserts), read in one cache
+lookup. What changes as the time goes by, such as the next visit of a
+detail page, is added by at most one indexed query. A client that
+already has the page gets 304 Not Modified, and no template is rendered.
+"""
+
+import hashlib
+
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date
+from django.views.generic.detail import SingleObjectMixin
+
+from utils import fragments
+
+
+class ConditionalGetMixin:
+    """
+    ETag and Last-Modified for a ListView or a DetailView.
+    `validator_models` are the models of the rows shown on the page,
+    the model of the view by default.
+    """
+
+    validator_models = ()
+    # The values the ETag of a detail page is built from,
+    # see get_validator_values()
+    validator_fields = ("pk",)
+    # Last-Modified only follows the writes: the pages changing with
+    # the time rely on the ETag alone
+    send_last_modified = True
+
+    def get_validator_models(self):
+        return self.validator_models or (self.model,)
+
+    def get_validator_queryset(self):
+        queryset = self.get_queryset()
+        if isinstance(self, SingleObjectMixin):
+            queryset = queryset.filter(pk=self.kwargs.get(self.pk_url_kwarg))
+
+        return queryset.order_by().prefetch_related(None)
+
+    def get_validator_values(self):
+        """
+        The values of the page that change without a write, in at most
+        one indexed query. None for a missing object.
+        """
+        if isinstance(self, SingleObjectMixin):
+            return (
+                self.get_validator_queryset()
+                .values_list(*self.validator_fields)
+                .first()
+            )
+
+        return ()
+
+    def get_validators(self):
+        """
+        The ETag and the Last-Modified timestamp of the page,
+        (None, None) for a missing object.
+        """
+        values = self.get_validator_values()
+        if values is None:
+            return None, None
+
+        versions = fragments.get_model_versions(self.get_validator_models())
+        # The header of the page shows the user
+        digest = hashlib.md5(
+            repr([self.request.user.pk, *values, *versions]).encode()
+        ).hexdigest()
+        last_modified = None
+        if self.send_last_modified:
+            last_modified = max(versions) // 1_000_000_000
+
+        # Weak: equal pages may differ in details such as the total
+        # of a keyset page, which is cached for a while
+        return f'W/"{digest}"', last_modified
+
+    def get(self, request, *args, **kwargs):
+        etag, last_modified = self.get_validators()
+        if etag is None:
+            return super().get(request, *args, **kwargs)
+
+        response = get_conditional_response(
+            request, etag=etag, last_modified=last_modified
+        )
+        if response is None:
+            response = super().get(request, *args, **kwargs)
+        response.headers["ETag"] = etag
+        if last_modified is not None:
+            response.headers["Last-Modified"] = http_date(last_modified)
+        # The pages are personal, the browser revalidates them every time
+        patch_cache_control(response, private=True, no_cache=True)
+
+        return response
@@ -0,0 +1,180 @@
+"""
+Fragment cache of list rows.
+
+Every row is cached with the version stamps of the objects it shows
+and their `updated_at`. SoftDeleteModel bumps the stamp of a row
+whenever it is saved, soft deleted, restored or deleted, so a list page
+re-renders only the rows that changed. The stamps are set once the
+write is committed, and the `updated_at` read with the rows keeps a
+render of old rows from being cached as current. A row costs one cache
+lookup, which fetches its fragment and the stamps together. Hits and
+misses are counted in memory and added to the cache in batches, see
+the `row_cache_stats` command.
+
+Every bump also stamps the table of the model, which the HTTP
+validators of the pages are built from (see utils.conditional).
+The stamps have to reach every worker: production needs a cache shared
+by the processes (see utils.checks).
+"""
+
+import atexit
+import hashlib
+import threading
+import time
+from collections import Counter
+from functools import partial
+
+from django.core.cache import cache
+from django.db import transaction
+
+CACHE_PREFIX = "rowcache:"
+VERSION_PREFIX = CACHE_PREFIX + "version:"
+HITS_KEY = CACHE_PREFIX + "hits"
+MISSES_KEY = CACHE_PREFIX + "misses"
+# Version of all the rows, see reset()
+GENERATION_KEY = CACHE_PREFIX + "generation"
+
+# Seconds. The versions outlive the fragments
+FRAGMENT_TIMEOUT = 24 * 60 * 60
+# Rows counted in memory before the counters of the cache are updated
+STATS_FLUSH_SIZE = 100
+
+stats_lock = threading.Lock()
+pending_stats = Counter()
+
+
+def version_key(model, pk):
+    return f"{VERSION_PREFIX}{model._meta.label_lower}:{pk}"
+
+
+def model_version_key(model):
+    return f"{VERSION_PREFIX}{model._meta.label_lower}"
+
+
+def bump(model, *pks):
+    """
+    Give the rows and the table of the model new version stamps, so
+    their fragments are rendered again. Call it after QuerySet.update()
+    of shown columns, and without pks after bulk inserts and deletes.
+    Inside a transaction the stamps are set when it commits: a render
+    of the rows in between would be cached under the new stamps.
+    """
+    transaction.on_commit(partial(set_stamps, model, pks))
+
+
+def set_stamps(model, pks):
+    stamp = time.time_ns()
+    cache.set_many(
+        {
+            model_version_key(model): stamp,
+            **{version_key(model, pk): stamp for pk in pks},
+        },
+        None,
+    )
+
+
+def reset():
+    """
+    Render every row again, e.g. after the tables are reloaded.
+    """
+    transaction.on_commit(
+        partial(cache.set, GENERATION_KEY, time.time_ns(), None)
+    )
+
+
+def get_model_versions(models):
+    """
+    The generation and the version stamps of the tables of the models,
+    in one cache lookup.
+    """
+    keys = [GENERATION_KEY, *(model_version_key(model) for model in models)]
+    return get_stamps(keys, cache.get_many(keys))
+
+
+def get_stamps(keys, found):
+    """
+    The stamps of the keys among the `found` cache values. Missing ones
+    (never set or evicted) get a new one: a lost stamp renders again,
+    it never serves stale data.
+    """
+    missing = {key: time.time_ns() for key in keys if key not in found}
+    if missing:
+        cache.set_many(missing, None)
+
+    return [found[key] if key in found else missing[key] for key in keys]
+
+
+def fragment_key(name, objects):
+    digest = hashlib.md5(
+        repr([(type(obj).__name__, obj.pk) for obj in objects]).encode()
+    ).hexdigest()
+
+    return f"{CACHE_PREFIX}{name}:{digest}"
+
+
+def get_fragment(name, objects):
+    """
+    The cached fragment of the objects and their current versions,
+    in one cache lookup. The fragment is None unless it was rendered
+    with these versions.
+    """
+    key = fragment_key(name, objects)
+    keys = [
+        GENERATION_KEY,
+        *(version_key(type(obj), obj.pk) for obj in objects),
+    ]
+    found = cache.get_many([key, *keys])
+    # The stamps may be newer than the rows, fetched before them:
+    # the changes of the rows show in their updated_at
+    versions = [
+        *get_stamps(keys, found),
+        *(getattr(obj, "updated_at", None) for obj in objects),
+    ]
+    versions_and_content = found.get(key)
+    if versions_and_content is not None:
+        cached_versions, content = versions_and_content
+        if cached_versions == versions:
+            return content, versions
+
+    return None, versions
+
+
+def set_fragment(name, objects, versions, content):
+    cache.set(
+        fragment_key(name, objects), (versions, content), FRAGMENT_TIMEOUT
+    )
+
+
+def count(key):
+    with stats_lock:
+        pending_stats[key] += 1
+        due = sum(pending_stats.values()) >= STATS_FLUSH_SIZE
+    if due:
+        flush_stats()
+
+
+@atexit.register
+def flush_stats():
+    """
+    Add the hits and misses counted by this process to the cache.
+    """
+    global pending_stats
+    with stats_lock:
+        pending, pending_stats = pending_stats, Counter()
+    for key, number in pending.items():
+        try:
+            cache.incr(key, number)
+        except ValueError:
+            cache.set(key, number, None)
+
+
+def get_stats():
+    flush_stats()
+    stats = cache.get_many((HITS_KEY, MISSES_KEY))
+    return stats.get(HITS_KEY, 0), stats.get(MISSES_KEY, 0)
+
+
+def reset_stats():
+    with stats_lock:
+        pending_stats.clear()
+    cache.delete_many((HITS_KEY, MISSES_KEY))
@@ -0,0 +1,31 @@
+import gzip
+
+from django.core.management.base import BaseCommand
+
+from utils.checks import LOCAL_CACHE_WARNING, cache_is_local
+from utils.seed import BATCH_SIZE, SeedLoader, iter_json_array
+
+
+class Command(BaseCommand):
+    help = (  # noqa: VNE003
+        "Load a dumpdata JSON fixture (optionally gzipped) "
+        "with bulk inserts, much faster than loaddata."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("path")
+        parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+
+    def handle(self, *args, **options):
+        path = options["path"]
+        opener = gzip.open if path.endswith(".gz") else open
+        with opener(path, "rt", encoding="utf-8") as stream:
+            counts = SeedLoader(options["batch_size"]).load(
+                iter_json_array(stream)
+            )
+
+        for model, count in counts.items():
+            if count:
+                self.stdout.write(f"{model._meta.label}: {count}")
+        if cache_is_local():
+            self.stderr.write(self.style.WARNING(LOCAL_CACHE_WARNING))
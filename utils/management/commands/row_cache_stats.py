@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand
+
+from utils import fragments
+
+
+class Command(BaseCommand):
+    help = (  # noqa: VNE003
+        "Show the hits and misses of the cached list rows "
+        "since the last reset."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--reset",
+            action="store_true",
+            help="Reset the counters after showing them",
+        )
+
+    def handle(self, *args, **options):
+        hits, misses = fragments.get_stats()
+        total = hits + misses
+        ratio = hits / total if total else 0
+        self.stdout.write(
+            f"Hits: {hits}, misses: {misses}, hit ratio: {ratio:.1%}"
+        )
+        if options["reset"]:
+            fragments.reset_stats()
+            self.stdout.write("The counters are reset")
@@ -1,8 +1,88 @@
-from django.db import models
+import hashlib
+
+from django.apps import apps
+from django.core import checks
+from django.core.exceptions import NON_FIELD_ERRORS
+from django.db import models, transaction
+from django.db.models.signals import class_prepared
+from django.dispatch import receiver
 from django.utils import timezone
 
+from utils import fragments
+from utils.signals import post_restore, post_soft_delete
+
+LIVE = models.Q(deleted_at__isnull=True)
+# The columns soft delete and restore write
+SOFT_DELETE_FIELDS = frozenset(("deleted_at", "updated_at"))
+
+
+class SoftDeleteQuerySet(models.QuerySet):
+    """
+    Soft delete, restore and hard delete of all the rows at once.
+    """
+
+    def delete(self, cascade=False):
+        """
+        Soft delete the live rows in one statement. With `cascade`,
+        also the rows of the model's `get_soft_delete_cascade()`.
+        Returns the numbers of rows like QuerySet.delete().
+        """
+        with transaction.atomic(using=self.db):
+            pks = self.set_deleted_at(timezone.now(), post_soft_delete)
+            counts = {self.model._meta.label: len(pks)}
+            if cascade and pks:
+                for dependents in self.model.get_soft_delete_cascade(pks):
+                    for label, number in dependents.delete(cascade=True)[
+                        1
+                    ].items():
+                        counts[label] = counts.get(label, 0) + number
+
+        return sum(counts.values()), counts
+
+    delete.alters_data = True
+    delete.queryset_only = True
+
+    def restore(self):
+        """
+        Restore the deleted rows in one statement.
+        Returns the number of restored rows.
+        """
+        with transaction.atomic(using=self.db):
+            return len(self.set_deleted_at(None, post_restore))
+
+    restore.alters_data = True
+    restore.queryset_only = True
+
+    def hard_delete(self):
+        with transaction.atomic(using=self.db):
+            pks = list(self.values_list("pk", flat=True))
+            deleted = super().delete()
+        fragments.bump(self.model, *pks)
+        return deleted
+
+    hard_delete.alters_data = True
+    hard_delete.queryset_only = True
+
+    def set_deleted_at(self, deleted_at, signal):
+        """
+        Set `deleted_at` of the rows it changes, in one UPDATE.
+        Returns their pks, sent with the signal.
+        """
+        queryset = self.filter(deleted_at__isnull=deleted_at is not None)
+        pks = list(queryset.values_list("pk", flat=True))
+        if not pks:
+            return pks
 
-class SoftDeleteManager(models.Manager):
+        queryset.update(deleted_at=deleted_at, updated_at=timezone.now())
+        fragments.bump(self.model, *pks)
+        signal.send(sender=self.model, pks=pks)
+        return pks
+
+    set_deleted_at.alters_data = True
+    set_deleted_at.queryset_only = True
+
+
+class SoftDeleteManager(models.Manager.from_queryset(SoftDeleteQuerySet)):
 
     def get_queryset(self):
         return super().get_queryset().filter(deleted_at__isnull=True)
@@ -10,19 +90,155 @@ class SoftDeleteManager(models.Manager):
 
 class SoftDeleteModel(models.Model):
     deleted_at = models.DateTimeField(null=True, blank=True, default=None)
+    # Change stamp of the row, part of the version of its cached row
+    # fragments (see utils.fragments).
+    # QuerySet.update() has to set it explicitly.
+    updated_at = models.DateTimeField(auto_now=True)
     objects = SoftDeleteManager()
-    all_objects = models.Manager()
+    all_objects = SoftDeleteQuerySet.as_manager()
+
+    # Fields (or tuples of fields) the views look up on live rows.
+    # Each one gets an index restricted to rows that are not deleted.
+    live_index_fields = ()
 
     class Meta:
         abstract = True
 
-    def delete(self, using=None, keep_parents=False) -> None:
-        self.deleted_at = timezone.now()
-        self.save()
+    def _perform_unique_checks(self, unique_checks):
+        """
+        The default manager skips the deleted rows, whose values still
+        take the unique columns: look for clashes among them too.
+        """
+        errors = super()._perform_unique_checks(unique_checks)
+        for model_class, unique_check in unique_checks:
+            lookup = {
+                field_name: getattr(
+                    self, self._meta.get_field(field_name).attname
+                )
+                for field_name in unique_check
+            }
+            if (
+                not issubclass(model_class, SoftDeleteModel)
+                or None in lookup.values()
+                or (not self._state.adding and self._meta.pk.name in lookup)
+            ):
+                continue
+
+            deleted = model_class.all_objects.filter(
+                deleted_at__isnull=False, **lookup
+            )
+            if not self._state.adding:
+                deleted = deleted.exclude(pk=self.pk)
+            if deleted.exists():
+                key = (
+                    unique_check[0]
+                    if len(unique_check) == 1
+                    else NON_FIELD_ERRORS
+                )
+                errors.setdefault(key, []).append(
+                    self.unique_error_message(model_class, unique_check)
+                )
+
+        return errors
+
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        # Cached list rows showing the object are rendered again
+        fragments.bump(type(self), self.pk)
+
+    @classmethod
+    def get_soft_delete_cascade(cls, pks):
+        """
+        The querysets of the rows soft deleted along with the rows
+        of the pks by delete(cascade=True).
+        """
+        return ()
+
+    def delete(self, using=None, keep_parents=False, cascade=False) -> None:
+        with transaction.atomic(using=using):
+            self.deleted_at = timezone.now()
+            self.save(using=using, update_fields=SOFT_DELETE_FIELDS)
+            if cascade:
+                for dependents in self.get_soft_delete_cascade([self.pk]):
+                    dependents.delete(cascade=True)
 
     def restore(self):
         self.deleted_at = None
-        self.save()
+        self.save(update_fields=SOFT_DELETE_FIELDS)
 
     def hard_delete(self):
+        pk = self.pk
         super(SoftDeleteModel, self).delete()
+        fragments.bump(type(self), pk)
+
+
+class FullTextField(models.TextField):
+    """
+    The hidden column of an SQLite FTS5 table, named after the table.
+    Filter the table with the `match` lookup on it.
+    """
+
+
+@FullTextField.register_lookup
+class Match(models.Lookup):
+    lookup_name = "match"
+
+    def as_sql(self, compiler, connection):
+        lhs, lhs_params = self.process_lhs(compiler, connection)
+        rhs, rhs_params = self.process_rhs(compiler, connection)
+        return f"{lhs} MATCH {rhs}", [*lhs_params, *rhs_params]
+
+
+def live_index(model, fields):
+    """
+    A partial index on the fields covering live rows only.
+    """
+    name = "_".join((model._meta.model_name, *fields, "live"))
+    if len(name) > models.Index.max_name_length:
+        digest = hashlib.md5(name.encode()).hexdigest()[:8]
+        name = f"{name[:models.Index.max_name_length - 9]}_{digest}"
+
+    return models.Index(fields=fields, condition=LIVE, name=name)
+
+
+@receiver(class_prepared)
+def add_live_indexes(sender, **kwargs):
+    """
+    Add the partial indexes of `live_index_fields` to a concrete
+    soft-delete model. They are declared like Meta.indexes,
+    so migrations pick them up.
+    """
+    if not issubclass(sender, SoftDeleteModel) or sender._meta.abstract:
+        return
+
+    indexes = [
+        live_index(sender, (fields,) if isinstance(fields, str) else fields)
+        for fields in sender.live_index_fields
+    ]
+    if indexes:
+        sender._meta.indexes = [*sender._meta.indexes, *indexes]
+        sender._meta.original_attrs["indexes"] = sender._meta.indexes
+
+
+@checks.register(checks.Tags.models)
+def check_default_managers(app_configs=None, **kwargs):
+    """
+    The related managers (`patient.visits`, `specialization.doctors`)
+    and prefetch_related() query the default manager of the model:
+    it has to skip the deleted rows.
+    """
+    configs = app_configs or apps.get_app_configs()
+    return [
+        checks.Error(
+            "The default manager of a soft-delete model "
+            "has to be a SoftDeleteManager.",
+            hint="Declare a SoftDeleteManager first or name it "
+            "in Meta.default_manager_name.",
+            obj=model,
+            id="utils.E001",
+        )
+        for config in configs
+        for model in config.get_models()
+        if issubclass(model, SoftDeleteModel)
+        and not isinstance(model._default_manager, SoftDeleteManager)
+    ]
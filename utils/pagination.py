@@ -0,0 +1,208 @@
+"""
+Keyset (seek) pagination.
+
+A page is addressed by a cursor holding the ordering values of the row
+it starts after (or ends before) instead of a page number. Every page
+is one range query on the ordering index, however deep it is, and no
+COUNT(*) is needed to render it.
+"""
+
+import base64
+import binascii
+import datetime
+import hashlib
+import json
+from functools import cached_property
+
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Q
+from django.http import Http404
+
+NEXT = "n"
+PREVIOUS = "p"
+
+
+class CursorEncoder(DjangoJSONEncoder):
+    """
+    Keeps the microseconds of the times, which DjangoJSONEncoder cuts
+    to milliseconds: a cursor has to sort exactly at its row.
+    """
+
+    def default(self, value):
+        if isinstance(value, (datetime.datetime, datetime.time)):
+            return value.isoformat()
+
+        return super().default(value)
+
+
+def encode_cursor(values, direction):
+    data = json.dumps([direction, *values], cls=CursorEncoder)
+    return base64.urlsafe_b64encode(data.encode()).decode()
+
+
+def decode_cursor(cursor):
+    """
+    Return the direction and the ordering values of the cursor.
+    """
+    try:
+        data = json.loads(base64.urlsafe_b64decode(cursor))
+    except (binascii.Error, ValueError):
+        raise Http404("Invalid cursor")
+    if not isinstance(data, list) or data[:1] not in ([NEXT], [PREVIOUS]):
+        raise Http404("Invalid cursor")
+
+    return data[0], data[1:]
+
+
+def keyset_filter(ordering, values, lookup):
+    """
+    Rows after (lookup="gt") or before (lookup="lt") the values
+    in the ordering: (a > x) OR (a = x AND b > y) ...
+    The redundant bound on the first field keeps the query
+    a range scan of its index.
+    """
+    condition = Q()
+    for position, field in enumerate(ordering):
+        equal = dict(zip(ordering[:position], values[:position]))
+        condition |= Q(**equal, **{f"{field}__{lookup}": values[position]})
+
+    return Q(**{f"{ordering[0]}__{lookup}e": values[0]}) & condition
+
+
+class KeysetPage:
+    def __init__(self, object_list, paginator, next_cursor, previous_cursor):
+        self.object_list = object_list
+        self.paginator = paginator
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+
+    def __repr__(self):
+        return f"<Keyset page of {len(self)} objects>"
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __getitem__(self, index):
+        return self.object_list[index]
+
+    def has_next(self):
+        return self.next_cursor is not None
+
+    def has_previous(self):
+        return self.previous_cursor is not None
+
+    def has_other_pages(self):
+        return self.has_next() or self.has_previous()
+
+
+class KeysetPaginator:
+    """
+    Paginate a queryset by the ascending `ordering`,
+    whose last field must be unique (usually "id").
+    """
+
+    is_keyset = True
+
+    def __init__(
+        self, queryset, per_page, ordering, count_key=None, count_timeout=60
+    ):
+        self.queryset = queryset
+        self.per_page = per_page
+        self.ordering = tuple(ordering)
+        self.count_key = count_key
+        self.count_timeout = count_timeout
+
+    def page(self, cursor=None):
+        direction, values = decode_cursor(cursor) if cursor else (NEXT, [])
+        if direction == PREVIOUS and not values:
+            raise Http404("Invalid cursor")
+
+        if direction == NEXT:
+            queryset = self.queryset.order_by(*self.ordering)
+        else:
+            queryset = self.queryset.order_by(
+                *(f"-{field}" for field in self.ordering)
+            )
+        if values:
+            if len(values) != len(self.ordering):
+                raise Http404("Invalid cursor")
+            try:
+                queryset = queryset.filter(
+                    keyset_filter(
+                        self.ordering,
+                        values,
+                        "gt" if direction == NEXT else "lt",
+                    )
+                )
+            except (ValidationError, ValueError, TypeError):
+                raise Http404("Invalid cursor")
+
+        rows = list(queryset[: self.per_page + 1])
+        has_more = len(rows) > self.per_page
+        rows = rows[: self.per_page]
+        if direction == PREVIOUS:
+            rows.reverse()
+        if not rows:
+            return KeysetPage(rows, self, None, None)
+
+        has_next = has_more if direction == NEXT else True
+        has_previous = bool(values) if direction == NEXT else has_more
+        return KeysetPage(
+            rows,
+            self,
+            encode_cursor(self.values(rows[-1]), NEXT) if has_next else None,
+            (
+                encode_cursor(self.values(rows[0]), PREVIOUS)
+                if has_previous
+                else None
+            ),
+        )
+
+    def values(self, obj):
+        return [getattr(obj, field) for field in self.ordering]
+
+    @cached_property
+    def count(self):
+        """
+        The total number of rows, cached for `count_timeout` seconds
+        under `count_key`. None when no key is given: the count is optional.
+        """
+        if self.count_key is None:
+            return None
+
+        digest = hashlib.md5(self.count_key.encode()).hexdigest()
+        return cache.get_or_set(
+            f"keyset-count:{digest}", self.queryset.count, self.count_timeout
+        )
+
+
+class KeysetPaginationMixin:
+    """
+    Keyset pagination for a ListView, page by page through `?cursor=`.
+    Links with `?page=` keep the default numbered pagination.
+    """
+
+    keyset_ordering = ("id",)
+    cursor_kwarg = "cursor"
+    count_timeout = 60
+
+    def paginate_queryset(self, queryset, page_size):
+        if self.page_kwarg in self.request.GET:
+            return super().paginate_queryset(queryset, page_size)
+
+        query = self.request.GET.copy()
+        query.pop(self.cursor_kwarg, None)
+        paginator = KeysetPaginator(
+            queryset,
+            page_size,
+            self.keyset_ordering,
+            count_key=f"{self.request.path}?{query.urlencode()}",
+            count_timeout=self.count_timeout,
+        )
+        page = paginator.page(self.request.GET.get(self.cursor_kwarg))
+        return paginator, page, page.object_list, page.has_other_pages()
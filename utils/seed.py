@@ -0,0 +1,173 @@
+"""
+Fast loading of fixtures in the `dumpdata` JSON format.
+
+`loaddata` reads the whole file and saves the objects one by one,
+firing the model signals and adding every many-to-many link with its
+own queries. Here the file is parsed object by object as it is read,
+the objects are grouped per model and inserted with `bulk_create`, and
+the many-to-many links are inserted in batches straight into the
+through tables. Bulk inserts fire no signals, so the derived fields
+are computed before the insert and the denormalized data (labels,
+search index, caches) are rebuilt once after the load.
+"""
+
+import json
+import re
+from collections import Counter, defaultdict
+from itertools import islice
+
+from django.core import serializers
+from django.core.management.color import no_style
+from django.db import connection, transaction
+
+from reception import dashboard
+from reception.models import refresh_active_flags
+from users import autocomplete, search
+from users.models import (
+    Doctor,
+    Patient,
+    Specialization,
+    refresh_specialization_labels,
+)
+from utils import fragments
+
+READ_SIZE = 1 << 20
+BATCH_SIZE = 5000
+SEPARATORS = re.compile(r"[\s,]*")
+
+# Small tables kept in memory, so that computing the derived fields
+# of the rows referring to them does not query them row by row
+REFERENCE_MODELS = (Specialization,)
+
+
+def iter_json_array(stream, read_size=READ_SIZE):
+    """
+    The items of the JSON array of the text stream, parsed one by one
+    without reading the whole stream.
+    """
+    decoder = json.JSONDecoder()
+    buffer = ""
+    while not buffer and (more := stream.read(read_size)):
+        buffer = more.lstrip()
+    if not buffer.startswith("["):
+        raise ValueError("The fixture is not a JSON array.")
+    position = 1
+    end_of_stream = False
+    while True:
+        position = SEPARATORS.match(buffer, position).end()
+        if position < len(buffer) and buffer[position] == "]":
+            return
+        try:
+            item, position = decoder.raw_decode(buffer, position)
+        except json.JSONDecodeError:
+            # The item goes on in the next part of the stream
+            if end_of_stream:
+                raise
+            more = stream.read(read_size)
+            end_of_stream = not more
+            buffer = buffer[position:] + more
+            position = 0
+            continue
+
+        yield item
+
+
+class SeedLoader:
+    def __init__(self, batch_size=BATCH_SIZE):
+        self.batch_size = batch_size
+        self.pending = defaultdict(list)
+        self.links = defaultdict(list)
+        self.references = defaultdict(dict)
+        self.counts = Counter()
+
+    def load(self, records):
+        """
+        Insert the objects of the dumpdata records.
+        Returns the number of objects per model.
+        """
+        records = iter(records)
+        with transaction.atomic(), connection.constraint_checks_disabled():
+            while chunk := list(islice(records, self.batch_size)):
+                for obj in serializers.deserialize(
+                    "python", chunk, ignorenonexistent=True
+                ):
+                    self.add(obj)
+            for model in list(self.pending):
+                self.flush(model)
+            for through in list(self.links):
+                self.flush_links(through)
+
+            models = list(self.counts)
+            connection.check_constraints(
+                table_names=[model._meta.db_table for model in models]
+            )
+            reset_sequences(models)
+            rebuild_derived_data()
+
+        return self.counts
+
+    def add(self, deserialized):
+        obj = deserialized.object
+        model = type(obj)
+        self.pending[model].append(obj)
+        if model in REFERENCE_MODELS:
+            self.references[model][obj.pk] = obj
+        for name, values in (deserialized.m2m_data or {}).items():
+            field = model._meta.get_field(name)
+            through = field.remote_field.through
+            source = f"{field.m2m_field_name()}_id"
+            target = f"{field.m2m_reverse_field_name()}_id"
+            self.links[through] += [
+                through(**{source: obj.pk, target: value}) for value in values
+            ]
+            if len(self.links[through]) >= self.batch_size:
+                self.flush_links(through)
+        if len(self.pending[model]) >= self.batch_size:
+            self.flush(model)
+
+    def flush(self, model):
+        objects = self.pending.pop(model, [])
+        if hasattr(model, "set_derived_fields"):
+            for obj in objects:
+                self.attach_references(obj)
+                obj.set_derived_fields()
+        model._base_manager.bulk_create(objects, batch_size=self.batch_size)
+        self.counts[model] += len(objects)
+
+    def attach_references(self, obj):
+        for field in obj._meta.concrete_fields:
+            if field.is_relation and field.related_model in REFERENCE_MODELS:
+                related = self.references[field.related_model].get(
+                    getattr(obj, field.attname)
+                )
+                if related is not None:
+                    setattr(obj, field.name, related)
+
+    def flush_links(self, through):
+        links = self.links.pop(through, [])
+        through._base_manager.bulk_create(links, batch_size=self.batch_size)
+        self.counts[through] += len(links)
+
+
+def reset_sequences(models):
+    """
+    Move the id sequences past the loaded ids (a no-op on SQLite).
+    """
+    statements = connection.ops.sequence_reset_sql(no_style(), models)
+    with connection.cursor() as cursor:
+        for sql in statements:
+            cursor.execute(sql)
+
+
+def rebuild_derived_data():
+    """
+    Rebuild what the signals keep in sync on every save.
+    """
+    refresh_specialization_labels()
+    refresh_active_flags("doctor")
+    refresh_active_flags("patient")
+    for model in (Patient, Doctor):
+        search.rebuild(model)
+        autocomplete.invalidate(model)
+    dashboard.invalidate(*dashboard.COUNTERS)
+    fragments.reset()
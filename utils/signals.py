@@ -0,0 +1,21 @@
+from django.conf import settings
+from django.db.backends.signals import connection_created
+from django.dispatch import Signal, receiver
+
+# Sent by SoftDeleteQuerySet with the `pks` of the rows it soft deleted
+# or restored in bulk. QuerySet.update() sends no post_save.
+post_soft_delete = Signal()
+post_restore = Signal()
+
+
+@receiver(connection_created)
+def configure_sqlite(sender, connection, **kwargs):
+    """
+    Apply SQLITE_PRAGMAS to a new SQLite connection.
+    """
+    if connection.vendor != "sqlite":
+        return
+
+    with connection.cursor() as cursor:
+        for name, value in getattr(settings, "SQLITE_PRAGMAS", {}).items():
+            cursor.execute(f"PRAGMA {name} = {value}")
@@ -0,0 +1,53 @@
+from django import template
+
+from utils import fragments
+
+register = template.Library()
+
+
+class RowCacheNode(template.Node):
+    def __init__(self, nodelist, name, objects):
+        self.nodelist = nodelist
+        self.name = name
+        self.objects = objects
+
+    def render(self, context):
+        objects = [
+            obj
+            for obj in (var.resolve(context) for var in self.objects)
+            if obj is not None
+        ]
+        name = self.name.resolve(context)
+        content, versions = fragments.get_fragment(name, objects)
+        if content is not None:
+            fragments.count(fragments.HITS_KEY)
+            return content
+
+        fragments.count(fragments.MISSES_KEY)
+        content = self.nodelist.render(context)
+        fragments.set_fragment(name, objects, versions, content)
+        return content
+
+
+@register.tag
+def rowcache(parser, token):
+    """
+    Cache the row of the objects until one of them changes:
+
+    {% rowcache "visit-row" visit visit.doctor visit.patient %}
+        ...
+    {% endrowcache %}
+    """
+    bits = token.split_contents()
+    if len(bits) < 3:
+        raise template.TemplateSyntaxError(
+            f"'{bits[0]}' takes a fragment name and at least one object"
+        )
+    nodelist = parser.parse(("endrowcache",))
+    parser.delete_first_token()
+
+    return RowCacheNode(
+        nodelist,
+        parser.compile_filter(bits[1]),
+        [parser.compile_filter(bit) for bit in bits[2:]],
+    )
@@ -0,0 +1,67 @@
+from datetime import datetime
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+
+from reception.models import Visit
+from users.models import Patient
+
+PATIENT_CHANGELIST_URL = reverse("admin:users_patient_changelist")
+
+
+class SoftDeleteAdminTest(TestCase):
+    def setUp(self):
+        admin = get_user_model().objects.create_superuser(
+            username="AdminUsername", password="AdminPassword123"
+        )
+        self.client.force_login(admin)
+        self.patient = Patient.objects.create(
+            first_name="Ivan",
+            last_name="Petrenko",
+            phone_number="0671234567",
+        )
+        self.visit = Visit.objects.create(
+            date_time=datetime(2031, 1, 10, 9), patient=self.patient
+        )
+        self.delete_url = reverse(
+            "admin:users_patient_delete", args=[self.patient.pk]
+        )
+
+    def assert_soft_deleted(self):
+        self.patient.refresh_from_db()
+        self.assertIsNotNone(self.patient.deleted_at)
+        self.assertTrue(Visit.objects.filter(pk=self.visit.pk).exists())
+
+    def test_delete_confirmation_lists_no_cascade(self):
+        response = self.client.get(self.delete_url)
+
+        self.assertContains(response, "soft delete")
+        self.assertNotContains(response, "Visit:")
+
+    def test_delete_is_a_soft_delete(self):
+        response = self.client.post(self.delete_url, {"post": "yes"})
+
+        self.assertEqual(response.status_code, 302)
+        self.assert_soft_deleted()
+
+    def test_delete_selected_is_a_soft_delete(self):
+        data = {
+            "action": "delete_selected",
+            "_selected_action": [self.patient.pk],
+        }
+        response = self.client.post(PATIENT_CHANGELIST_URL, data)
+        self.assertContains(response, "soft delete the selected patient?")
+
+        response = self.client.post(
+            PATIENT_CHANGELIST_URL, {**data, "post": "yes"}
+        )
+        self.assertEqual(response.status_code, 302)
+        self.assert_soft_deleted()
+
+    def test_deleted_rows_are_listed(self):
+        self.patient.delete()
+        response = self.client.get(PATIENT_CHANGELIST_URL)
+
+        self.assertContains(response, "Petrenko")
+        self.assertContains(response, "Soft delete selected patients")
@@ -0,0 +1,201 @@
+import time
+from datetime import date, datetime
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import transaction
+from django.test import TestCase
+from django.urls import reverse
+
+from reception.models import Visit
+from reception.scheduling import book_visits
+from users.models import Patient, Specialization
+from utils import fragments
+
+PATIENT_LIST_URL = reverse("user:patient-list")
+VISIT_LIST_URL = reverse("reception:visit-list") + "?date_time=2030-01-01"
+
+
+class ConditionalGetTest(TestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            username="DocUsername", password="DocPassword123"
+        )
+        self.client.force_login(self.user)
+        self.doctor = get_user_model().objects.create_user(
+            username="Doctor", first_name="Taras", last_name="Bondar"
+        )
+        self.specialization = Specialization.objects.create(name="Surgeon")
+        self.patient = Patient.objects.create(
+            first_name="Ivan",
+            last_name="Petrenko",
+            phone_number="0671234567",
+            date_of_birth=date(1990, 1, 1),
+        )
+        self.visit = Visit.objects.create(
+            date_time="2030-01-01 10:00",
+            doctor=self.doctor,
+            patient=self.patient,
+            treatment_direction=self.specialization,
+        )
+
+    def revalidate(self, url, response):
+        return self.client.get(url, HTTP_IF_NONE_MATCH=response["ETag"])
+
+    def test_validators_are_sent(self):
+        response = self.client.get(PATIENT_LIST_URL)
+
+        self.assertTrue(response["ETag"].startswith('W/"'))
+        self.assertIn("Last-Modified", response)
+        self.assertIn("no-cache", response["Cache-Control"])
+        self.assertIn("private", response["Cache-Control"])
+
+    def test_unchanged_page_is_not_rendered(self):
+        response = self.client.get(PATIENT_LIST_URL)
+        response = self.revalidate(PATIENT_LIST_URL, response)
+
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.content, b"")
+        self.assertTemplateNotUsed(response, "users/patient_list.html")
+
+    def test_if_modified_since(self):
+        response = self.client.get(PATIENT_LIST_URL)
+        response = self.client.get(
+            PATIENT_LIST_URL,
+            HTTP_IF_MODIFIED_SINCE=response["Last-Modified"],
+        )
+
+        self.assertEqual(response.status_code, 304)
+
+    def test_list_is_revalidated_without_queries(self):
+        response = self.client.get(PATIENT_LIST_URL)
+        # Session and user
+        with self.assertNumQueries(2):
+            response = self.revalidate(PATIENT_LIST_URL, response)
+        self.assertEqual(response.status_code, 304)
+
+    def test_hard_delete_moves_last_modified(self):
+        cache.set(
+            fragments.model_version_key(Patient),
+            time.time_ns() - 10 * 1_000_000_000,
+            None,
+        )
+        response = self.client.get(PATIENT_LIST_URL)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.patient.hard_delete()
+
+        response = self.client.get(
+            PATIENT_LIST_URL,
+            HTTP_IF_MODIFIED_SINCE=response["Last-Modified"],
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertNotContains(response, "Petrenko")
+
+    def test_bulk_booked_visit_changes_the_etag(self):
+        response = self.client.get(VISIT_LIST_URL)
+        with self.captureOnCommitCallbacks(execute=True):
+            book_visits(
+                [
+                    Visit(
+                        date_time=datetime(2030, 1, 1, 12),
+                        doctor=self.doctor,
+                        patient=self.patient,
+                    )
+                ]
+            )
+
+        response = self.revalidate(VISIT_LIST_URL, response)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.context["visit_list"]), 2)
+
+    def test_saved_row_changes_the_etag(self):
+        response = self.client.get(PATIENT_LIST_URL)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.patient.last_name = "Kovalenko"
+            self.patient.save()
+
+        response = self.revalidate(PATIENT_LIST_URL, response)
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, "Kovalenko")
+
+    def test_rolled_back_write_keeps_the_validators(self):
+        response = self.client.get(PATIENT_LIST_URL)
+        with self.captureOnCommitCallbacks(execute=True):
+            try:
+                with transaction.atomic():
+                    self.patient.last_name = "Kovalenko"
+                    self.patient.save()
+                    raise ValueError
+            except ValueError:
+                pass
+
+        self.assertEqual(
+            self.revalidate(PATIENT_LIST_URL, response).status_code, 304
+        )
+        response = self.client.get(
+            PATIENT_LIST_URL,
+            HTTP_IF_MODIFIED_SINCE=response["Last-Modified"],
+        )
+        self.assertEqual(response.status_code, 304)
+
+    def test_soft_deleted_row_changes_the_etag(self):
+        other = Patient.objects.create(
+            first_name="Olena",
+            last_name="Shevchenko",
+            phone_number="0677654321",
+        )
+        response = self.client.get(PATIENT_LIST_URL)
+        with self.captureOnCommitCallbacks(execute=True):
+            other.delete()
+
+        response = self.revalidate(PATIENT_LIST_URL, response)
+        self.assertEqual(response.status_code, 200)
+
+    def test_etag_depends_on_the_user(self):
+        response = self.client.get(PATIENT_LIST_URL)
+        self.client.force_login(self.doctor)
+
+        response = self.revalidate(PATIENT_LIST_URL, response)
+        self.assertEqual(response.status_code, 200)
+
+    def test_visit_list_follows_related_rows(self):
+        response = self.client.get(VISIT_LIST_URL)
+        self.assertEqual(
+            self.revalidate(VISIT_LIST_URL, response).status_code, 304
+        )
+        with self.captureOnCommitCallbacks(execute=True):
+            self.specialization.name = "Surgery"
+            self.specialization.save()
+
+        response = self.revalidate(VISIT_LIST_URL, response)
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, "Surgery")
+
+    def test_detail_follows_the_next_visit(self):
+        url = self.patient.get_absolute_url()
+        response = self.client.get(url)
+        self.assertEqual(self.revalidate(url, response).status_code, 304)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.doctor.last_name = "Melnyk"
+            self.doctor.save()
+
+        response = self.revalidate(url, response)
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, "Melnyk")
+
+    def test_specialization_labels_change_the_etag(self):
+        url = self.doctor.get_absolute_url()
+        response = self.client.get(url)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.doctor.specializations.add(self.specialization)
+
+        response = self.revalidate(url, response)
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, "Surgeon")
+
+    def test_missing_object(self):
+        url = reverse("user:patient-detail", kwargs={"pk": 0})
+        response = self.client.get(url, HTTP_IF_NONE_MATCH="*")
+
+        self.assertEqual(response.status_code, 404)
+        self.assertNotIn("ETag", response)
@@ -0,0 +1,168 @@
+from datetime import date
+from io import StringIO
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.core.checks import run_checks
+from django.template import Context, Template
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from reception.models import Visit
+from users.models import Patient, Specialization
+from utils import fragments
+
+PATIENT_LIST_URL = reverse("user:patient-list")
+VISIT_LIST_URL = reverse("reception:visit-list")
+
+
+class RowCacheTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        fragments.reset_stats()
+        self.user = get_user_model().objects.create_user(
+            username="DocUsername", password="DocPassword123"
+        )
+        self.client.force_login(self.user)
+        self.patient = Patient.objects.create(
+            first_name="Ivan",
+            last_name="Petrenko",
+            phone_number="0671234567",
+            date_of_birth=date(1990, 1, 1),
+        )
+
+    def test_rows_are_cached(self):
+        self.client.get(PATIENT_LIST_URL)
+        self.assertEqual(fragments.get_stats(), (0, 1))
+
+        response = self.client.get(PATIENT_LIST_URL)
+        self.assertContains(response, "Petrenko")
+        self.assertEqual(fragments.get_stats(), (1, 1))
+
+    def test_saved_row_is_rendered_again(self):
+        self.client.get(PATIENT_LIST_URL)
+        self.patient.last_name = "Kovalenko"
+        self.patient.save()
+
+        response = self.client.get(PATIENT_LIST_URL)
+        self.assertContains(response, "Kovalenko")
+        self.assertNotContains(response, "Petrenko")
+        self.assertEqual(fragments.get_stats(), (0, 2))
+
+    def test_only_changed_rows_are_rendered_again(self):
+        other = Patient.objects.create(
+            first_name="Olena",
+            last_name="Shevchenko",
+            phone_number="0677654321",
+        )
+        self.client.get(PATIENT_LIST_URL)
+        other.phone_number = "0501234567"
+        other.save()
+
+        response = self.client.get(PATIENT_LIST_URL)
+        self.assertContains(response, "0501234567")
+        self.assertEqual(fragments.get_stats(), (1, 3))
+
+    def test_visit_row_follows_related_objects(self):
+        doctor = get_user_model().objects.create_user(
+            username="Doctor", first_name="Taras", last_name="Bondar"
+        )
+        specialization = Specialization.objects.create(name="Surgeon")
+        Visit.objects.create(
+            date_time="2030-01-01 10:00",
+            doctor=doctor,
+            patient=self.patient,
+            treatment_direction=specialization,
+        )
+        self.client.get(VISIT_LIST_URL)
+        self.patient.last_name = "Kovalenko"
+        self.patient.save()
+
+        response = self.client.get(VISIT_LIST_URL)
+        self.assertContains(response, "Kovalenko")
+        self.assertEqual(fragments.get_stats(), (0, 2))
+
+    def test_stats_command(self):
+        self.client.get(PATIENT_LIST_URL)
+        self.client.get(PATIENT_LIST_URL)
+        out = StringIO()
+        call_command("row_cache_stats", "--reset", stdout=out)
+
+        self.assertIn("Hits: 1, misses: 1, hit ratio: 50.0%", out.getvalue())
+        self.assertEqual(fragments.get_stats(), (0, 0))
+
+    def test_version_is_bumped_on_hard_delete(self):
+        key = fragments.version_key(Patient, self.patient.pk)
+        version = cache.get(key)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.patient.hard_delete()
+        self.assertNotEqual(cache.get(key), version)
+
+    def test_version_is_bumped_on_commit(self):
+        key = fragments.version_key(Patient, self.patient.pk)
+        version = cache.get(key)
+        with self.captureOnCommitCallbacks() as callbacks:
+            self.patient.save()
+            self.assertEqual(cache.get(key), version)
+
+        callbacks[0]()
+        self.assertNotEqual(cache.get(key), version)
+
+    def test_render_of_old_rows_is_not_served_as_current(self):
+        template = Template(
+            '{% load row_cache %}{% rowcache "row" patient %}'
+            "{{ patient.last_name }}{% endrowcache %}"
+        )
+        old = Patient.objects.get(pk=self.patient.pk)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.patient.last_name = "Kovalenko"
+            self.patient.save()
+        # Fetched before the write, rendered after the bump
+        template.render(Context({"patient": old}))
+
+        new = Patient.objects.get(pk=self.patient.pk)
+        self.assertEqual(
+            template.render(Context({"patient": new})), "Kovalenko"
+        )
+
+    def test_cached_row_costs_one_cache_lookup(self):
+        template = Template(
+            '{% load row_cache %}{% rowcache "row" patient %}'
+            "{{ patient.last_name }}{% endrowcache %}"
+        )
+        context = Context({"patient": self.patient})
+        template.render(context)
+
+        with mock.patch.object(fragments, "cache", wraps=cache) as spy:
+            self.assertEqual(template.render(context), "Petrenko")
+        self.assertEqual([call[0] for call in spy.method_calls], ["get_many"])
+
+    def test_stats_are_counted_in_memory(self):
+        self.client.get(PATIENT_LIST_URL)
+        self.assertIsNone(cache.get(fragments.MISSES_KEY))
+        self.assertEqual(fragments.get_stats(), (0, 1))
+
+
+class SharedCacheCheckTest(TestCase):
+    def errors(self):
+        return [
+            error.id
+            for error in run_checks(include_deployment_checks=True)
+            if error.id == "utils.E002"
+        ]
+
+    def test_local_cache_fails_the_deploy_check(self):
+        self.assertEqual(self.errors(), ["utils.E002"])
+
+    @override_settings(
+        CACHES={
+            "default": {
+                "BACKEND": "django.core.cache.backends.redis.RedisCache",
+                "LOCATION": "redis://127.0.0.1:6379",
+            }
+        }
+    )
+    def test_shared_cache_passes(self):
+        self.assertEqual(self.errors(), [])
@@ -0,0 +1,300 @@
+from datetime import datetime, time
+from unittest import mock, skipUnless
+
+from django.core.exceptions import ValidationError
+from django.db import connection
+from django.test import SimpleTestCase, TestCase
+from django.test.utils import CaptureQueriesContext
+
+from reception import dashboard
+from reception.models import Visit
+from users import search
+from users.models import Doctor, Patient, Specialization
+from utils.models import check_default_managers, live_index
+
+
+class LiveIndexTest(SimpleTestCase):
+    def test_live_indexes_are_generated(self):
+        for model, name in (
+            (Visit, "visit_date_time_live"),
+            (Visit, "visit_time_of_day_live"),
+            (Patient, "patient_last_name_live"),
+            (Doctor, "doctor_last_name_live"),
+            (Specialization, "specialization_name_live"),
+        ):
+            indexes = {index.name: index for index in model._meta.indexes}
+            self.assertIn(name, indexes)
+            self.assertEqual(
+                indexes[name].condition.children,
+                [("deleted_at__isnull", True)],
+            )
+
+    def test_long_index_name_is_shortened(self):
+        index = live_index(Specialization, ("visit_duration", "name"))
+        self.assertLessEqual(len(index.name), 30)
+        self.assertTrue(index.name.startswith("specialization_visit"))
+
+
+@skipUnless(connection.vendor == "sqlite", "EXPLAIN QUERY PLAN of SQLite")
+class LiveIndexQueryPlanTest(TestCase):
+    def assert_uses_index(self, queryset, name):
+        self.assertIn(f"USING INDEX {name}", queryset.explain())
+
+    def test_visit_date_time_index(self):
+        self.assert_uses_index(
+            Visit.objects.filter(
+                date_time__range=(datetime(2030, 1, 1), datetime(2030, 1, 2))
+            ),
+            "visit_date_time_live",
+        )
+
+    def test_visit_time_of_day_index(self):
+        self.assert_uses_index(
+            Visit.objects.filter(time_of_day__range=(time(10), time(10, 59))),
+            "visit_time_of_day_live",
+        )
+
+    def test_patient_last_name_index(self):
+        self.assert_uses_index(
+            Patient.objects.filter(last_name="Lastname"),
+            "patient_last_name_live",
+        )
+
+    def test_patient_phone_digits_indexes(self):
+        self.assert_uses_index(
+            Patient.objects.phone_startswith("050"),
+            "patient_phone_digits_live",
+        )
+        self.assert_uses_index(
+            Patient.objects.phone_endswith("4567"),
+            live_index(Patient, ("phone_digits_reversed",)).name,
+        )
+
+    def test_doctor_last_name_index(self):
+        self.assert_uses_index(
+            Doctor.objects.filter(deleted_at__isnull=True, last_name="Doe"),
+            "doctor_last_name_live",
+        )
+
+    def test_specialization_name_index(self):
+        self.assert_uses_index(
+            Specialization.objects.filter(name="Surgery"),
+            "specialization_name_live",
+        )
+
+    def test_deleted_rows_are_not_indexed(self):
+        plan = Patient.all_objects.filter(last_name="Lastname").explain()
+        self.assertNotIn("patient_last_name_live", plan)
+
+
+class SoftDeleteTest(TestCase):
+    def setUp(self):
+        self.surgery = Specialization.objects.create(name="Surgery")
+        self.doctor = Doctor.objects.create_user(
+            username="doctor", last_name="Doe", password="Doctor12345"
+        )
+        self.doctor.specializations.add(self.surgery)
+        self.patient = Patient.objects.create(
+            phone_number="0671234567", first_name="John", last_name="Smith"
+        )
+        self.visits = [
+            Visit.objects.create(
+                date_time=date_time,
+                doctor=self.doctor,
+                patient=self.patient,
+                treatment_direction=self.surgery,
+            )
+            for date_time in (
+                datetime(2020, 1, 10, 9),
+                datetime(2040, 1, 10, 9),
+                datetime(2040, 1, 10, 10),
+            )
+        ]
+
+    def updates(self, queries):
+        return [
+            query["sql"]
+            for query in queries.captured_queries
+            if query["sql"].startswith("UPDATE")
+        ]
+
+    def test_delete_writes_deleted_at_only(self):
+        visit = self.visits[1]
+        updated_at = visit.updated_at
+        with CaptureQueriesContext(connection) as queries:
+            visit.delete()
+
+        [update] = self.updates(queries)
+        self.assertIn('"deleted_at"', update)
+        self.assertNotIn('"duration"', update)
+        visit.refresh_from_db()
+        self.assertIsNotNone(visit.deleted_at)
+        self.assertGreater(visit.updated_at, updated_at)
+
+        visit.restore()
+        self.assertIsNone(Visit.objects.get(pk=visit.pk).deleted_at)
+
+    def test_bulk_delete_and_restore(self):
+        with CaptureQueriesContext(connection) as queries:
+            deleted = Visit.objects.filter(doctor=self.doctor).delete()
+
+        self.assertEqual(deleted, (3, {"reception.Visit": 3}))
+        self.assertEqual(len(self.updates(queries)), 1)
+        self.assertFalse(Visit.objects.exists())
+        self.assertEqual(Visit.all_objects.count(), 3)
+        # Deleted rows are left as they are
+        self.assertEqual(Visit.all_objects.all().delete()[0], 0)
+
+        self.assertEqual(Visit.all_objects.all().restore(), 3)
+        self.assertEqual(Visit.objects.count(), 3)
+        self.assertEqual(Visit.all_objects.all().restore(), 0)
+
+    def test_bulk_delete_sets_updated_at(self):
+        updated_at = self.visits[0].updated_at
+        Visit.objects.filter(pk=self.visits[0].pk).delete()
+        self.assertGreater(
+            Visit.all_objects.get(pk=self.visits[0].pk).updated_at, updated_at
+        )
+
+    def test_cascade_deletes_future_visits(self):
+        self.doctor.delete(cascade=True)
+
+        self.assertEqual(
+            list(Visit.objects.values_list("pk", flat=True)),
+            [self.visits[0].pk],
+        )
+
+    def test_bulk_cascade_counts_the_visits(self):
+        deleted = Patient.objects.filter(pk=self.patient.pk).delete(
+            cascade=True
+        )
+        self.assertEqual(
+            deleted, (3, {"users.Patient": 1, "reception.Visit": 2})
+        )
+
+    def test_delete_without_cascade_keeps_the_visits(self):
+        self.doctor.delete()
+        self.assertEqual(Visit.objects.count(), 3)
+
+    def test_bulk_delete_refreshes_the_labels(self):
+        Specialization.objects.all().delete()
+        self.doctor.refresh_from_db()
+        self.assertEqual(self.doctor.specialization_labels, "")
+
+        Specialization.all_objects.all().restore()
+        self.doctor.refresh_from_db()
+        self.assertEqual(self.doctor.specialization_labels, "Surgery")
+
+    def test_bulk_delete_invalidates_the_counters(self):
+        self.assertEqual(dashboard.get_counters()["num_patients"], 1)
+        Patient.objects.all().delete()
+        self.assertEqual(dashboard.get_counters()["num_patients"], 0)
+
+    @skipUnless(connection.vendor == "sqlite", "FTS5 index of SQLite")
+    def test_bulk_delete_updates_the_search_index(self):
+        def found():
+            return list(search.search(Patient.all_objects.all(), "smith"))
+
+        Patient.objects.all().delete()
+        self.assertEqual(found(), [])
+        Patient.all_objects.all().restore()
+        self.assertEqual(found(), [self.patient])
+
+    def test_hard_delete(self):
+        Visit.objects.filter(pk=self.visits[0].pk).hard_delete()
+        self.assertEqual(Visit.all_objects.count(), 2)
+
+    def test_deleted_rows_keep_their_unique_values(self):
+        self.patient.delete()
+        patient = Patient(
+            phone_number="0671234567", first_name="Jane", last_name="Doe"
+        )
+
+        with self.assertRaises(ValidationError) as raised:
+            patient.full_clean()
+        self.assertIn("phone_number", raised.exception.message_dict)
+        # The deleted row itself stays valid
+        self.patient.full_clean()
+
+
+class RelatedManagerTest(TestCase):
+    def setUp(self):
+        self.surgery = Specialization.objects.create(name="Surgery")
+        self.therapy = Specialization.objects.create(name="Therapy")
+        self.doctors = [
+            Doctor.objects.create_user(
+                username=username, last_name=username, password="Doctor12345"
+            )
+            for username in ("live", "deleted")
+        ]
+        for doctor in self.doctors:
+            doctor.specializations.add(self.surgery, self.therapy)
+        self.patients = [
+            Patient.objects.create(
+                phone_number=f"067123456{number}",
+                first_name="John",
+                last_name=f"Smith{number}",
+            )
+            for number in range(3)
+        ]
+        for patient in self.patients:
+            for day in (10, 11):
+                Visit.objects.create(
+                    date_time=datetime(2040, 1, day, 9),
+                    doctor=self.doctors[0],
+                    patient=patient,
+                )
+            patient.visits.last().delete()
+        self.doctors[1].delete()
+        self.therapy.delete()
+
+    def test_reverse_relations_skip_deleted_rows(self):
+        self.assertEqual(list(self.surgery.doctors.all()), [self.doctors[0]])
+        self.assertEqual(self.patients[0].visits.count(), 1)
+        self.assertEqual(
+            list(self.doctors[0].specializations.all()), [self.surgery]
+        )
+
+    def test_one_prefetch_query_per_relation(self):
+        with self.assertNumQueries(2):
+            patients = list(Patient.objects.prefetch_related("visits"))
+            self.assertEqual(
+                [len(patient.visits.all()) for patient in patients],
+                [1, 1, 1],
+            )
+
+        with self.assertNumQueries(3):
+            [specialization] = Specialization.objects.prefetch_related(
+                "doctors__specializations"
+            )
+            [doctor] = specialization.doctors.all()
+            self.assertEqual(
+                list(doctor.specializations.all()), [self.surgery]
+            )
+
+    def test_deleted_doctors_cannot_log_in(self):
+        self.assertTrue(
+            self.client.login(username="live", password="Doctor12345")
+        )
+        self.assertFalse(
+            self.client.login(username="deleted", password="Doctor12345")
+        )
+
+    def test_deleted_doctors_keep_their_labels(self):
+        self.surgery.name = "Surgeon"
+        self.surgery.save()
+        self.assertEqual(
+            Doctor.all_objects.get(
+                pk=self.doctors[1].pk
+            ).specialization_labels,
+            "Surgeon",
+        )
+
+    def test_default_managers_are_checked(self):
+        self.assertEqual(check_default_managers(), [])
+        with mock.patch.object(
+            Doctor._meta, "default_manager", Doctor.all_objects
+        ):
+            [error] = check_default_managers()
+        self.assertEqual(error.id, "utils.E001")
+        self.assertIs(error.obj, Doctor)
@@ -0,0 +1,111 @@
+from datetime import datetime, timedelta
+
+from django.core.cache import cache
+from django.http import Http404
+from django.test import TestCase
+
+from reception.models import Visit
+from users.models import Patient
+from utils.pagination import (
+    NEXT,
+    KeysetPaginator,
+    decode_cursor,
+    encode_cursor,
+)
+
+
+class CursorTest(TestCase):
+    def test_cursor_round_trip(self):
+        cursor = encode_cursor(["Lastname", 3], NEXT)
+        self.assertEqual(decode_cursor(cursor), (NEXT, ["Lastname", 3]))
+
+    def test_invalid_cursor(self):
+        for cursor in ("???", "bm90IGpzb24=", encode_cursor([1], "x")):
+            with self.assertRaises(Http404):
+                decode_cursor(cursor)
+
+
+class KeysetPaginatorTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        # Same last names on purpose: the id breaks the ties
+        for num in range(7):
+            Patient.objects.create(
+                phone_number=f"012345678{num}",
+                first_name=f"Firstname{num}",
+                last_name=f"Lastname{num // 2}",
+                date_of_birth="2000-01-02",
+            )
+        self.patients = list(Patient.objects.order_by("last_name", "id"))
+        self.paginator = KeysetPaginator(
+            Patient.objects.all(), 3, ("last_name", "id")
+        )
+
+    def test_pages_forward_and_back(self):
+        first = self.paginator.page()
+        self.assertEqual(list(first), self.patients[:3])
+        self.assertFalse(first.has_previous())
+
+        second = self.paginator.page(first.next_cursor)
+        self.assertEqual(list(second), self.patients[3:6])
+
+        last = self.paginator.page(second.next_cursor)
+        self.assertEqual(list(last), self.patients[6:])
+        self.assertFalse(last.has_next())
+
+        back = self.paginator.page(last.previous_cursor)
+        self.assertEqual(list(back), self.patients[3:6])
+        self.assertEqual(
+            list(self.paginator.page(back.previous_cursor)),
+            self.patients[:3],
+        )
+
+    def test_page_is_one_query(self):
+        cursor = self.paginator.page().next_cursor
+        with self.assertNumQueries(1):
+            self.paginator.page(cursor)
+
+    def test_cursor_of_wrong_shape(self):
+        for values in (["Lastname1"], ["Lastname1", "not an id"]):
+            with self.assertRaises(Http404):
+                self.paginator.page(encode_cursor(values, NEXT))
+
+    def test_count_is_cached(self):
+        paginator = KeysetPaginator(
+            Patient.objects.all(), 3, ("last_name", "id"), count_key="list"
+        )
+        self.assertEqual(paginator.count, 7)
+        Patient.objects.first().hard_delete()
+        paginator = KeysetPaginator(
+            Patient.objects.all(), 3, ("last_name", "id"), count_key="list"
+        )
+        with self.assertNumQueries(0):
+            self.assertEqual(paginator.count, 7)
+
+    def test_no_count_without_key(self):
+        with self.assertNumQueries(0):
+            self.assertIsNone(self.paginator.count)
+
+
+class KeysetPaginatorMicrosecondsTest(TestCase):
+    def test_rows_with_microseconds_are_not_repeated(self):
+        start = datetime(2031, 1, 10, 9, 0, 0, 123456)
+        for num in range(4):
+            Visit.objects.create(
+                date_time=start + timedelta(microseconds=num * 250)
+            )
+        visits = list(Visit.objects.order_by("date_time", "id"))
+        paginator = KeysetPaginator(
+            Visit.objects.all(), 2, ("date_time", "id")
+        )
+
+        first = paginator.page()
+        self.assertEqual(
+            decode_cursor(first.next_cursor)[1][0],
+            "2031-01-10T09:00:00.123706",
+        )
+        second = paginator.page(first.next_cursor)
+        self.assertEqual(list(first) + list(second), visits)
+        self.assertEqual(
+            list(paginator.page(second.previous_cursor)), visits[:2]
+        )
@@ -0,0 +1,141 @@
+import gzip
+import io
+import json
+import os
+import tempfile
+
+from django.core.management import call_command
+from django.test import SimpleTestCase, TestCase
+
+from reception.models import Visit
+from users.models import Doctor, Patient, Specialization
+from users.search import search
+from utils.checks import LOCAL_CACHE_WARNING
+from utils.seed import iter_json_array
+
+FIXTURE = "to_the_doctor_db_data.json"
+
+
+class IterJsonArrayTest(SimpleTestCase):
+    def test_items_across_reads(self):
+        items = [{"pk": 1, "text": "a, ]} b"}, {"pk": 2}, {"pk": 3}]
+        text = "  [\n" + ",\n".join(json.dumps(item) for item in items) + "\n]"
+        for read_size in (1, 7, 1000):
+            self.assertEqual(
+                list(iter_json_array(io.StringIO(text), read_size)), items
+            )
+
+    def test_empty_array(self):
+        self.assertEqual(list(iter_json_array(io.StringIO("[ ]"))), [])
+
+    def test_not_an_array(self):
+        with self.assertRaises(ValueError):
+            list(iter_json_array(io.StringIO('{"pk": 1}')))
+
+    def test_truncated(self):
+        with self.assertRaises(ValueError):
+            list(iter_json_array(io.StringIO('[{"pk": 1}, {"pk"'), 4))
+
+
+class LoadSeedTest(TestCase):
+    def load(self, *args):
+        out, err = io.StringIO(), io.StringIO()
+        call_command("load_seed", *args, stdout=out, stderr=err)
+        self.assertIn(LOCAL_CACHE_WARNING, err.getvalue())
+        return out.getvalue()
+
+    def test_same_data_as_loaddata(self):
+        call_command("loaddata", FIXTURE, verbosity=0)
+        expected = self.snapshot()
+        for model in (Visit, Patient, Doctor, Specialization):
+            model.all_objects.all().hard_delete()
+
+        out = self.load(FIXTURE)
+
+        self.assertIn("reception.Visit: 12", out)
+        self.assertIn("users.Doctor_specializations: 11", out)
+        self.assertNotIn("Doctor_groups", out)
+        self.assertEqual(self.snapshot(), expected)
+
+    def snapshot(self):
+        # bulk_create stamps the rows with the time of the load
+        return (
+            *(
+                list(
+                    model.all_objects.values_list(
+                        *(
+                            field.attname
+                            for field in model._meta.concrete_fields
+                            if field.name != "updated_at"
+                        )
+                    ).order_by("id")
+                )
+                for model in (Visit, Patient)
+            ),
+            list(
+                Doctor.all_objects.values_list(
+                    "id", "username", "specialization_labels"
+                ).order_by("id")
+            ),
+            list(
+                Doctor.specializations.through.objects.values_list(
+                    "doctor_id", "specialization_id"
+                ).order_by("doctor_id", "specialization_id")
+            ),
+        )
+
+    def test_derived_data_are_rebuilt(self):
+        records = [
+            {
+                "model": "users.specialization",
+                "pk": 7,
+                "fields": {"name": "Surgery", "visit_duration": 45},
+            },
+            {
+                "model": "users.doctor",
+                "pk": 5,
+                "fields": {
+                    "username": "ivanenko",
+                    "last_name": "Ivanenko",
+                    "password": "!",
+                    "specializations": [7],
+                },
+            },
+            {
+                "model": "users.patient",
+                "pk": 3,
+                "fields": {
+                    "first_name": "Ivan",
+                    "last_name": "Petrenko",
+                    "phone_number": "067-123-45",
+                },
+            },
+            {
+                "model": "reception.visit",
+                "pk": 2,
+                "fields": {
+                    "date_time": "2031-01-10T09:30:00",
+                    "doctor": 5,
+                    "patient": 3,
+                    "treatment_direction": 7,
+                },
+            },
+        ]
+        directory = tempfile.mkdtemp()
+        path = os.path.join(directory, "seed.json.gz")
+        with gzip.open(path, "wt", encoding="utf-8") as stream:
+            json.dump(records, stream)
+        self.addCleanup(os.remove, path)
+
+        with self.assertNumQueries(25):
+            self.load(path, "--batch-size=2")
+
+        visit = Visit.objects.get()
+        self.assertIsNone(visit.duration)
+        self.assertEqual(visit.end_date_time.minute, 15)
+        self.assertEqual(Patient.objects.get().phone_digits, "06712345")
+        self.assertEqual(Doctor.objects.get().specialization_labels, "Surgery")
+        self.assertEqual(search(Patient.objects.all(), "petr").get().pk, 3)
+        self.assertGreater(
+            Patient.objects.create(phone_number="1", first_name="A").pk, 3
+        )
@@ -0,0 +1,61 @@
+import os
+import shutil
+import tempfile
+from unittest import skipUnless
+
+from django.conf import settings
+from django.db import connection
+from django.test import SimpleTestCase, TestCase, override_settings
+
+
+def pragma(wrapper, name):
+    with wrapper.cursor() as cursor:
+        cursor.execute(f"PRAGMA {name}")
+        return cursor.fetchone()[0]
+
+
+def copy_connection(test, name=None):
+    wrapper = connection.copy()
+    if name is not None:
+        wrapper.settings_dict = {**wrapper.settings_dict, "NAME": name}
+    test.addCleanup(wrapper.close)
+    return wrapper
+
+
+@skipUnless(connection.vendor == "sqlite", "SQLite PRAGMAs")
+class SqlitePragmaTest(TestCase):
+    @override_settings(SQLITE_PRAGMAS=settings.SQLITE_PRODUCTION_PRAGMAS)
+    def test_pragmas_of_the_production_profile(self):
+        wrapper = copy_connection(self)
+        self.assertEqual(pragma(wrapper, "busy_timeout"), 5000)
+        # NORMAL
+        self.assertEqual(pragma(wrapper, "synchronous"), 1)
+        self.assertEqual(pragma(wrapper, "cache_size"), -64000)
+
+    @override_settings(SQLITE_PRAGMAS={"busy_timeout": 1000})
+    def test_pragmas_come_from_the_settings(self):
+        wrapper = copy_connection(self)
+        self.assertEqual(pragma(wrapper, "busy_timeout"), 1000)
+
+
+@skipUnless(connection.vendor == "sqlite", "SQLite PRAGMAs")
+class SqliteFileTest(SimpleTestCase):
+    def database_file(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        return os.path.join(directory, "db.sqlite3")
+
+    @override_settings(SQLITE_PRAGMAS=settings.SQLITE_PRODUCTION_PRAGMAS)
+    def test_production_profile_is_in_wal_mode(self):
+        wrapper = copy_connection(self, self.database_file())
+
+        self.assertEqual(pragma(wrapper, "journal_mode"), "wal")
+        self.assertEqual(
+            pragma(wrapper, "mmap_size"),
+            settings.SQLITE_PRODUCTION_PRAGMAS["mmap_size"],
+        )
+
+    @override_settings(SQLITE_PRAGMAS={})
+    def test_default_profile_keeps_the_rollback_journal(self):
+        wrapper = copy_connection(self, self.database_file())
+        self.assertEqual(pragma(wrapper, "journal_mode"), "delete")
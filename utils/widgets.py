@@ -0,0 +1,60 @@
+import json
+
+from django import forms
+from django.core.exceptions import ValidationError
+from django.urls import reverse
+
+
+class AutocompleteSelect(forms.Select):
+    """
+    A select of a ModelChoiceField rendering only the selected option.
+    static/js/autocomplete.js fetches the other options from the JSON
+    endpoint `url` as the user types, so the form size does not depend
+    on the size of the table. `depends_on` maps query parameters of
+    the endpoint to the fields of the form whose value they pass.
+    """
+
+    def __init__(self, url, depends_on=None, attrs=None):
+        super().__init__(attrs)
+        self.url = url
+        self.depends_on = depends_on or {}
+
+    class Media:
+        js = ("js/autocomplete.js",)
+
+    def build_attrs(self, base_attrs, extra_attrs=None):
+        attrs = super().build_attrs(base_attrs, extra_attrs)
+        attrs["data-autocomplete-url"] = reverse(self.url)
+        if self.depends_on:
+            attrs["data-depends-on"] = json.dumps(self.depends_on)
+
+        return attrs
+
+    def optgroups(self, name, value, attrs=None):
+        selected = [pk for pk in value if pk]
+        choices = [("", self.choices.field.empty_label or "---------")]
+        try:
+            queryset = self.choices.queryset.filter(pk__in=selected)
+        except (ValueError, ValidationError):
+            # Submitted garbage, the field reports the error
+            selected = []
+        if selected:
+            choices += [(obj.pk, str(obj)) for obj in queryset]
+
+        return [
+            (
+                None,
+                [
+                    self.create_option(
+                        name,
+                        choice_value,
+                        label,
+                        str(choice_value) in value,
+                        index,
+                        attrs=attrs,
+                    )
+                ],
+                index,
+            )
+            for index, (choice_value, label) in enumerate(choices)
+        ]